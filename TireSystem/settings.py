@@ -12,6 +12,10 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
+
+from .sqlite_profiles import sqlite_options
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -41,6 +45,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timing and query counts cover the other middleware too
+    'tires.middleware.RequestStatsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -73,14 +79,61 @@ WSGI_APPLICATION = 'TireSystem.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connection PRAGMAs and transaction mode: see TireSystem/sqlite_profiles.py
+SQLITE_PROFILE = os.environ.get('DJANGO_SQLITE_PROFILE', 'development' if DEBUG else 'production')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': sqlite_options(SQLITE_PROFILE),
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Must be shared by every worker process: reference-data versions live here
+# (tires/services/reference_data.py). Point at Redis/Memcached when running on several hosts.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'noscodb-cache')),
+    }
+}
+
+
+# Background imports (tires/services/import_jobs.py)
+# Queue confirmed imports for `manage.py run_import_worker` instead of running them in the
+# request. Enable only where a worker runs: otherwise queued jobs never start.
+
+IMPORT_BACKGROUND_JOBS = os.environ.get('DJANGO_IMPORT_BACKGROUND_JOBS') == '1'
+
+
+# Request instrumentation (tires.middleware.RequestStatsMiddleware)
+# A view running more queries than its budget logs a warning; stats at /request-stats/ (staff)
+
+REQUEST_QUERY_BUDGET = int(os.environ.get('DJANGO_REQUEST_QUERY_BUDGET', 30))
+REQUEST_QUERY_BUDGETS = {
+    # 'view_name': max queries,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'structured': {'format': '%(asctime)s %(levelname)s %(name)s %(message)s'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'structured'},
+    },
+    'loggers': {
+        'tires': {'handlers': ['console'], 'level': os.environ.get('DJANGO_TIRES_LOG_LEVEL', 'INFO')},
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
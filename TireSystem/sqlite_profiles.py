@@ -0,0 +1,57 @@
+"""
+SQLite connection profiles for DATABASES['default']['OPTIONS']
+
+Django runs `init_command` on every new connection, so the PRAGMAs below apply to
+each worker's connection. `transaction_mode = 'IMMEDIATE'` makes atomic() start
+with BEGIN IMMEDIATE: a write transaction takes the write lock up front and waits
+for it (busy_timeout) instead of failing with "database is locked" when a read
+transaction later tries to upgrade to a write.
+
+Pick one with the DJANGO_SQLITE_PROFILE environment variable; compare them with
+`manage.py benchmark_sqlite`.
+"""
+
+BUSY_TIMEOUT_SECONDS = 20
+
+PROFILES = {
+    # SQLite/Django defaults: rollback journal, synchronous=FULL, deferred transactions
+    'stock': {},
+    'development': {
+        'pragmas': {
+            'journal_mode': 'WAL',        # readers no longer block the writer (and vice versa)
+            'synchronous': 'NORMAL',      # fsync at checkpoints, not on every commit (safe with WAL)
+            'busy_timeout': BUSY_TIMEOUT_SECONDS * 1000,
+        },
+        'transaction_mode': 'IMMEDIATE',
+    },
+    'production': {
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': BUSY_TIMEOUT_SECONDS * 1000,
+            'mmap_size': 256 * 1024 * 1024,  # read pages through the OS page cache
+            'cache_size': -64 * 1024,        # 64 MiB page cache per connection (negative = KiB)
+            'temp_store': 'MEMORY',          # sorts and temp indexes off disk
+        },
+        'transaction_mode': 'IMMEDIATE',
+    },
+}
+
+
+def pragma_statements(profile):
+    """`PRAGMA name=value;` statements of a profile, in order"""
+    return [f'PRAGMA {name}={value};' for name, value in PROFILES[profile].get('pragmas', {}).items()]
+
+
+def sqlite_options(profile):
+    """OPTIONS for django.db.backends.sqlite3"""
+    if profile not in PROFILES:
+        raise ValueError(f'Unknown SQLite profile {profile!r}; choose from {", ".join(PROFILES)}')
+    settings = PROFILES[profile]
+    options = {}
+    if settings.get('pragmas'):
+        options['init_command'] = ''.join(pragma_statements(profile))
+        options['timeout'] = BUSY_TIMEOUT_SECONDS
+    if settings.get('transaction_mode'):
+        options['transaction_mode'] = settings['transaction_mode']
+    return options
@@ -48,6 +48,13 @@ class ImportLogAdmin(admin.ModelAdmin):
     search_fields = ('session_id', 'file_name')
     readonly_fields = ('session_id', 'created_at', 'stats')
 
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'import_type', 'status', 'worker', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('status', 'import_type')
+    search_fields = ('session_id', 'worker')
+    readonly_fields = ('created_at', 'started_at', 'heartbeat_at', 'finished_at')
+
 # Register other models similarly...
 admin.site.register(TireStatus)
 admin.site.register(TirePattern)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TiresConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tires'
+
+    def ready(self):
+        from . import checks  # noqa: F401  registers the hot query plan check
+        from . import signals  # noqa: F401  reference-data cache invalidation
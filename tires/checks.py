@@ -0,0 +1,18 @@
+# tires/checks.py
+from django.core.checks import Error, Tags, register
+
+
+@register(Tags.database)
+def hot_query_plans(app_configs, databases=None, **kwargs):
+    """Run with `manage.py check --database default`: hot queries must stay on their indexes"""
+    from tires.services.query_plans import check_hot_queries
+
+    errors = []
+    for alias in databases or ():
+        for name, problem in check_hot_queries(using=alias):
+            errors.append(Error(
+                f'Hot query "{name}" {problem}',
+                hint='Add or restore an index for it (see tires/services/query_plans.py)',
+                id='tires.E001',
+            ))
+    return errors
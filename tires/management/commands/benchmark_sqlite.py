@@ -0,0 +1,132 @@
+# tires/management/commands/benchmark_sqlite.py
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from TireSystem.sqlite_profiles import BUSY_TIMEOUT_SECONDS, PROFILES, pragma_statements
+
+SCHEMA = '''
+CREATE TABLE tire (id INTEGER PRIMARY KEY, serial_number TEXT UNIQUE, last_odometer INTEGER,
+                   last_tread_depth REAL, last_pressure REAL);
+CREATE TABLE inspection (id INTEGER PRIMARY KEY, tire_id INTEGER, inspection_odometer INTEGER,
+                         tread_depth REAL, pressure REAL);
+CREATE INDEX insp_tire_odometer_idx ON inspection (tire_id, inspection_odometer, id);
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare SQLite profiles (TireSystem/sqlite_profiles.py) on a scratch database: '
+        'concurrent inspection writers and latest-inspection readers'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', nargs='+', choices=list(PROFILES), default=list(PROFILES))
+        parser.add_argument('--writers', type=int, default=4, help='Writer threads')
+        parser.add_argument('--readers', type=int, default=4, help='Reader threads')
+        parser.add_argument('--seconds', type=float, default=5, help='Duration per profile')
+        parser.add_argument('--tires', type=int, default=5000, help='Tires in the scratch database')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'profile':<12} {'writes/s':>10} {'reads/s':>10} {'locked':>8} {'p95 write ms':>13}")
+        for profile in options['profiles']:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'bench.sqlite3')
+                self.seed(path, profile, options['tires'])
+                result = self.run_profile(path, profile, options)
+            self.stdout.write(
+                f"{profile:<12} {result['writes'] / options['seconds']:>10.0f} "
+                f"{result['reads'] / options['seconds']:>10.0f} {result['locked']:>8} "
+                f"{result['p95_write_ms']:>13.1f}"
+            )
+
+    def connect(self, path, profile):
+        # Same settings Django applies: sqlite3 timeout + init_command PRAGMAs; manual transactions
+        connection = sqlite3.connect(
+            path, timeout=BUSY_TIMEOUT_SECONDS if PROFILES[profile] else 5, isolation_level=None,
+            check_same_thread=False,
+        )
+        for statement in pragma_statements(profile):
+            connection.execute(statement)
+        return connection
+
+    def seed(self, path, profile, tires):
+        connection = self.connect(path, profile)
+        connection.executescript(SCHEMA)
+        connection.execute('BEGIN')
+        connection.executemany(
+            'INSERT INTO tire (id, serial_number, last_odometer, last_tread_depth, last_pressure) '
+            'VALUES (?, ?, 0, 15, 100)',
+            ((tire_id, f'T{tire_id:06d}') for tire_id in range(1, tires + 1)),
+        )
+        connection.execute('COMMIT')
+        connection.close()
+
+    def run_profile(self, path, profile, options):
+        begin = 'BEGIN IMMEDIATE' if PROFILES[profile].get('transaction_mode') == 'IMMEDIATE' else 'BEGIN'
+        deadline = time.monotonic() + options['seconds']
+        lock = threading.Lock()
+        result = {'writes': 0, 'reads': 0, 'locked': 0, 'write_times': []}
+
+        def writer(seed):
+            rng = random.Random(seed)
+            connection = self.connect(path, profile)
+            while time.monotonic() < deadline:
+                tire_id = rng.randint(1, options['tires'])
+                started = time.monotonic()
+                try:
+                    # Read-then-write, like recording an inspection and refreshing the tire
+                    connection.execute(begin)
+                    odometer = connection.execute(
+                        'SELECT last_odometer FROM tire WHERE id = ?', (tire_id,)).fetchone()[0]
+                    connection.execute(
+                        'INSERT INTO inspection (tire_id, inspection_odometer, tread_depth, pressure) '
+                        'VALUES (?, ?, ?, ?)', (tire_id, odometer + 1000, rng.uniform(2, 15), rng.uniform(80, 110)))
+                    connection.execute(
+                        'UPDATE tire SET last_odometer = ? WHERE id = ?', (odometer + 1000, tire_id))
+                    connection.execute('COMMIT')
+                except sqlite3.OperationalError as e:
+                    if connection.in_transaction:
+                        connection.execute('ROLLBACK')
+                    if 'locked' not in str(e) and 'busy' not in str(e):
+                        raise
+                    with lock:
+                        result['locked'] += 1
+                    continue
+                with lock:
+                    result['writes'] += 1
+                    result['write_times'].append(time.monotonic() - started)
+            connection.close()
+
+        def reader(seed):
+            rng = random.Random(seed)
+            connection = self.connect(path, profile)
+            while time.monotonic() < deadline:
+                tire_id = rng.randint(1, options['tires'])
+                try:
+                    connection.execute(
+                        'SELECT id, tread_depth, pressure FROM inspection WHERE tire_id = ? '
+                        'ORDER BY inspection_odometer DESC, id DESC LIMIT 1', (tire_id,)).fetchall()
+                except sqlite3.OperationalError:
+                    with lock:
+                        result['locked'] += 1
+                    continue
+                with lock:
+                    result['reads'] += 1
+            connection.close()
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(options['writers'])]
+        threads += [threading.Thread(target=reader, args=(n + 1000,)) for n in range(options['readers'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        times = sorted(result['write_times'])
+        result['p95_write_ms'] = times[int(len(times) * 0.95)] * 1000 if times else 0
+        return result
@@ -0,0 +1,28 @@
+# tires/management/commands/forecast_tire_wear.py
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from tires.services.wear_forecast import DEFAULT_CHUNK_SIZE, iter_fleet_forecast
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-tire tread-wear forecasts (removal odometer and date); run nightly, e.g. from cron'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Tires per pass')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        totals = Counter()
+        for last_tire_id, counts in iter_fleet_forecast(chunk_size=options['chunk_size']):
+            totals.update(counts)
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Tires up to id {last_tire_id}: {sum(counts.values())} forecasts')
+
+        summary = ', '.join(f'{count} {status.lower()}' for status, count in sorted(totals.items())) or 'none'
+        self.stdout.write(self.style.SUCCESS(
+            f'Done: {sum(totals.values())} tires forecast ({summary}) in {time.monotonic() - started:.1f}s'
+        ))
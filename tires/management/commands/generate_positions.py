@@ -0,0 +1,44 @@
+# tires/management/commands/generate_positions.py
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from tires.models import Vehicle
+from tires.services.position_layouts import InvalidLayout, generate_positions, parse_layout
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the missing tire positions of vehicles from their tire_configuration layout "
+        "(e.g. 2-4-4+1, 6x4+1); safe to rerun"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vehicle', action='append', dest='vehicles',
+                            help='License plate or id (repeatable; default: every vehicle)')
+        parser.add_argument('--vehicle-type', choices=[code for code, _ in Vehicle.VEHICLE_TYPES])
+        parser.add_argument('--layout', help="Use this layout instead of the vehicles' tire_configuration")
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be created')
+
+    def handle(self, *args, **options):
+        if options['layout']:
+            try:
+                parse_layout(options['layout'])
+            except InvalidLayout as e:
+                raise CommandError(f'--layout: {e}')
+
+        vehicles = Vehicle.objects.order_by('id')
+        if options['vehicles']:
+            ids = [int(value) for value in options['vehicles'] if value.isdigit()]
+            vehicles = vehicles.filter(Q(license_plate__in=options['vehicles']) | Q(id__in=ids))
+        if options['vehicle_type']:
+            vehicles = vehicles.filter(vehicle_type=options['vehicle_type'])
+
+        result = generate_positions(vehicles, layout=options['layout'], dry_run=options['dry_run'])
+        for plate, error in result['errors'].items():
+            self.stderr.write(self.style.WARNING(f'{plate}: {error}'))
+
+        verb = 'would be created' if options['dry_run'] else 'created'
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['created']} positions {verb} on {result['vehicles']} vehicles "
+            f"({result['existing']} already existed, {len(result['errors'])} vehicles skipped)"
+        ))
@@ -0,0 +1,19 @@
+# tires/management/commands/rebuild_latest_inspections.py
+from django.core.management.base import BaseCommand
+
+from tires.services.latest_inspection import iter_rebuild_latest_inspections
+
+
+class Command(BaseCommand):
+    help = 'Rebuild Tire.latest_inspection and last odometer/pressure/tread from inspection history'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help='Tires per UPDATE')
+
+    def handle(self, *args, **options):
+        total = 0
+        for last_tire_id, updated in iter_rebuild_latest_inspections(options['chunk_size']):
+            total += updated
+            self.stdout.write(f'Tires up to id {last_tire_id}: {updated} refreshed')
+        self.stdout.write(self.style.SUCCESS(f'Done: {total} tires refreshed'))
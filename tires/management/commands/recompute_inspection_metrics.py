@@ -0,0 +1,46 @@
+# tires/management/commands/recompute_inspection_metrics.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from tires.services.inspection_metrics import (
+    DEFAULT_CHUNK_SIZE, iter_fleet_recompute, recompute_tire_metrics,
+)
+
+
+class Command(BaseCommand):
+    help = 'Recompute CRP/RTD/Cmm/CKm/FCI/FLC/CTV/BTD/KMR/TDW for every tire inspection (chunked backfill)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Tires per transaction')
+        parser.add_argument('--start-after', type=int, default=0,
+                            help='Resume after this tire id')
+        parser.add_argument('--tire', type=int, action='append', dest='tire_ids',
+                            help='Only recompute these tire ids (repeatable)')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        if options['tire_ids']:
+            seen, updated = recompute_tire_metrics(options['tire_ids'])
+            self.stdout.write(self.style.SUCCESS(
+                f'{seen} inspections recomputed, {updated} updated'
+            ))
+            return
+
+        total_seen = total_updated = 0
+        for last_tire_id, seen, updated in iter_fleet_recompute(
+            chunk_size=options['chunk_size'], start_after=options['start_after'],
+        ):
+            total_seen += seen
+            total_updated += updated
+            self.stdout.write(
+                f'Tires up to id {last_tire_id}: {seen} inspections, {updated} updated '
+                f'({total_seen / max(time.monotonic() - started, 0.001):.0f} rows/s)'
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Done: {total_seen} inspections recomputed, {total_updated} updated '
+            f'in {time.monotonic() - started:.1f}s'
+        ))
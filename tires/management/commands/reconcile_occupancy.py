@@ -0,0 +1,37 @@
+# tires/management/commands/reconcile_occupancy.py
+from django.core.management.base import BaseCommand
+
+from tires.services.occupancy import ISSUE_KINDS, reconcile_occupancy
+
+
+class Command(BaseCommand):
+    help = (
+        'Find tires and positions whose occupancy disagrees (Tire.current_position vs '
+        'TirePosition.mounted_tire) and, with --apply, repair them; safe to run nightly'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--apply', action='store_true', help='Write the repairs (default: dry run)')
+
+    def handle(self, *args, **options):
+        report = reconcile_occupancy(apply=options['apply'])
+
+        for kind in ISSUE_KINDS:
+            rows = report['issues'][kind]
+            self.stdout.write(f'{kind}: {len(rows)}')
+            if options['verbosity'] > 1:
+                for tire_id, position_id in rows:
+                    self.stdout.write(f'  tire {tire_id} / position {position_id}')
+
+        verb = 'Repaired' if options['apply'] else 'Would repair'
+        if options['verbosity'] > 1:
+            for position_id, tire_id in sorted(report['positions'].items()):
+                self.stdout.write(f'  position {position_id} -> tire {tire_id or "-"}')
+            for tire_id, position_id in sorted(report['tires'].items()):
+                self.stdout.write(f'  tire {tire_id} -> position {position_id or "-"}')
+        timings = ', '.join(f'{step} {seconds * 1000:.0f} ms' for step, seconds in report['timings'].items())
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {len(report['positions'])} positions and {len(report['tires'])} tires ({timings})"
+        ))
+        if (report['positions'] or report['tires']) and not options['apply']:
+            self.stdout.write('Rerun with --apply to write the repairs')
@@ -0,0 +1,34 @@
+# tires/management/commands/refresh_cost_rollups.py
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tires.services.cost_rollups import refresh_cost_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the monthly cost-per-km rollups (pattern, brand, supplier, axle type) from the '
+        "inspections' stored distance and tread (after migrate; recompute_inspection_metrics "
+        'refreshes those); safe to run nightly'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', action='append', dest='months', metavar='YYYY-MM',
+                            help='Only rebuild this month (repeatable)')
+
+    def handle(self, *args, **options):
+        months = None
+        if options['months']:
+            try:
+                months = [datetime.datetime.strptime(month, '%Y-%m').date() for month in options['months']]
+            except ValueError:
+                raise CommandError('--month takes YYYY-MM')
+
+        started = time.monotonic()
+        rows = refresh_cost_rollups(months)
+        scope = ', '.join(f'{month:%Y-%m}' for month in months) if months else 'all months'
+        self.stdout.write(self.style.SUCCESS(
+            f'{rows} rollup rows written for {scope} in {time.monotonic() - started:.1f}s'
+        ))
@@ -0,0 +1,22 @@
+# tires/management/commands/refresh_dashboard.py
+from django.core.management.base import BaseCommand
+
+from tires.models import DashboardSnapshot
+from tires.services.dashboard import FLAG_SECTIONS, REFRESH_PARTS, STAT, refresh_dashboard
+
+PART_SECTIONS = {'stats': (STAT,), 'tire_flags': FLAG_SECTIONS}
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the landing-page dashboard snapshot (run periodically, e.g. from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', nargs='+', choices=REFRESH_PARTS, default=REFRESH_PARTS,
+                            help='Parts to rebuild (default: all)')
+
+    def handle(self, *args, **options):
+        refresh_dashboard(options['only'])
+        for part in options['only']:
+            rows = DashboardSnapshot.objects.filter(section__in=PART_SECTIONS.get(part, (part,))).count()
+            self.stdout.write(f'{part}: {rows} rows')
+        self.stdout.write(self.style.SUCCESS('Dashboard refreshed'))
@@ -0,0 +1,154 @@
+# tires/management/commands/run_benchmarks.py
+import json
+import logging
+import os
+import platform
+import tempfile
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from tires.services.benchmarks import BenchmarkFailure, BenchmarkSuite, compare, measure
+
+BENCHMARK_DIR = Path(settings.BASE_DIR) / 'benchmarks'
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a scratch database with a generated fleet and benchmark the list views, inspection '
+        'and assignment writes and the Excel import flow; fails when results regress against the baseline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vehicles', type=int, default=50)
+        parser.add_argument('--positions-per-vehicle', type=int, default=10)
+        parser.add_argument('--inspections-per-tire', type=int, default=12)
+        parser.add_argument('--years', type=float, default=2)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--import-sizes', type=int, nargs='*', default=[1000, 10000, 100000],
+                            help='Rows per Excel import case (none to skip imports)')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed requests per view case')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests before each view case')
+        parser.add_argument('--only', nargs='+', default=None,
+                            help='Run only cases whose name starts with one of these')
+        parser.add_argument('--skip-memory', action='store_true', help='Skip the tracemalloc peak-memory run')
+        parser.add_argument('--output', type=Path, default=BENCHMARK_DIR / 'results.json')
+        parser.add_argument('--baseline', type=Path, default=BENCHMARK_DIR / 'baseline.json')
+        parser.add_argument('--save-baseline', action='store_true',
+                            help='Store these results as the new baseline instead of comparing')
+        parser.add_argument('--latency-tolerance', type=float, default=0.25,
+                            help='Allowed p95 increase over the baseline (0.25 = 25%%)')
+        parser.add_argument('--memory-tolerance', type=float, default=0.25,
+                            help='Allowed peak memory increase over the baseline')
+        parser.add_argument('--database-file', default=os.path.join(tempfile.gettempdir(), 'noscodb-benchmark.sqlite3'),
+                            help='Scratch SQLite database (never the configured one)')
+        parser.add_argument('--keepdb', action='store_true',
+                            help='Keep the scratch database and reuse its fleet next time')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if not options['save_baseline'] and options['baseline'].exists():
+            baseline = json.loads(options['baseline'].read_text())
+
+        suite = BenchmarkSuite(
+            vehicles=options['vehicles'],
+            positions_per_vehicle=options['positions_per_vehicle'],
+            inspections_per_tire=options['inspections_per_tire'],
+            years=options['years'],
+            seed=options['seed'],
+            import_sizes=options['import_sizes'],
+        )
+        if baseline and baseline['meta']['fleet'] != suite.fleet:
+            raise CommandError(
+                f'Baseline {options["baseline"]} was recorded with fleet {baseline["meta"]["fleet"]}; '
+                'rerun with the same options or pass --save-baseline'
+            )
+
+        with tempfile.TemporaryDirectory() as cache_dir, override_settings(
+            DEBUG=False,
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            # Cache keys (reference data versions, counters) must not leak into the real cache
+            CACHES={'default': {**settings.CACHES['default'], 'LOCATION': cache_dir}},
+            IMPORT_BACKGROUND_JOBS=True,
+        ):
+            # The per-request log line would drown the results table; the table has the same numbers
+            request_logger = logging.getLogger('tires.requests')
+            level = request_logger.level
+            request_logger.setLevel(logging.ERROR)
+            try:
+                results = self.run_suite(suite, options)
+            finally:
+                request_logger.setLevel(level)
+
+        options['output'].parent.mkdir(parents=True, exist_ok=True)
+        options['output'].write_text(json.dumps(results, indent=2))
+        self.stdout.write(f'Results written to {options["output"]}')
+
+        if options['save_baseline']:
+            options['baseline'].parent.mkdir(parents=True, exist_ok=True)
+            options['baseline'].write_text(json.dumps(results, indent=2))
+            self.stdout.write(self.style.SUCCESS(f'Baseline saved to {options["baseline"]}'))
+            return
+        if baseline is None:
+            self.stdout.write(self.style.WARNING(
+                f'No baseline at {options["baseline"]}; store one with --save-baseline'
+            ))
+            return
+
+        regressions = compare(results, baseline, options['latency_tolerance'], options['memory_tolerance'])
+        if regressions:
+            for regression in regressions:
+                self.stderr.write(self.style.ERROR(f'REGRESSION {regression}'))
+            raise CommandError(f'{len(regressions)} regression(s) against {options["baseline"]}')
+        self.stdout.write(self.style.SUCCESS(f'No regressions against {options["baseline"]}'))
+
+    def run_suite(self, suite, options):
+        test_settings = connection.settings_dict.setdefault('TEST', {})
+        test_settings['NAME'] = options['database_file']
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False, keepdb=options['keepdb'],
+        )
+        try:
+            self.stdout.write(f'Scratch database {connection.settings_dict["NAME"]}')
+            if suite.seed():
+                self.stdout.write(f'Seeded fleet {suite.fleet}')
+
+            cases = suite.cases()
+            if options['only']:
+                cases = [case for case in cases if case.name.startswith(tuple(options['only']))]
+
+            self.stdout.write(
+                f"{'case':<30} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'queries':>8} {'peak KiB':>10}"
+            )
+            measured = {}
+            for case in cases:
+                try:
+                    result = measure(case, options['repeat'], options['warmup'], memory=not options['skip_memory'])
+                except BenchmarkFailure as e:
+                    raise CommandError(f'{case.name}: {e}')
+                measured[case.name] = result
+                peak = f"{result['peak_memory_kb']:.0f}" if result['peak_memory_kb'] is not None else '-'
+                self.stdout.write(
+                    f"{case.name:<30} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} {result['max_ms']:>9.1f} "
+                    f"{result['queries']:>8} {peak:>10}"
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+
+        return {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'fleet': suite.fleet,
+                'repeat': options['repeat'],
+                'warmup': options['warmup'],
+                'sqlite_profile': getattr(settings, 'SQLITE_PROFILE', None),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'cases': measured,
+        }
@@ -0,0 +1,59 @@
+# tires/management/commands/run_import_worker.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from tires.services.import_jobs import (
+    DEFAULT_STALE_AFTER, claim_next_job, requeue_stale_jobs, run_job, worker_name,
+)
+
+
+class Command(BaseCommand):
+    help = 'Process queued background imports (run several processes for parallel workers)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the queue and exit instead of polling forever')
+        parser.add_argument('--max-jobs', type=int, default=0,
+                            help='Exit after this many jobs (0 = no limit)')
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--chunk-size', type=int, default=None,
+                            help='Rows per write transaction (default: IMPORT_CHUNK_SIZE)')
+        parser.add_argument('--stale-after', type=int, default=DEFAULT_STALE_AFTER,
+                            help='Requeue running jobs without a heartbeat for this many seconds')
+
+    def handle(self, *args, **options):
+        name = worker_name()
+        processed = 0
+        self.stdout.write(f'Import worker {name} started')
+
+        try:
+            while True:
+                requeued = requeue_stale_jobs(options['stale_after'])
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale job(s)'))
+
+                job = claim_next_job(name)
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                self.stdout.write(f'Job {job.id}: importing {job.import_type} rows '
+                                  f'(session {job.session_id})')
+                status = run_job(job, chunk_size=options['chunk_size'])
+                job.import_log.refresh_from_db()
+                log = job.import_log
+                style = self.style.SUCCESS if status == 'completed' else self.style.ERROR
+                self.stdout.write(style(
+                    f'Job {job.id} {status}: {log.imported_rows} imported, '
+                    f'{log.failed_rows} failed in {log.import_duration}s'
+                ))
+
+                processed += 1
+                if options['max_jobs'] and processed >= options['max_jobs']:
+                    break
+        except KeyboardInterrupt:
+            self.stdout.write('Worker stopped')
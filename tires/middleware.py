@@ -0,0 +1,56 @@
+# tires/middleware.py
+import logging
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from tires.services.request_stats import QueryRecorder, query_budget, request_stats
+
+logger = logging.getLogger('tires.requests')
+
+
+class RequestStatsMiddleware:
+    """
+    Measures every request: view name, wall time, query count, SQL time and
+    repeated query shapes (N+1). Logs one line per request, warns when a view
+    goes over its query budget, and feeds the staff stats page
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+        ms = (time.perf_counter() - started) * 1000
+
+        match = request.resolver_match
+        view = match.view_name if match else '<unresolved>'
+        duplicates, worst_duplicate = recorder.duplicates()
+        budget = query_budget(view)
+        sample = {
+            'view': view,
+            'ms': ms,
+            'queries': recorder.count,
+            'sql_ms': recorder.seconds * 1000,
+            'duplicates': duplicates,
+            'worst_duplicate': worst_duplicate,
+            'over_budget': recorder.count > budget,
+        }
+        request_stats.record(sample)
+
+        logger.info(
+            'view=%s method=%s status=%s ms=%.1f queries=%d sql_ms=%.1f duplicates=%d',
+            view, request.method, response.status_code, ms, recorder.count, sample['sql_ms'], duplicates,
+        )
+        if sample['over_budget']:
+            logger.warning(
+                'view=%s over query budget: queries=%d budget=%d most_repeated=%r x%d',
+                view, recorder.count, budget, worst_duplicate[0], worst_duplicate[1],
+            )
+        return response
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:51
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tires', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='importlog',
+            name='approved_rows',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='importlog',
+            name='failed_rows',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='importlog',
+            name='import_duration',
+            field=models.IntegerField(default=0, help_text='Duration in seconds'),
+        ),
+        migrations.AlterField(
+            model_name='importlog',
+            name='imported_by',
+            field=models.ForeignKey(blank=True, help_text='Empty for imports started without a logged-in user', null=True, on_delete=django.db.models.deletion.PROTECT, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='importlog',
+            name='imported_rows',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_id', models.CharField(db_index=True, help_text='ImportStaging.SESSION_ID of the rows to import', max_length=100)),
+                ('import_type', models.CharField(max_length=50)),
+                ('mappings', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Model field -> column header')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('worker', models.CharField(blank=True, help_text='host:pid of the worker that claimed the job', max_length=100)),
+                ('attempts', models.IntegerField(default=0)),
+                ('error_message', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, help_text='Updated after every chunk; stale running jobs are requeued', null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('import_log', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='job', to='tires.importlog')),
+            ],
+            options={
+                'verbose_name': 'Import Job',
+                'verbose_name_plural': 'Import Jobs',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='tires_impor_status_ee5f7f_idx')],
+            },
+        ),
+    ]
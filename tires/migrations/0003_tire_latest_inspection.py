@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_latest_inspection(apps, schema_editor):
+    Tire = apps.get_model('tires', 'Tire')
+    TireInspection = apps.get_model('tires', 'TireInspection')
+
+    def latest(field):
+        newest = TireInspection.objects.filter(
+            tire=OuterRef('pk')
+        ).order_by('-inspection_odometer', '-id')
+        return Subquery(newest.values(field)[:1])
+
+    Tire.objects.update(
+        latest_inspection=latest('id'),
+        last_odometer=latest('inspection_odometer'),
+        last_pressure=latest('pressure'),
+        last_tread_depth=Coalesce(latest('tread_depth'), F('last_tread_depth')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tires', '0002_import_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tire',
+            name='last_odometer',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='tire',
+            name='last_pressure',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='tire',
+            name='latest_inspection',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='tires.tireinspection'),
+        ),
+        migrations.RunPython(backfill_latest_inspection, migrations.RunPython.noop),
+    ]
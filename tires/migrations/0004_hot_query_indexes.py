@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tires', '0003_tire_latest_inspection'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='importstaging',
+            index=models.Index(fields=['SESSION_ID', 'ROW_NUMBER'], name='staging_session_row_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tireassignment',
+            index=models.Index(fields=['tire', 'assignment_date', 'id'], name='assign_tire_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tireinspection',
+            index=models.Index(fields=['tire', 'inspection_odometer', 'id'], name='insp_tire_odometer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tireposition',
+            index=models.Index(condition=models.Q(('mounted_tire__isnull', True)), fields=['vehicle'], name='pos_empty_vehicle_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tireposition',
+            index=models.Index(condition=models.Q(('mounted_tire__isnull', False)), fields=['vehicle', 'id'], name='pos_mounted_vehicle_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workorder',
+            index=models.Index(fields=['status', 'vehicle'], name='wo_status_vehicle_idx'),
+        ),
+    ]
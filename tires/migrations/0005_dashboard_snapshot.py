@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tires', '0004_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(max_length=30)),
+                ('key', models.CharField(help_text='Stat name or listed object id', max_length=50)),
+                ('rank', models.FloatField(default=0, help_text='List order, highest first')),
+                ('value', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Dashboard Snapshot',
+                'verbose_name_plural': 'Dashboard Snapshots',
+                'indexes': [models.Index(fields=['section', 'rank'], name='dashboard_section_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('section', 'key'), name='dashboard_section_key_uniq')],
+            },
+        ),
+    ]
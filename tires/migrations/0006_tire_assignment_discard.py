@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tires', '0005_dashboard_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tireassignment',
+            name='is_discard_operation',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='tireassignment',
+            name='tire_position_to',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='assignments_to', to='tires.tireposition'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:47
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import TruncDate
+
+
+def backfill_inspection_date(apps, schema_editor):
+    # Existing inspections are dated by their work order; the rest stay undated
+    TireInspection = apps.get_model('tires', 'TireInspection')
+    WorkOrder = apps.get_model('tires', 'WorkOrder')
+    created = WorkOrder.objects.filter(pk=OuterRef('work_order_id')).annotate(
+        day=TruncDate('date_created'),
+    ).values('day')[:1]
+    TireInspection.objects.filter(work_order__isnull=False).update(inspection_date=Subquery(created))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tires', '0006_tire_assignment_discard'),
+    ]
+
+    operations = [
+        # Added without the default first, so existing rows are not all dated today
+        migrations.AddField(
+            model_name='tireinspection',
+            name='inspection_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_inspection_date, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='tireinspection',
+            name='inspection_date',
+            field=models.DateField(blank=True, default=django.utils.timezone.localdate, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerecord',
+            index=models.Index(fields=['tire', 'service_date', 'id'], name='maint_tire_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tireinspection',
+            index=models.Index(fields=['tire', 'inspection_date', 'id'], name='insp_tire_date_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:01
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tires', '0007_tire_timeline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TireWearForecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('FORECAST', 'Forecast'), ('DUE', 'At or below discarding depth'), ('NO_WEAR', 'No measurable wear'), ('INSUFFICIENT', 'Not enough readings')], max_length=20)),
+                ('readings', models.IntegerField(help_text='Points in the fit (inspections plus the mounting reading)')),
+                ('wear_rate', models.DecimalField(blank=True, decimal_places=3, help_text='Fitted wear, mm per 10,000 km', max_digits=8, null=True)),
+                ('r_squared', models.FloatField(blank=True, null=True)),
+                ('fitted_tread_depth', models.DecimalField(blank=True, decimal_places=2, help_text='Fitted tread depth at last_odometer', max_digits=5, null=True)),
+                ('discarding_tread_depth', models.DecimalField(decimal_places=2, max_digits=4)),
+                ('last_odometer', models.IntegerField()),
+                ('last_inspection_date', models.DateField(blank=True, null=True)),
+                ('km_per_day', models.FloatField(blank=True, null=True)),
+                ('removal_odometer', models.IntegerField(blank=True, null=True)),
+                ('removal_date', models.DateField(blank=True, null=True)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('tire', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='wear_forecast', to='tires.tire')),
+            ],
+            options={
+                'verbose_name': 'Tire Wear Forecast',
+                'verbose_name_plural': 'Tire Wear Forecasts',
+                'indexes': [models.Index(fields=['status', 'removal_date'], name='forecast_status_date_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tires', '0008_tire_wear_forecast'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CostRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('pattern', 'Pattern'), ('brand', 'Brand'), ('supplier', 'Supplier'), ('axle_type', 'Axle Type')], max_length=20)),
+                ('key', models.CharField(help_text='Pattern/supplier id, brand name or axle type', max_length=100)),
+                ('label', models.CharField(max_length=200)),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('tires', models.IntegerField(default=0, help_text='Tires that ran in the month')),
+                ('km', models.BigIntegerField(default=0)),
+                ('tread_consumed', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cost', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Cost Rollup',
+                'verbose_name_plural': 'Cost Rollups',
+            },
+        ),
+        migrations.AddField(
+            model_name='tireinspection',
+            name='distance_travelled',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='tireinspection',
+            name='tread_consumed',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=4),
+        ),
+        migrations.AddIndex(
+            model_name='tireinspection',
+            index=models.Index(fields=['inspection_date'], name='insp_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='costrollup',
+            index=models.Index(fields=['dimension', 'month'], name='rollup_dimension_month_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='costrollup',
+            constraint=models.UniqueConstraint(fields=('dimension', 'key', 'month'), name='rollup_dimension_key_month_uniq'),
+        ),
+    ]
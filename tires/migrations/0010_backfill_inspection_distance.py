@@ -0,0 +1,76 @@
+# Backfill of TireInspection.distance_travelled / tread_consumed, added in 0009 with default 0
+#
+# Order on an existing database:
+#   1. migrate                          this backfill (KMR / TDW of every stored inspection)
+#   2. manage.py refresh_cost_rollups   the rollups are summed from these two columns
+
+from decimal import Decimal
+
+import pandas as pd
+from django.db import migrations
+
+CHUNK_SIZE = 2000  # tires per pass
+
+INSPECTION_COLUMNS = {
+    'id': 'id',
+    'tire_id': 'tire_id',
+    'CTO': 'inspection_odometer',
+    'CTD': 'tread_depth',
+    'CTP': 'pressure',
+    'ITD': 'tire__pattern__initial_tread_depth',
+    'DTD': 'tire__pattern__discarding_tread_depth',
+    'ITP': 'tire__pattern__ideal_tire_pressure',
+    'TPP': 'tire__purchase_cost',
+}
+ASSIGNMENT_COLUMNS = ('tire_id', 'assignment_date', 'id', 'start_odometer', 'end_odometer')
+MAX_DISTANCE = 2 ** 31 - 1
+MAX_TREAD = 99.99  # max_digits=4, decimal_places=2
+
+
+def backfill_distance_and_tread(apps, schema_editor):
+    # The metrics engine's pure DataFrame steps, over the historical models' rows
+    from tires.services.inspection_metrics import add_previous_readings, calculate_metrics
+
+    Tire = apps.get_model('tires', 'Tire')
+    TireInspection = apps.get_model('tires', 'TireInspection')
+    TireAssignment = apps.get_model('tires', 'TireAssignment')
+
+    tire_ids = list(Tire.objects.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(tire_ids), CHUNK_SIZE):
+        chunk = tire_ids[start:start + CHUNK_SIZE]
+        in_chunk = {'tire_id__gte': chunk[0], 'tire_id__lte': chunk[-1]}
+        frame = pd.DataFrame.from_records(
+            list(TireInspection.objects.filter(**in_chunk).values_list(*INSPECTION_COLUMNS.values())),
+            columns=list(INSPECTION_COLUMNS),
+        )
+        if frame.empty:
+            continue
+        assignments = pd.DataFrame.from_records(
+            list(TireAssignment.objects.filter(**in_chunk).values_list(*ASSIGNMENT_COLUMNS)),
+            columns=list(ASSIGNMENT_COLUMNS),
+        )
+        frame = add_previous_readings(frame, assignments)
+        metrics = calculate_metrics(frame)
+        distance = metrics['KMR'].clip(upper=MAX_DISTANCE).astype('int64')
+        tread = metrics['TDW'].clip(upper=MAX_TREAD).round(2)
+
+        moved = (distance > 0) | (tread > 0)
+        TireInspection.objects.bulk_update(
+            [
+                TireInspection(id=pk, distance_travelled=int(km), tread_consumed=Decimal(f'{mm:.2f}'))
+                for pk, km, mm in zip(frame.loc[moved, 'id'], distance[moved], tread[moved])
+            ],
+            ['distance_travelled', 'tread_consumed'],
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tires', '0009_cost_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_distance_and_tread, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,8 @@
 # models.py
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
 
 class TireStatus(models.Model):
     status_name = models.CharField(max_length=50)
@@ -108,6 +109,13 @@ class TirePosition(models.Model):
 
     class Meta:
         unique_together = ['vehicle', 'axle_number', 'wheel_number']
+        indexes = [
+            # Partial indexes: empty slots per vehicle / occupied slots for the fleet snapshot
+            models.Index(fields=['vehicle'], condition=models.Q(mounted_tire__isnull=True),
+                         name='pos_empty_vehicle_idx'),
+            models.Index(fields=['vehicle', 'id'], condition=models.Q(mounted_tire__isnull=False),
+                         name='pos_mounted_vehicle_idx'),
+        ]
     
     def __str__(self):
         return f"{self.vehicle.license_plate} - {self.position_name}"
@@ -122,7 +130,12 @@ class Tire(models.Model):
     supplier = models.ForeignKey(Supplier, on_delete=models.PROTECT, null=True, blank=True)
     initial_tread_depth = models.DecimalField(max_digits=10, decimal_places=2)
     last_tread_depth = models.DecimalField(max_digits=5, decimal_places=2, null=True)
-    # last_pressure = models.DecimalField(max_digits=5, decimal_places=2, null=True)
+    # Latest inspection (highest odometer, then id) and its readings, kept in
+    # sync by TireInspection.save()/delete() and the bulk importers
+    latest_inspection = models.ForeignKey('TireInspection', on_delete=models.SET_NULL,
+                                          null=True, blank=True, related_name='+')
+    last_pressure = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    last_odometer = models.IntegerField(null=True, blank=True)
     retread_count = models.IntegerField(null=True, blank=True)
     maximum_retreads = models.IntegerField(null=True, blank=True)
     current_position = models.ForeignKey(TirePosition, on_delete=models.SET_NULL, 
@@ -160,6 +173,13 @@ class WorkOrder(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
     cost = models.DecimalField(max_digits=10, decimal_places=2, default=0,null=True)
     notes = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            # Open-order counts and "one OPENED order per vehicle" checks. Status values are
+            # bound parameters, which SQLite cannot match against a partial index predicate
+            models.Index(fields=['status', 'vehicle'], name='wo_status_vehicle_idx'),
+        ]
     
     def __str__(self):
         return self.work_order_number
@@ -176,6 +196,12 @@ class MaintenanceRecord(models.Model):
     service_provider = models.ForeignKey(Supplier, on_delete=models.PROTECT, 
                                        related_name='maintenance_services')
     notes = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            # Tire timeline (services/tire_timeline.py)
+            models.Index(fields=['tire', 'service_date', 'id'], name='maint_tire_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.tire.serial_number} - {self.service_date}"
@@ -192,6 +218,8 @@ class TireInspection(models.Model):
     tire = models.ForeignKey(Tire, on_delete=models.CASCADE, related_name='inspections')
     position = models.ForeignKey(TirePosition, on_delete=models.CASCADE)
     inspection_odometer = models.IntegerField()
+    # Null for inspections recorded before dates were kept and without a work order to date them
+    inspection_date = models.DateField(default=timezone.localdate, null=True, blank=True)
     inspector = models.ForeignKey(Employee, on_delete=models.PROTECT, 
                                 related_name='inspections')
     tread_depth = models.DecimalField(max_digits=4, decimal_places=2)
@@ -207,6 +235,9 @@ class TireInspection(models.Model):
     fuel_loss_caused = models.DecimalField(max_digits=6, decimal_places=2, default=0)
     current_tire_value = models.DecimalField(max_digits=8, decimal_places=2, default=0)
     balance_traveling_distance = models.IntegerField(default=0)
+    # Since the previous inspection (inspection_metrics.py); summed by the cost rollups
+    distance_travelled = models.IntegerField(default=0)
+    tread_consumed = models.DecimalField(max_digits=4, decimal_places=2, default=0)
 
     work_order = models.ForeignKey(
     WorkOrder,
@@ -214,11 +245,36 @@ class TireInspection(models.Model):
     related_name='tire_inspections',
     null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Latest / previous inspection per tire (ordered by odometer, id)
+            models.Index(fields=['tire', 'inspection_odometer', 'id'], name='insp_tire_odometer_idx'),
+            # Tire timeline (services/tire_timeline.py)
+            models.Index(fields=['tire', 'inspection_date', 'id'], name='insp_tire_date_idx'),
+            # Month refreshes of the cost rollups (services/cost_rollups.py)
+            models.Index(fields=['inspection_date'], name='insp_date_idx'),
+        ]
+
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        self.tire.last_tread_depth = self.tread_depth
-        self.tire.last_pressure = self.pressure
-        self.tire.save()
+        from tires.services.latest_inspection import refresh_latest_inspections
+
+        with transaction.atomic():
+            # An edit can move the inspection to another tire; refresh both
+            previous_tire_id = None
+            if self.pk:
+                previous_tire_id = TireInspection.objects.filter(pk=self.pk).values_list(
+                    'tire_id', flat=True).first()
+            super().save(*args, **kwargs)
+            refresh_latest_inspections([self.tire_id, previous_tire_id])
+
+    def delete(self, *args, **kwargs):
+        from tires.services.latest_inspection import refresh_latest_inspections
+
+        with transaction.atomic():
+            tire_id = self.tire_id
+            result = super().delete(*args, **kwargs)
+            refresh_latest_inspections([tire_id])
+        return result
 
 
     def __str__(self):
@@ -231,7 +287,7 @@ class TireAssignment(models.Model):
     tire_position_from = models.ForeignKey(TirePosition, on_delete=models.CASCADE, 
                                     related_name='assignments_from', null=True, blank=True)
     tire_position_to = models.ForeignKey(TirePosition, on_delete=models.CASCADE, 
-                                  related_name='assignments_to')
+                                  related_name='assignments_to', null=True, blank=True)  # None for discards
     assignment_date = models.DateField()
     removal_date = models.DateField(null=True, blank=True)
     start_odometer = models.IntegerField()
@@ -243,9 +299,18 @@ class TireAssignment(models.Model):
     inspection = models.ForeignKey(TireInspection, on_delete=models.SET_NULL,
                                 null=True, blank=True, related_name='assignments')
     notes = models.TextField(blank=True)
+    is_discard_operation = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['tire', 'assignment_date', 'id'], name='assign_tire_date_idx'),
+        ]
 
     def str(self):
         return f"{self.tire.serial_number} - {self.tire_position_to}"
+
+    def is_discard(self):
+        return self.is_discard_operation
     
 
 class ImportStaging(models.Model):
@@ -299,6 +364,7 @@ class ImportStaging(models.Model):
         indexes = [
             models.Index(fields=['SESSION_ID', 'STATUS']),
             models.Index(fields=['MODEL_TYPE', 'STATUS']),
+            models.Index(fields=['SESSION_ID', 'ROW_NUMBER'], name='staging_session_row_idx'),
         ]
         verbose_name = 'Import Staging'
         verbose_name_plural = 'Import Staging'
@@ -387,13 +453,20 @@ class ImportLog(models.Model):
         null=True,
         blank=True
     )
-    imported_by = models.ForeignKey(User, on_delete=models.PROTECT)
+    imported_by = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        help_text="Empty for imports started without a logged-in user"
+    )
     file_name = models.CharField(max_length=255)
     total_rows = models.IntegerField()
-    approved_rows = models.IntegerField()
-    imported_rows = models.IntegerField()
-    failed_rows = models.IntegerField()
+    approved_rows = models.IntegerField(default=0)
+    imported_rows = models.IntegerField(default=0)
+    failed_rows = models.IntegerField(default=0)
     import_duration = models.IntegerField(
+        default=0,
         help_text="Duration in seconds"
     )
     stats = models.JSONField(
@@ -413,4 +486,175 @@ class ImportLog(models.Model):
         verbose_name_plural = 'Import Logs'
 
     def __str__(self):
-        return f"{self.import_type} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
\ No newline at end of file
+        return f"{self.import_type} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+
+
+class ImportJob(models.Model):
+    """
+    Background import queue (database backed, no external broker)
+    Rows are claimed by `manage.py run_import_worker` processes; progress is
+    written to the linked ImportLog after every chunk
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    import_log = models.OneToOneField(
+        ImportLog,
+        on_delete=models.CASCADE,
+        related_name='job'
+    )
+    session_id = models.CharField(
+        max_length=100,
+        db_index=True,
+        help_text="ImportStaging.SESSION_ID of the rows to import"
+    )
+    import_type = models.CharField(max_length=50)
+    mappings = models.JSONField(
+        default=dict,
+        encoder=DjangoJSONEncoder,
+        help_text="Model field -> column header"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='queued'
+    )
+    worker = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="host:pid of the worker that claimed the job"
+    )
+    attempts = models.IntegerField(default=0)
+    error_message = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Updated after every chunk; stale running jobs are requeued"
+    )
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+        verbose_name = 'Import Job'
+        verbose_name_plural = 'Import Jobs'
+
+    def __str__(self):
+        return f"{self.import_type} job {self.pk} - {self.status}"
+
+
+class DashboardSnapshot(models.Model):
+    """
+    Precomputed landing-page data (tires/services/dashboard.py)
+    section 'stat' rows hold one number each in `value`; the list sections hold
+    one row per listed object with what the page renders in `data`
+    """
+    section = models.CharField(max_length=30)
+    key = models.CharField(max_length=50, help_text="Stat name or listed object id")
+    rank = models.FloatField(default=0, help_text="List order, highest first")
+    value = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    data = models.JSONField(default=dict, blank=True)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['section', 'key'], name='dashboard_section_key_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['section', 'rank'], name='dashboard_section_rank_idx'),
+        ]
+        verbose_name = 'Dashboard Snapshot'
+        verbose_name_plural = 'Dashboard Snapshots'
+
+    def __str__(self):
+        return f"{self.section}:{self.key}"
+
+
+class TireWearForecast(models.Model):
+    """
+    Per-tire wear forecast (tires/services/wear_forecast.py), rebuilt nightly by
+    `manage.py forecast_tire_wear`: a least-squares line of tread depth against the km
+    the tire has run (summed distance_travelled), extended to the pattern's discarding depth
+    """
+    FORECAST = 'FORECAST'
+    DUE = 'DUE'
+    NO_WEAR = 'NO_WEAR'
+    INSUFFICIENT = 'INSUFFICIENT'
+    STATUS_CHOICES = [
+        (FORECAST, 'Forecast'),
+        (DUE, 'At or below discarding depth'),
+        (NO_WEAR, 'No measurable wear'),
+        (INSUFFICIENT, 'Not enough readings'),
+    ]
+
+    tire = models.OneToOneField(Tire, on_delete=models.CASCADE, related_name='wear_forecast')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    readings = models.IntegerField(help_text="Points in the fit (inspections plus the mounting reading)")
+    wear_rate = models.DecimalField(max_digits=8, decimal_places=3, null=True, blank=True,
+                                    help_text="Fitted wear, mm per 10,000 km")
+    r_squared = models.FloatField(null=True, blank=True)
+    fitted_tread_depth = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True,
+                                             help_text="Fitted tread depth at last_odometer")
+    discarding_tread_depth = models.DecimalField(max_digits=4, decimal_places=2)
+    last_odometer = models.IntegerField()
+    last_inspection_date = models.DateField(null=True, blank=True)
+    km_per_day = models.FloatField(null=True, blank=True)
+    removal_odometer = models.IntegerField(null=True, blank=True)
+    removal_date = models.DateField(null=True, blank=True)
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Upcoming removals
+            models.Index(fields=['status', 'removal_date'], name='forecast_status_date_idx'),
+        ]
+        verbose_name = 'Tire Wear Forecast'
+        verbose_name_plural = 'Tire Wear Forecasts'
+
+    def __str__(self):
+        return f"{self.tire} - {self.status}"
+
+
+class CostRollup(models.Model):
+    """
+    Monthly cost-per-km aggregates (tires/services/cost_rollups.py) by pattern, brand,
+    supplier and axle type, summed from the inspections dated in the month
+    Rebuilt by `manage.py refresh_cost_rollups`; inspection writes refresh the months they touch
+    """
+    DIMENSION_CHOICES = [
+        ('pattern', 'Pattern'),
+        ('brand', 'Brand'),
+        ('supplier', 'Supplier'),
+        ('axle_type', 'Axle Type'),
+    ]
+
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES)
+    key = models.CharField(max_length=100, help_text="Pattern/supplier id, brand name or axle type")
+    label = models.CharField(max_length=200)
+    month = models.DateField(help_text="First day of the month")
+    tires = models.IntegerField(default=0, help_text="Tires that ran in the month")
+    km = models.BigIntegerField(default=0)
+    tread_consumed = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    cost = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'key', 'month'], name='rollup_dimension_key_month_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['dimension', 'month'], name='rollup_dimension_month_idx'),
+        ]
+        verbose_name = 'Cost Rollup'
+        verbose_name_plural = 'Cost Rollups'
+
+    def __str__(self):
+        return f"{self.dimension}:{self.key} {self.month:%Y-%m}"
@@ -0,0 +1,4 @@
+# tires/services/__init__.py
+"""
+Query and data services shared by the views, management commands and JSON endpoints
+"""
@@ -0,0 +1,172 @@
+# tires/services/batch_inspections.py
+"""
+Batch inspection submission: readings for one or many vehicles are validated
+up front with one query per referenced model, then written in a single
+transaction (bulk_create + latest-inspection refresh + one metrics pass)
+
+Payload
+  {
+    "inspector_id": 3, "work_order_id": 7, "wear_id": 1,       # batch defaults (optional)
+    "vehicles": [
+      {"vehicle_id": 12, "odometer": 154000, "inspector_id": 3, "work_order_id": 7,
+       "readings": [{"tire_id": 41, "tread_depth": 11.5, "pressure": 98, "wear_id": 2}, ...]},
+      ...
+    ]
+  }
+"""
+
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from tires.models import Employee, TireInspection, TirePosition, TireWearType, WorkOrder
+
+from .dashboard import inspections_added
+from .inspection_metrics import recompute_tire_metrics
+from .latest_inspection import refresh_latest_inspections
+from .reference_data import reference_table
+
+MAX_TREAD_DEPTH = Decimal('99.99')
+MAX_PRESSURE = Decimal('999.99')
+
+
+class InvalidInspectionBatch(ValueError):
+    """Raised with every validation error of a batch; nothing is written"""
+
+    def __init__(self, errors):
+        super().__init__('; '.join(errors))
+        self.errors = errors
+
+
+def parse_decimal(value, maximum):
+    try:
+        number = Decimal(str(value))
+    except (InvalidOperation, TypeError, ValueError):
+        return None
+    if not number.is_finite() or number < 0 or number > maximum:
+        return None
+    return number.quantize(Decimal('0.01'))
+
+
+def parse_int(value):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number >= 0 else None
+
+
+def collect_ids(vehicles, batch, key):
+    ids = {batch.get(key)} | {entry.get(key) for entry in vehicles}
+    for entry in vehicles:
+        readings = entry.get('readings')
+        if isinstance(readings, list):
+            ids |= {reading.get(key) for reading in readings if isinstance(reading, dict)}
+    return {parse_int(value) for value in ids if value not in (None, '')} - {None}
+
+
+def build_inspection_batch(batch):
+    """Validate a payload and return unsaved TireInspection objects, or raise InvalidInspectionBatch"""
+    vehicles = batch.get('vehicles')
+    if not isinstance(vehicles, list) or not vehicles:
+        raise InvalidInspectionBatch(['vehicles must be a non-empty list'])
+    if not all(isinstance(entry, dict) for entry in vehicles):
+        raise InvalidInspectionBatch(['every vehicles entry must be an object'])
+
+    vehicle_ids = {parse_int(entry.get('vehicle_id')) for entry in vehicles} - {None}
+
+    # Mounted tires of every vehicle in the batch: one query
+    mounted = {}
+    for position_id, vehicle_id, tire_id in TirePosition.objects.filter(
+        vehicle_id__in=vehicle_ids, mounted_tire__isnull=False,
+    ).values_list('id', 'vehicle_id', 'mounted_tire_id'):
+        mounted[(vehicle_id, tire_id)] = position_id
+
+    inspectors = reference_table(Employee).ids()
+    work_orders = set(WorkOrder.objects.filter(
+        id__in=collect_ids(vehicles, batch, 'work_order_id')).values_list('id', flat=True))
+    wear_table = reference_table(TireWearType)
+    fallback_wear = wear_table.first_id()
+    wear_types = wear_table.ids()
+
+    errors = []
+    objects = []
+    for v, entry in enumerate(vehicles):
+        where = f'vehicles[{v}]'
+        vehicle_id = parse_int(entry.get('vehicle_id'))
+        odometer = parse_int(entry.get('odometer'))
+        inspector_id = parse_int(entry.get('inspector_id') or batch.get('inspector_id'))
+        work_order_id = entry.get('work_order_id') or batch.get('work_order_id')
+        work_order_id = parse_int(work_order_id) if work_order_id not in (None, '') else None
+
+        if vehicle_id is None:
+            errors.append(f'{where}: vehicle_id is required')
+        if odometer is None:
+            errors.append(f'{where}: odometer must be a non-negative integer')
+        if inspector_id not in inspectors:
+            errors.append(f'{where}: inspector not found')
+        if work_order_id is not None and work_order_id not in work_orders:
+            errors.append(f'{where}: work order {work_order_id} not found')
+
+        readings = entry.get('readings')
+        if not isinstance(readings, list) or not readings:
+            errors.append(f'{where}: readings must be a non-empty list')
+            continue
+
+        seen_tires = set()
+        for r, reading in enumerate(readings):
+            where_reading = f'{where}.readings[{r}]'
+            if not isinstance(reading, dict):
+                errors.append(f'{where_reading}: must be an object')
+                continue
+            tire_id = parse_int(reading.get('tire_id'))
+            tread = parse_decimal(reading.get('tread_depth'), MAX_TREAD_DEPTH)
+            pressure = parse_decimal(reading.get('pressure'), MAX_PRESSURE)
+            wear_id = parse_int(
+                reading.get('wear_id') or entry.get('wear_id') or batch.get('wear_id') or fallback_wear
+            )
+            position_id = mounted.get((vehicle_id, tire_id))
+
+            if position_id is None:
+                errors.append(f'{where_reading}: tire {reading.get("tire_id")} is not mounted on vehicle {entry.get("vehicle_id")}')
+            if tire_id in seen_tires:
+                errors.append(f'{where_reading}: tire {tire_id} appears twice for this vehicle')
+            if tread is None:
+                errors.append(f'{where_reading}: tread_depth must be a number between 0 and {MAX_TREAD_DEPTH}')
+            if pressure is None:
+                errors.append(f'{where_reading}: pressure must be a number between 0 and {MAX_PRESSURE}')
+            if wear_id not in wear_types:
+                errors.append(f'{where_reading}: wear type not found' if wear_types else f'{where_reading}: no wear types defined')
+            seen_tires.add(tire_id)
+
+            objects.append(TireInspection(
+                tire_id=tire_id,
+                position_id=position_id,
+                inspection_odometer=odometer,
+                inspector_id=inspector_id,
+                tread_depth=tread,
+                pressure=pressure,
+                wear_id_id=wear_id,
+                work_order_id=work_order_id,
+            ))
+
+    if errors:
+        raise InvalidInspectionBatch(errors)
+    return objects
+
+
+def submit_inspection_batch(batch):
+    """
+    Validate and write a batch atomically
+    Returns the created inspections; raises InvalidInspectionBatch without writing anything
+    """
+    objects = build_inspection_batch(batch)
+    tire_ids = {obj.tire_id for obj in objects}
+
+    with transaction.atomic():
+        created = TireInspection.objects.bulk_create(objects)
+        # bulk_create skips TireInspection.save(): refresh pointers and metrics set-wise
+        refresh_latest_inspections(tire_ids)
+        recompute_tire_metrics(tire_ids)
+        transaction.on_commit(inspections_added)
+    return created
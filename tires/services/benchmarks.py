@@ -0,0 +1,401 @@
+# tires/services/benchmarks.py
+"""
+Benchmark harness behind `manage.py run_benchmarks`
+
+Drives the key paths with Django's test client against a seeded scratch database:
+every *_list view, the inspection/assignment write views and the full Excel import
+flow. Each case records latency percentiles, query counts and peak Python memory;
+results are compared with a stored baseline so regressions fail the run
+"""
+
+import io
+import time
+import tracemalloc
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client
+from django.urls import URLResolver, get_resolver, reverse
+from openpyxl import Workbook
+
+from tires.models import (
+    Employee, ImportJob, Tire, TirePattern, TirePosition, TireStatus, TireWearType, Vehicle, WorkOrder,
+)
+
+from .fleet_generator import FleetGenerator, refresh_derived_data
+from .import_jobs import claim_next_job, run_job
+from .reference_data import REFERENCE_MODELS, reference_table
+from .request_stats import QueryRecorder
+
+BENCH_PREFIX = 'BENCH'
+SPARE_POSITION = 'Benchmark Spare'
+ODOMETER_STEP = 500
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Baseline comparison: relative tolerance plus an absolute floor, so noise on
+# 2 ms views or a few KiB of allocations does not count as a regression
+MIN_LATENCY_DELTA_MS = 2.0
+MIN_MEMORY_DELTA_KB = 256
+
+
+class BenchmarkFailure(Exception):
+    """A benchmarked request failed or did not have its effect"""
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))]
+
+
+def size_label(rows):
+    return f'{rows // 1000}k' if rows >= 1000 and rows % 1000 == 0 else str(rows)
+
+
+def list_view_names(patterns=None):
+    """Names of the argument-less *_list URLs, in urlconf order (namespaced apps such as admin skipped)"""
+    names = []
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            if not pattern.namespace:
+                names += list_view_names(pattern.url_patterns)
+        elif pattern.name and pattern.name.endswith('_list') and not pattern.pattern.regex.groups:
+            names.append(pattern.name)
+    return names
+
+
+def expect(response, *statuses):
+    if response.status_code not in statuses:
+        raise BenchmarkFailure(
+            f'{response.request["REQUEST_METHOD"]} {response.request["PATH_INFO"]} '
+            f'returned {response.status_code}, expected {" or ".join(map(str, statuses))}'
+        )
+    return response
+
+
+def expect_redirect(response, url_name):
+    expect(response, 302)
+    if response.url.split('?')[0] != reverse(url_name):
+        raise BenchmarkFailure(f'{response.request["PATH_INFO"]} redirected to {response.url}, expected {url_name}')
+    return response
+
+
+# ============================================================================
+# Cases
+# ============================================================================
+
+class Case:
+    """
+    prepare(i) builds the input of iteration i (not timed), run(payload) is timed,
+    verify(payload, result) checks the effect (not timed)
+    """
+
+    def __init__(self, name, run, prepare=None, verify=None, repeat=None, warmup=None):
+        self.name = name
+        self.run = run
+        self.prepare = prepare or (lambda i: i)
+        self.verify = verify
+        self.repeat = repeat
+        self.warmup = warmup
+
+
+def measure(case, repeat, warmup, memory=True):
+    """
+    Run warmup + repeat timed iterations, then one more under tracemalloc for the
+    peak (tracing slows allocation-heavy code, so it is kept out of the timings)
+    """
+    repeat = case.repeat if case.repeat is not None else repeat
+    warmup = case.warmup if case.warmup is not None else warmup
+    timings, queries, peak_kb = [], [], None
+    for i in range(warmup + repeat + int(memory)):
+        payload = case.prepare(i)
+        traced = i == warmup + repeat
+        if traced:
+            tracemalloc.start()
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            result = case.run(payload)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if traced:
+            peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+        if case.verify:
+            case.verify(payload, result)
+        if warmup <= i < warmup + repeat:
+            timings.append(elapsed_ms)
+            queries.append(recorder.count)
+
+    return {
+        'runs': len(timings),
+        'p50_ms': round(percentile(timings, 0.50), 2),
+        'p95_ms': round(percentile(timings, 0.95), 2),
+        'max_ms': round(max(timings), 2),
+        'queries': percentile(queries, 0.50),
+        'max_queries': max(queries),
+        'peak_memory_kb': round(peak_kb, 1) if peak_kb is not None else None,
+    }
+
+
+class BenchmarkSuite:
+    """Seeds the fleet and builds the cases; runs against whatever database is active"""
+
+    def __init__(self, vehicles=50, positions_per_vehicle=10, inspections_per_tire=12, years=2, seed=42,
+                 import_sizes=(1000, 10000, 100000)):
+        self.fleet = {
+            'vehicles': vehicles, 'positions_per_vehicle': positions_per_vehicle,
+            'inspections_per_tire': inspections_per_tire, 'years': years, 'seed': seed,
+        }
+        self.import_sizes = import_sizes
+        self.client = Client()
+        self.odometers = None
+
+    def seed(self):
+        """Generate the fleet once; a kept scratch database is reused as is"""
+        if Vehicle.objects.filter(license_plate__startswith=f'{BENCH_PREFIX}-').exists():
+            return False
+        for _ in FleetGenerator(prefix=BENCH_PREFIX, **self.fleet).run():
+            pass
+        refresh_derived_data()
+        return True
+
+    def cases(self):
+        # Warm reference tables so query counts do not depend on which cases ran first
+        for model in REFERENCE_MODELS:
+            reference_table(model)
+        return [
+            *self.list_cases(),
+            self.inspection_create_case(),
+            self.bulk_update_case(),
+            self.assignment_create_case(),
+            *self.import_cases(),
+        ]
+
+    # ------------------------------------------------------------------------
+    # Read paths
+    # ------------------------------------------------------------------------
+
+    def list_cases(self):
+        return [
+            Case(name, lambda url: expect(self.client.get(url), 200), prepare=lambda i, url=reverse(name): url)
+            for name in list_view_names()
+        ]
+
+    # ------------------------------------------------------------------------
+    # Write paths
+    # ------------------------------------------------------------------------
+
+    def mounted_positions(self):
+        """(vehicle_id, position_id, tire_id) of every mounted benchmark position"""
+        return list(
+            TirePosition.objects.filter(
+                vehicle__license_plate__startswith=f'{BENCH_PREFIX}-', mounted_tire__isnull=False,
+            ).order_by('vehicle_id', 'id').values_list('vehicle_id', 'id', 'mounted_tire_id')
+        )
+
+    def next_odometers(self):
+        """Per vehicle: an odometer past every reading so far, shared and advanced by the write cases"""
+        if self.odometers is None:
+            self.odometers = {}
+            for vehicle_id, odometer in Tire.objects.filter(
+                current_position__vehicle__license_plate__startswith=f'{BENCH_PREFIX}-',
+            ).values_list('current_position__vehicle_id', 'last_odometer'):
+                self.odometers[vehicle_id] = max(self.odometers.get(vehicle_id, 0), odometer or 0)
+        return self.odometers
+
+    def vehicle_work_orders(self):
+        work_orders = {}
+        for vehicle_id, work_order_id in WorkOrder.objects.filter(
+            vehicle__license_plate__startswith=f'{BENCH_PREFIX}-',
+        ).order_by('vehicle_id', 'id').values_list('vehicle_id', 'id'):
+            work_orders[vehicle_id] = work_order_id
+        return work_orders
+
+    def inspection_create_case(self):
+        mounted = self.mounted_positions()
+        odometers = self.next_odometers()
+        inspector_id = Employee.objects.order_by('id').values_list('id', flat=True).first()
+        wear_id = TireWearType.objects.order_by('id').values_list('id', flat=True).first()
+        url = reverse('tire_inspections_create')
+
+        def prepare(i):
+            vehicle_id, position_id, tire_id = mounted[i % len(mounted)]
+            odometers[vehicle_id] += ODOMETER_STEP
+            return {
+                'tire': tire_id, 'position': position_id, 'inspection_odometer': odometers[vehicle_id],
+                'inspector': inspector_id, 'tread_depth': '9.50', 'pressure': '101.5', 'wear_id': wear_id,
+            }
+
+        def verify(data, response):
+            if Tire.objects.get(id=data['tire']).last_odometer != data['inspection_odometer']:
+                raise BenchmarkFailure(f'tire_inspections_create did not record tire {data["tire"]}')
+
+        return Case('tire_inspections_create',
+                    lambda data: expect_redirect(self.client.post(url, data), 'tire_inspections_list'),
+                    prepare=prepare, verify=verify)
+
+    def bulk_update_case(self):
+        tires_by_vehicle = {}
+        for vehicle_id, _, tire_id in self.mounted_positions():
+            tires_by_vehicle.setdefault(vehicle_id, []).append(tire_id)
+        vehicle_ids = sorted(tires_by_vehicle)
+        odometers = self.next_odometers()
+        work_orders = self.vehicle_work_orders()
+        inspector_id = Employee.objects.order_by('id').values_list('id', flat=True).first()
+        url = reverse('bulk_tire_update')
+
+        def prepare(i):
+            vehicle_id = vehicle_ids[i % len(vehicle_ids)]
+            odometers[vehicle_id] += ODOMETER_STEP
+            data = {
+                'vehicle_id': vehicle_id, 'work_order_id': work_orders[vehicle_id],
+                'inspector_id': inspector_id, 'odometer': odometers[vehicle_id],
+            }
+            for tire_id in tires_by_vehicle[vehicle_id]:
+                data[f'tire_{tire_id}_new_tread'] = '9.00'
+                data[f'tire_{tire_id}_new_pressure'] = '100.0'
+            return data
+
+        def run(data):
+            response = expect(self.client.post(url, data), 200)
+            if response.json().get('status') != 'success':
+                raise BenchmarkFailure(f'bulk_tire_update failed: {response.json()}')
+            return response
+
+        return Case('bulk_tire_update', run, prepare=prepare)
+
+    def assignment_create_case(self):
+        """Moves a tire into the vehicle's empty spare position; the position it left is the next target"""
+        positions = {}
+        for vehicle_id, position_id, tire_id in self.mounted_positions():
+            positions.setdefault(vehicle_id, []).append(position_id)
+        vehicle_ids = sorted(positions)
+        spares = dict(TirePosition.objects.filter(
+            vehicle_id__in=vehicle_ids, position_name=SPARE_POSITION,
+        ).values_list('vehicle_id', 'id'))
+        missing = [
+            TirePosition(vehicle_id=vehicle_id, position_name=SPARE_POSITION, axle_number=99, wheel_number=1,
+                         axle_type='TRAILER', is_spare=True)
+            for vehicle_id in vehicle_ids if vehicle_id not in spares
+        ]
+        for position in TirePosition.objects.bulk_create(missing):
+            spares[position.vehicle_id] = position.id
+        positions = {vehicle_id: ids + [spares[vehicle_id]] for vehicle_id, ids in positions.items()}
+        empty = {
+            vehicle_id: next(
+                position_id for position_id, tire_id in TirePosition.objects.filter(id__in=ids)
+                .values_list('id', 'mounted_tire_id') if tire_id is None
+            )
+            for vehicle_id, ids in positions.items()
+        }
+        odometers = self.next_odometers()
+        work_orders = self.vehicle_work_orders()
+        url = reverse('tire_assignment_create')
+
+        def prepare(i):
+            vehicle_id = vehicle_ids[i % len(vehicle_ids)]
+            ids = positions[vehicle_id]
+            to_position = empty[vehicle_id]
+            from_position = ids[(ids.index(to_position) + 1) % len(ids)]
+            tire_id = TirePosition.objects.values_list('mounted_tire_id', flat=True).get(id=from_position)
+            empty[vehicle_id] = from_position
+            return {
+                'tire': tire_id, 'tire_position_from': from_position, 'tire_position_to': to_position,
+                'work_order': work_orders[vehicle_id], 'start_odometer': odometers[vehicle_id],
+            }
+
+        def verify(data, response):
+            if not TirePosition.objects.filter(id=data['tire_position_to'], mounted_tire_id=data['tire']).exists():
+                raise BenchmarkFailure(f'tire_assignment_create did not move tire {data["tire"]}')
+
+        return Case('tire_assignment_create',
+                    lambda data: expect_redirect(self.client.post(url, data), 'tire_assignment_list'),
+                    prepare=prepare, verify=verify)
+
+    # ------------------------------------------------------------------------
+    # Excel import flow: upload -> mapping -> select all -> confirm -> worker -> success
+    # ------------------------------------------------------------------------
+
+    def import_cases(self):
+        TireStatus.objects.get_or_create(status_name='READY', defaults={'description': 'Ready'})
+        return [
+            Case(f'import_tire_{size_label(rows)}', self.run_import, prepare=self.import_file(rows),
+                 verify=self.verify_import, repeat=1, warmup=0)
+            for rows in self.import_sizes
+        ]
+
+    def import_file(self, rows):
+        patterns = list(TirePattern.objects.order_by('id').values_list('pattern_code', flat=True))
+
+        def prepare(i):
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet()
+            sheet.append(['Serial Number', 'Size', 'Pattern', 'Status', 'Purchase Date', 'Purchase Cost'])
+            run_tag = f'{BENCH_PREFIX}-IMP-{time.time_ns():x}'
+            for row in range(rows):
+                sheet.append([f'{run_tag}-{row:06d}', '315/80R22.5', patterns[row % len(patterns)], 'READY',
+                              '2024-01-15', 350])
+            content = io.BytesIO()
+            workbook.save(content)
+            # A fresh client per upload: every run starts a new session, as a user would
+            return {'rows': rows, 'name': f'{run_tag}.xlsx', 'content': content.getvalue(), 'client': Client()}
+
+        return prepare
+
+    def run_import(self, upload):
+        client = upload['client']
+        expect_redirect(client.post(reverse('import_excel_upload'), {
+            'import_type': 'tire',
+            'file': SimpleUploadedFile(upload['name'], upload['content'], content_type=XLSX_CONTENT_TYPE),
+        }), 'import_excel_mapping')
+        expect_redirect(client.post(reverse('import_excel_mapping'), {
+            'map_serial_number': 'Serial Number', 'map_size': 'Size', 'map_tire_pattern': 'Pattern',
+            'map_tire_status': 'Status', 'map_purchase_date': 'Purchase Date', 'map_purchase_cost': 'Purchase Cost',
+        }), 'import_excel_preview')
+        expect_redirect(client.post(reverse('import_excel_preview'), {'action': 'select_all'}), 'import_excel_preview')
+        expect_redirect(client.post(reverse('import_excel_preview'), {'action': 'continue'}), 'import_excel_confirm')
+        expect_redirect(client.post(reverse('import_excel_confirm')), 'import_excel_success')
+        # The background worker's share of the flow, run in-process
+        while (job := claim_next_job('benchmark')) is not None:
+            run_job(job)
+        expect(client.get(reverse('import_excel_success')), 200)
+        return client.session.get('import_job_id')
+
+    def verify_import(self, upload, job_id):
+        job = ImportJob.objects.select_related('import_log').filter(id=job_id).first()
+        if job is None or job.status != 'completed' or job.import_log.imported_rows != upload['rows']:
+            raise BenchmarkFailure(
+                f'Import of {upload["rows"]} rows did not complete: '
+                f'{job.status if job else "no job"}, {job.import_log.imported_rows if job else 0} imported'
+                + (f', {job.error_message}' if job and job.error_message else '')
+            )
+
+
+# ============================================================================
+# Baseline comparison
+# ============================================================================
+
+def compare(results, baseline, latency_tolerance=0.25, memory_tolerance=0.25):
+    """
+    Regressions of `results` against `baseline` as messages: p95 latency or peak
+    memory over the tolerance (and the absolute floor), or more queries than before
+    """
+    regressions = []
+    for name, current in results['cases'].items():
+        previous = baseline['cases'].get(name)
+        if previous is None:
+            continue
+        limit = previous['p95_ms'] * (1 + latency_tolerance)
+        if current['p95_ms'] > limit and current['p95_ms'] - previous['p95_ms'] > MIN_LATENCY_DELTA_MS:
+            regressions.append(f'{name}: p95 {current["p95_ms"]:.1f} ms, baseline {previous["p95_ms"]:.1f} ms')
+        if current['queries'] > previous['queries']:
+            regressions.append(f'{name}: {current["queries"]} queries, baseline {previous["queries"]}')
+        if current.get('peak_memory_kb') and previous.get('peak_memory_kb'):
+            limit = previous['peak_memory_kb'] * (1 + memory_tolerance)
+            if (current['peak_memory_kb'] > limit
+                    and current['peak_memory_kb'] - previous['peak_memory_kb'] > MIN_MEMORY_DELTA_KB):
+                regressions.append(
+                    f'{name}: peak memory {current["peak_memory_kb"]:.0f} KiB, '
+                    f'baseline {previous["peak_memory_kb"]:.0f} KiB'
+                )
+    return regressions
@@ -0,0 +1,41 @@
+# tires/services/bulk_sql.py
+"""
+Set-based write helpers shared by the import, staging and metrics services
+"""
+
+from django.db import connection, transaction
+
+# Keep IN (...) lists under SQLite's bound-parameter limit
+LOOKUP_BATCH_SIZE = 500
+
+
+def batched(values, size=LOOKUP_BATCH_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def filtered_by_ids(queryset, ids=None, id_range=None, field='id'):
+    """
+    Split a queryset into IN-list batches of `ids`, or restrict it to an inclusive
+    (first, last) `id_range`; with neither, the queryset is returned whole
+    """
+    if id_range is not None:
+        return [queryset.filter(**{f'{field}__gte': id_range[0], f'{field}__lte': id_range[1]})]
+    if ids is not None:
+        return [queryset.filter(**{f'{field}__in': batch}) for batch in batched(ids)]
+    return [queryset]
+
+
+def update_rows(model, fields, params, batch_size=1000):
+    """
+    Per-row UPDATE of `fields` via executemany; params are (*values, pk) tuples
+    Much cheaper than bulk_update's CASE expressions for thousands of rows
+    """
+    opts = model._meta
+    qn = connection.ops.quote_name
+    assignments = ', '.join(f'{qn(opts.get_field(field).column)} = %s' for field in fields)
+    sql = f'UPDATE {qn(opts.db_table)} SET {assignments} WHERE {qn(opts.pk.column)} = %s'
+    with transaction.atomic(), connection.cursor() as cursor:
+        for batch in batched(params, batch_size):
+            cursor.executemany(sql, batch)
@@ -0,0 +1,160 @@
+# tires/services/cost_rollups.py
+"""
+Cost-per-km rollups: per month, by pattern, brand, supplier and axle type, the
+tires that ran, km run, tread consumed and its cost, in the CostRollup table
+
+Each inspection carries its distance and tread consumed since the previous one
+(inspection_metrics.py); a month's rows are one GROUP BY per dimension over the
+inspections dated in it, costed at the inspection's cost per mm (Cmm)
+refresh_cost_rollups() (`manage.py refresh_cost_rollups`) rebuilds everything or
+some months; writes refresh the months they touch after commit:
+  recompute_metrics()       inspections whose metrics changed (inspection_metrics.py)
+  tires/signals.py          edited and deleted inspections
+  inspections_moving()      inspections moved to another position by an assignment
+The report page reads only the rollups
+Existing databases: migration 0010 backfills the inspections' distance and tread,
+then run `manage.py refresh_cost_rollups` once; after a formula change run
+`manage.py recompute_inspection_metrics` first (it rebuilds the rollups when rows change)
+"""
+
+import datetime
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from tires.models import CostRollup, TireInspection, TirePosition
+
+CENT = Decimal('0.01')
+MICRO = Decimal('0.000001')
+NO_SUPPLIER = 'No supplier'
+
+# dimension: (key field, label fields)
+DIMENSIONS = {
+    'pattern': ('tire__pattern_id', ('tire__pattern__brand_name', 'tire__pattern__pattern_code')),
+    'brand': ('tire__pattern__brand_name', ()),
+    'supplier': ('tire__supplier_id', ('tire__supplier__supplier_name',)),
+    'axle_type': ('position__axle_type', ()),
+}
+AXLE_TYPE_LABELS = dict(TirePosition.AXLE_TYPES)
+
+
+def month_start(value):
+    return value.replace(day=1)
+
+
+def next_month(month):
+    return (month + datetime.timedelta(days=32)).replace(day=1)
+
+
+def in_months(months):
+    condition = Q()
+    for month in months:
+        condition |= Q(inspection_date__gte=month, inspection_date__lt=next_month(month))
+    return condition
+
+
+def cents(value):
+    # SQLite sums decimals as floats: drop the summation-order noise before rounding to cents
+    return Decimal(value or 0).quantize(MICRO).quantize(CENT)
+
+
+def label(dimension, key, values):
+    if dimension == 'pattern':
+        return f'{values[0]} - {values[1]}'
+    if dimension == 'supplier':
+        return values[0] if key is not None else NO_SUPPLIER
+    if dimension == 'axle_type':
+        return AXLE_TYPE_LABELS.get(key, key)
+    return key
+
+
+def rollup_rows(months=None):
+    """Unsaved CostRollup rows for the given months (all dated inspections when None)"""
+    inspections = TireInspection.objects.filter(inspection_date__isnull=False)
+    if months is not None:
+        inspections = inspections.filter(in_months(months))
+    inspections = inspections.annotate(month=TruncMonth('inspection_date'))
+
+    for dimension, (key_field, label_fields) in DIMENSIONS.items():
+        grouped = inspections.values('month', key_field, *label_fields).annotate(
+            ran=Count('tire', distinct=True, filter=Q(distance_travelled__gt=0)),
+            km=Sum('distance_travelled'),
+            tread=Sum('tread_consumed'),
+            spent=Sum(F('tread_consumed') * F('cost_per_mm_tread_depth'),
+                      output_field=DecimalField(max_digits=14, decimal_places=2)),
+        ).order_by()
+        for row in grouped:
+            if not row['km'] and not row['tread']:
+                continue
+            key = row[key_field]
+            yield CostRollup(
+                dimension=dimension,
+                key=str(key) if key is not None else '',
+                label=label(dimension, key, [row[field] for field in label_fields])[:200],
+                month=row['month'],
+                tires=row['ran'],
+                km=row['km'],
+                tread_consumed=cents(row['tread']),
+                cost=cents(row['spent']),
+            )
+
+
+def refresh_cost_rollups(months=None):
+    """Rebuild the rollups of some months (dates in them), or of everything; returns the rows written"""
+    if months is not None:
+        months = sorted({month_start(month) for month in months if month is not None})
+        if not months:
+            return 0
+    rows = list(rollup_rows(months))
+    with transaction.atomic():
+        stale = CostRollup.objects.all()
+        if months is not None:
+            stale = stale.filter(month__in=months)
+        stale.delete()
+        CostRollup.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def months_changed(dates):
+    """Refresh the months of these inspection dates once the transaction commits"""
+    months = {month_start(value) for value in dates if value is not None}
+    if months:
+        transaction.on_commit(lambda: refresh_cost_rollups(months))
+
+
+def inspections_moving(inspections):
+    """Call before moving `inspections` to another position: their months change axle type"""
+    months_changed(inspections.dates('inspection_date', 'month'))
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+def cost_per_1000_km(cost, km):
+    return (cost * 1000 / km).quantize(CENT) if km else None
+
+
+def cost_report(dimension, first_month, last_month):
+    """
+    Rollups of one dimension over [first_month, last_month]:
+    (rows sorted by cost per 1000 km, cheapest first, monthly fleet totals)
+    """
+    rollups = CostRollup.objects.filter(dimension=dimension, month__gte=first_month, month__lte=last_month)
+    totals = dict(km=Sum('km'), tread_consumed=Sum('tread_consumed'), cost=Sum('cost'))
+
+    rows = []
+    for row in rollups.values('key').annotate(tire_months=Sum('tires'), months=Count('id'), **totals):
+        row['cost_per_1000_km'] = cost_per_1000_km(row['cost'], row['km'])
+        rows.append(row)
+    labels = dict(rollups.order_by('month').values_list('key', 'label'))  # latest label per key
+    for row in rows:
+        row['label'] = labels.get(row['key'], row['key'])
+    rows.sort(key=lambda row: (row['cost_per_1000_km'] is None, row['cost_per_1000_km'] or 0, row['label']))
+
+    monthly = list(rollups.values('month').annotate(tires=Sum('tires'), **totals).order_by('month'))
+    for month in monthly:
+        month['cost_per_1000_km'] = cost_per_1000_km(month['cost'], month['km'])
+    return rows, monthly
@@ -0,0 +1,368 @@
+# tires/services/dashboard.py
+"""
+Landing-page dashboard served from the DashboardSnapshot table
+
+refresh_dashboard() (`manage.py refresh_dashboard`, run periodically) rebuilds the
+snapshot from the live tables; writes keep it current in between:
+  tires/signals.py             vehicles, work orders, tire status/cost, inspections
+  refresh_tire_flags()         whenever tire readings change (latest_inspection.py)
+  tires_moved()                tire rotations, which bulk-update tires (rotations.py)
+Reading the page is one query for the stats and one per list, each on the
+(section, rank) index, whatever the size of the fleet
+"""
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from tires.models import DashboardSnapshot, Tire, TireInspection, Vehicle, WorkOrder
+
+from .bulk_sql import batched, filtered_by_ids
+from .summary_counters import ACTIVE_STATUS_NAMES, OPEN_WORK_ORDER_STATUSES, status_ids
+
+LIST_SIZE = 10  # rows kept for the bounded lists (the page shows 5)
+UNDER_INFLATION_RATIO = Decimal('0.90')  # below 90% of the pattern's ideal pressure
+
+STAT = 'stat'
+RECENT_INSPECTIONS = 'recent_inspections'
+PENDING_WORK_ORDERS = 'pending_work_orders'
+BELOW_DISCARD = 'below_discard_tires'
+UNDER_INFLATED = 'under_inflated_tires'
+FLAG_SECTIONS = (BELOW_DISCARD, UNDER_INFLATED)
+LIST_SECTIONS = (RECENT_INSPECTIONS, PENDING_WORK_ORDERS) + FLAG_SECTIONS
+
+# refresh_dashboard() parts
+REFRESH_PARTS = ('stats', RECENT_INSPECTIONS, PENDING_WORK_ORDERS, 'tire_flags')
+
+DATE_FIELDS = ('inspection_date',)
+DATETIME_FIELDS = ('date_created',)
+COUNT_STATS = (
+    'total_vehicles', 'active_tires', 'active_work_orders', 'inspections_today',
+    'below_discard_count', 'under_inflated_count',
+)
+
+
+# ============================================================================
+# Snapshot rows
+# ============================================================================
+
+def upsert_rows(section, rows):
+    """rows: (key, rank, data) or (key, rank, data, value)"""
+    objects = [
+        DashboardSnapshot(section=section, key=str(row[0]), rank=row[1], data=row[2],
+                          value=row[3] if len(row) > 3 else 0)
+        for row in rows
+    ]
+    if objects:
+        DashboardSnapshot.objects.bulk_create(
+            objects, update_conflicts=True, unique_fields=['section', 'key'],
+            update_fields=['rank', 'value', 'data', 'refreshed_at'],
+        )
+
+
+def delete_rows(section, keys):
+    for batch in batched([str(key) for key in keys]):
+        DashboardSnapshot.objects.filter(section=section, key__in=batch).delete()
+
+
+def replace_section(section, rows):
+    with transaction.atomic():
+        DashboardSnapshot.objects.filter(section=section).delete()
+        upsert_rows(section, rows)
+
+
+def trim_section(section, limit=LIST_SIZE):
+    stale = list(
+        DashboardSnapshot.objects.filter(section=section).order_by('-rank').values_list('id', flat=True)[limit:]
+    )
+    if stale:
+        DashboardSnapshot.objects.filter(id__in=stale).delete()
+
+
+def set_stats(stats, data=None):
+    upsert_rows(STAT, [(name, 0, (data or {}).get(name, {}), value) for name, value in stats.items()])
+
+
+def add_to_stat(name, delta):
+    if delta:
+        DashboardSnapshot.objects.filter(section=STAT, key=name).update(value=F('value') + delta)
+
+
+# ============================================================================
+# Sections from the live tables
+# ============================================================================
+
+def count_inspections_today():
+    return TireInspection.objects.filter(inspection_date=timezone.localdate()).count()
+
+
+def refresh_inspections_today():
+    set_stats({'inspections_today': count_inspections_today()},
+              {'inspections_today': {'date': timezone.localdate().isoformat()}})
+
+
+def position_label(plate, position_name):
+    return f'{plate} - {position_name}' if plate else ''
+
+
+def inspection_rows(inspections):
+    for row in inspections.values(
+        'id', 'tread_depth', 'tire__serial_number', 'position__position_name',
+        'position__vehicle__license_plate', 'inspection_date',
+    ):
+        date = row['inspection_date']
+        yield row['id'], row['id'], {
+            'serial_number': row['tire__serial_number'],
+            'tread_depth': str(row['tread_depth']),
+            'position': position_label(row['position__vehicle__license_plate'], row['position__position_name']),
+            'inspection_date': date.isoformat() if date else None,
+        }
+
+
+def work_order_rows(work_orders):
+    for row in work_orders.values(
+        'id', 'work_order_number', 'date_created', 'vehicle__license_plate', 'vehicle__make',
+        'assigned_to__first_name', 'assigned_to__last_name',
+    ):
+        yield row['id'], row['date_created'].timestamp(), {
+            'work_order_number': row['work_order_number'],
+            'vehicle': f"{row['vehicle__license_plate']} - {row['vehicle__make']}",
+            'assigned_to': f"{row['assigned_to__first_name']} {row['assigned_to__last_name']}",
+            'date_created': row['date_created'].isoformat(),
+        }
+
+
+def recent_inspections():
+    return TireInspection.objects.order_by('-id')[:LIST_SIZE]
+
+
+def pending_work_orders():
+    return WorkOrder.objects.filter(status__in=OPEN_WORK_ORDER_STATUSES).order_by('-date_created')[:LIST_SIZE]
+
+
+def flagged_tires():
+    """Tires in service below their pattern's discard depth or under-inflated"""
+    return Tire.objects.filter(status_id__in=status_ids(*ACTIVE_STATUS_NAMES)).filter(
+        Q(last_tread_depth__lte=F('pattern__discarding_tread_depth'))
+        | Q(last_pressure__lt=F('pattern__ideal_tire_pressure') * UNDER_INFLATION_RATIO)
+    )
+
+
+def flag_rows(tires):
+    """(section, key, rank, data) for each flag of each tire; worst first"""
+    for row in tires.values(
+        'id', 'serial_number', 'last_tread_depth', 'last_pressure',
+        'pattern__discarding_tread_depth', 'pattern__ideal_tire_pressure',
+        'current_position__position_name', 'current_position__vehicle__license_plate',
+    ):
+        tread, pressure = row['last_tread_depth'], row['last_pressure']
+        discard, ideal = row['pattern__discarding_tread_depth'], row['pattern__ideal_tire_pressure']
+        data = {
+            'serial_number': row['serial_number'],
+            'tread_depth': str(tread) if tread is not None else None,
+            'discarding_tread_depth': str(discard),
+            'pressure': str(pressure) if pressure is not None else None,
+            'ideal_tire_pressure': str(ideal),
+            'position': position_label(
+                row['current_position__vehicle__license_plate'], row['current_position__position_name'],
+            ),
+        }
+        if tread is not None and tread <= discard:
+            yield BELOW_DISCARD, row['id'], float(discard - tread), data
+        if pressure is not None and ideal and pressure < ideal * UNDER_INFLATION_RATIO:
+            yield UNDER_INFLATED, row['id'], float(1 - pressure / ideal), data
+
+
+def compute_stats():
+    active = status_ids(*ACTIVE_STATUS_NAMES)
+    tires = Tire.objects.aggregate(
+        active_tires=Count('id', filter=Q(status_id__in=active)),
+        fleet_value=Sum('purchase_cost', filter=Q(status_id__in=active)),
+    )
+    return {
+        'total_vehicles': Vehicle.objects.count(),
+        'active_tires': tires['active_tires'],
+        'fleet_value': tires['fleet_value'] or 0,
+        'active_work_orders': WorkOrder.objects.filter(status__in=OPEN_WORK_ORDER_STATUSES).count(),
+        'inspections_today': count_inspections_today(),
+    }
+
+
+def update_flag_counts():
+    counts = dict(
+        DashboardSnapshot.objects.filter(section__in=FLAG_SECTIONS)
+        .values_list('section').annotate(count=Count('id'))
+    )
+    set_stats({
+        'below_discard_count': counts.get(BELOW_DISCARD, 0),
+        'under_inflated_count': counts.get(UNDER_INFLATED, 0),
+    })
+
+
+def refresh_dashboard(parts=REFRESH_PARTS):
+    """Rebuild the given parts of the snapshot from the live tables"""
+    with transaction.atomic():
+        if 'stats' in parts:
+            set_stats(compute_stats(), {'inspections_today': {'date': timezone.localdate().isoformat()}})
+        if RECENT_INSPECTIONS in parts:
+            replace_section(RECENT_INSPECTIONS, inspection_rows(recent_inspections()))
+        if PENDING_WORK_ORDERS in parts:
+            replace_section(PENDING_WORK_ORDERS, work_order_rows(pending_work_orders()))
+        if 'tire_flags' in parts:
+            rows = list(flag_rows(flagged_tires()))
+            for section in FLAG_SECTIONS:
+                replace_section(section, [row[1:] for row in rows if row[0] == section])
+            update_flag_counts()
+
+
+# ============================================================================
+# Incremental updates on writes
+# ============================================================================
+
+def refresh_tire_flags(tire_ids=None, tire_range=None):
+    """Re-evaluate the below-discard / under-inflated rows of some tires"""
+    if tire_ids is not None:
+        tire_ids = {tire_id for tire_id in tire_ids if tire_id is not None}
+        if not tire_ids:
+            return
+    flagged = {section: [] for section in FLAG_SECTIONS}
+    for tires in filtered_by_ids(flagged_tires(), tire_ids, tire_range):
+        for section, *row in flag_rows(tires):
+            flagged[section].append(row)
+
+    def in_scope(key):
+        tire_id = int(key)
+        if tire_ids is not None:
+            return tire_id in tire_ids
+        return tire_range is None or tire_range[0] <= tire_id <= tire_range[1]
+
+    with transaction.atomic():
+        for section, rows in flagged.items():
+            keep = {str(row[0]) for row in rows}
+            listed = DashboardSnapshot.objects.filter(section=section).values_list('key', flat=True)
+            delete_rows(section, [key for key in listed if in_scope(key) and key not in keep])
+            upsert_rows(section, rows)
+        update_flag_counts()
+
+
+def inspections_added(inspection_ids=None):
+    """New inspections (one saved, or a bulk batch when inspection_ids is None)"""
+    if inspection_ids is None:
+        replace_section(RECENT_INSPECTIONS, inspection_rows(recent_inspections()))
+        refresh_inspections_today()
+        return
+    inspections = TireInspection.objects.filter(id__in=inspection_ids)
+    upsert_rows(RECENT_INSPECTIONS, inspection_rows(inspections))
+    trim_section(RECENT_INSPECTIONS)
+    today = inspections.filter(inspection_date=timezone.localdate()).count()
+    if today and not DashboardSnapshot.objects.filter(
+        section=STAT, key='inspections_today', data__date=timezone.localdate().isoformat(),
+    ).update(value=F('value') + today):
+        # First inspection of the day (or no snapshot yet)
+        inspections_added()
+
+
+def inspection_edited(inspection_id):
+    if DashboardSnapshot.objects.filter(section=RECENT_INSPECTIONS, key=str(inspection_id)).exists():
+        upsert_rows(RECENT_INSPECTIONS, inspection_rows(TireInspection.objects.filter(id=inspection_id)))
+    # The edit may move the inspection onto or off today: one indexed count (insp_date_idx)
+    refresh_inspections_today()
+
+
+def inspection_removed(inspection_id, inspection_date):
+    if DashboardSnapshot.objects.filter(section=RECENT_INSPECTIONS, key=str(inspection_id)).exists():
+        replace_section(RECENT_INSPECTIONS, inspection_rows(recent_inspections()))
+    if inspection_date == timezone.localdate():
+        add_to_stat('inspections_today', -1)
+
+
+def work_order_changed(old_status, new_status):
+    """Statuses before/after the write; None when the row did not exist / was deleted"""
+    was_open = old_status in OPEN_WORK_ORDER_STATUSES
+    is_open = new_status in OPEN_WORK_ORDER_STATUSES
+    add_to_stat('active_work_orders', int(is_open) - int(was_open))
+    if was_open or is_open:
+        # Bounded, indexed rebuild: also refills the list when an order leaves it
+        replace_section(PENDING_WORK_ORDERS, work_order_rows(pending_work_orders()))
+
+
+def tire_stat_deltas(old_state, new_state, active):
+    """(active_tires, fleet_value) change for one tire; states as in tire_changed()"""
+    old_active = old_state is not None and old_state[0] in active
+    new_active = new_state is not None and new_state[0] in active
+    return (
+        int(new_active) - int(old_active),
+        (new_state[1] if new_active else 0) - (old_state[1] if old_active else 0),
+    )
+
+
+def tire_changed(tire_id, old_state, new_state):
+    """(status_id, purchase_cost) before/after the write; None when the row did not exist / was deleted"""
+    active_delta, value_delta = tire_stat_deltas(old_state, new_state, status_ids(*ACTIVE_STATUS_NAMES))
+    add_to_stat('active_tires', active_delta)
+    add_to_stat('fleet_value', value_delta)
+    if new_state is None:
+        for section in FLAG_SECTIONS:
+            delete_rows(section, [tire_id])
+        update_flag_counts()
+    else:
+        # Status, pattern or readings may have been edited
+        refresh_tire_flags([tire_id])
+
+
+def tires_moved(tire_ids, status_changes=()):
+    """
+    Bulk counterpart of tire_changed() for writes that skip signals (rotations.py):
+    status_changes are (old_state, new_state) pairs; every moved tire's flag rows
+    are re-evaluated, since they show its position
+    """
+    active = status_ids(*ACTIVE_STATUS_NAMES)
+    deltas = [tire_stat_deltas(old_state, new_state, active) for old_state, new_state in status_changes]
+    add_to_stat('active_tires', sum(delta[0] for delta in deltas))
+    add_to_stat('fleet_value', sum(delta[1] for delta in deltas))
+    refresh_tire_flags(tire_ids)
+
+
+def vehicle_count_changed(delta):
+    add_to_stat('total_vehicles', delta)
+
+
+# ============================================================================
+# Read
+# ============================================================================
+
+def read_row(data):
+    row = dict(data)
+    for field in DATE_FIELDS:
+        if row.get(field):
+            row[field] = parse_date(row[field][:10])
+    for field in DATETIME_FIELDS:
+        if row.get(field):
+            row[field] = parse_datetime(row[field])
+    return row
+
+
+def dashboard_data():
+    """Template context for the landing page"""
+    stats = {row.key: row for row in DashboardSnapshot.objects.filter(section=STAT)}
+    if not stats:
+        refresh_dashboard()
+        stats = {row.key: row for row in DashboardSnapshot.objects.filter(section=STAT)}
+
+    context = {
+        name: int(row.value) if name in COUNT_STATS else row.value
+        for name, row in stats.items()
+    }
+    today = stats.get('inspections_today')
+    if today is not None and today.data.get('date') != timezone.localdate().isoformat():
+        context['inspections_today'] = 0  # no inspection recorded since midnight
+    for section in LIST_SECTIONS:
+        context[section] = [
+            read_row(data) for data in DashboardSnapshot.objects.filter(section=section)
+            .order_by('-rank').values_list('data', flat=True)[:LIST_SIZE]
+        ]
+    context['dashboard_refreshed_at'] = max((row.refreshed_at for row in stats.values()), default=None)
+    return context
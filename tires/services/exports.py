@@ -0,0 +1,86 @@
+# tires/services/exports.py
+"""
+CSV/XLSX exports of any registered list, with the list view's filters and sort
+
+Rows are read with values_list() (related columns joined in SQL) through
+QuerySet.iterator(), so memory stays bounded however many rows match. CSV is
+streamed as it is read; XLSX is not streamed: openpyxl's write-only workbook
+spills rows to a temporary file instead of keeping them in memory, and the file
+is sent once the workbook is saved
+"""
+
+import csv
+import datetime
+import io
+import tempfile
+
+from django.utils import timezone
+from openpyxl import Workbook
+
+EXPORT_CHUNK_SIZE = 2000
+CSV_ROWS_PER_CHUNK = 500  # rows per chunk of the streamed response
+XLSX_MAX_ROWS = 1048575   # data rows per sheet (Excel's limit, minus the header)
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def export_rows(spec, params):
+    """(headers, row iterator) for the spec's export_fields, filtered and sorted like the list view"""
+    queryset = spec.apply_filters(spec.model.objects.all(), params)
+    _, field, descending = spec.resolve_sort(params.get('sort'))
+    prefix = '-' if descending else ''
+    ordering = [f'{prefix}{field}', f'{prefix}id'] if field != 'id' else [f'{prefix}id']
+    rows = queryset.order_by(*ordering).values_list(*spec.export_fields.values())
+    return list(spec.export_fields), rows.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def export_filename(resource, file_format):
+    return f'{resource}-{timezone.localdate():%Y%m%d}.{file_format}'
+
+
+def excel_value(value):
+    # openpyxl refuses timezone-aware datetimes
+    if isinstance(value, datetime.datetime) and timezone.is_aware(value):
+        return timezone.localtime(value).replace(tzinfo=None)
+    return value
+
+
+def iter_csv(headers, rows):
+    """Encoded CSV in chunks of CSV_ROWS_PER_CHUNK rows; the UTF-8 BOM makes Excel read Arabic text correctly"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(headers)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(excel_value(value) for value in row)
+        if count % CSV_ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def write_xlsx(headers, rows, title):
+    """
+    Write the rows to a temporary .xlsx file (continuing on new sheets past Excel's
+    row limit) and return it rewound once complete; the caller sends and closes it
+    """
+    workbook = Workbook(write_only=True)
+    sheet = None
+    written = XLSX_MAX_ROWS
+    for row in rows:
+        if written == XLSX_MAX_ROWS:
+            sheet = workbook.create_sheet(title if sheet is None else f'{title} {len(workbook.worksheets) + 1}')
+            sheet.append(headers)
+            written = 0
+        sheet.append([excel_value(value) for value in row])
+        written += 1
+    if sheet is None:
+        workbook.create_sheet(title).append(headers)
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
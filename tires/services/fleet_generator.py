@@ -0,0 +1,347 @@
+# tires/services/fleet_generator.py
+"""
+Deterministic synthetic fleet history for load and benchmark data
+
+Each vehicle is simulated in Python (odometer growing day by day, inspection
+rounds, tread wearing down until the tire is replaced) and written with chunked
+bulk_create, a chunk of vehicles per transaction. The same arguments and seed
+always produce the same rows
+"""
+
+import random
+from datetime import datetime, time as datetime_time, timedelta
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from tires.models import (
+    Employee, MaintenanceRecord, ServiceType, Supplier, Tire, TireAssignment, TireInspection,
+    TirePattern, TirePosition, TireStatus, TireWearType, Vehicle, WorkOrder,
+)
+
+from .bulk_sql import update_rows
+from .cost_rollups import refresh_cost_rollups
+from .dashboard import refresh_dashboard
+from .inspection_metrics import recompute_tire_metrics
+from .latest_inspection import refresh_latest_inspections
+from .summary_counters import invalidate_summary_counts
+
+MOUNTED = 'MOUNTED'
+DISCARDED = 'DISCARDED'
+REPLACE_MARGIN = Decimal('0.50')  # replaced at the round it gets within 0.5 mm of discard depth
+MAINTENANCE_PROBABILITY = 0.03   # per tire inspection
+OPEN_LAST_ROUND_PROBABILITY = 0.05
+MEAN_WEAR_PER_1000_KM = 0.12     # mm of tread per 1000 km
+
+VEHICLE_TYPES = ('TRUCK', 'TRUCK', 'TRAILER', 'BUS', 'VAN')
+MAKES = ('Volvo', 'Scania', 'MAN', 'Mercedes-Benz', 'DAF', 'Iveco')
+
+PATTERNS = [
+    # pattern_code, brand, country, axle_type, initial depth, discard depth, ideal pressure, cost
+    ('GEN-STR-1', 'Michelin', 'France', 'STEERING', '16.00', '3.00', '110.00', '420.00'),
+    ('GEN-DRV-1', 'Bridgestone', 'Japan', 'DRIVE', '20.00', '3.00', '105.00', '460.00'),
+    ('GEN-DRV-2', 'Goodyear', 'USA', 'DRIVE', '18.00', '3.00', '105.00', '390.00'),
+    ('GEN-TRL-1', 'Continental', 'Germany', 'TRAILER', '14.00', '2.00', '100.00', '340.00'),
+]
+WEAR_TYPES = [
+    ('Even wear', 'Normal use', 'None'),
+    ('Shoulder wear', 'Under-inflation', 'Correct pressure'),
+    ('Center wear', 'Over-inflation', 'Correct pressure'),
+    ('Feathering', 'Misalignment', 'Wheel alignment'),
+]
+SERVICE_TYPES = ('Tire Repair', 'Tire Rotation', 'Wheel Balancing', 'Wheel Alignment')
+SUPPLIERS = ('Generated Tire Services', 'Generated Fleet Care')
+EMPLOYEES = 20
+
+
+def money(value):
+    return Decimal(value).quantize(Decimal('0.01'))
+
+
+def position_layout(count):
+    """(position_name, axle_number, wheel_number, axle_type) for `count` positions"""
+    layout = [('Front Left', 1, 1, 'STEERING'), ('Front Right', 1, 2, 'STEERING')]
+    axle = 2
+    while len(layout) < count:
+        axle_type = 'DRIVE' if axle <= 3 else 'TRAILER'
+        for wheel, side in enumerate(('Left Outer', 'Left Inner', 'Right Inner', 'Right Outer'), start=1):
+            layout.append((f'Axle {axle} {side}', axle, wheel, axle_type))
+        axle += 1
+    return layout[:count]
+
+
+def ensure_reference_data():
+    """Reference rows the generator draws from (created once, matched by name/code)"""
+    statuses = {
+        name: TireStatus.objects.get_or_create(status_name=name, defaults={'description': name.title()})[0].id
+        for name in (MOUNTED, DISCARDED)
+    }
+    patterns = []
+    for code, brand, country, axle_type, initial, discard, ideal, cost in PATTERNS:
+        pattern = TirePattern.objects.get_or_create(pattern_code=code, defaults={
+            'brand_name': brand, 'country_of_origin': country, 'load_index': '152/148',
+            'speed_symbol': 'L', 'road_type': 'Mixed', 'axle_type': axle_type,
+            'initial_tread_depth': Decimal(initial), 'discarding_tread_depth': Decimal(discard),
+            'ideal_tire_pressure': Decimal(ideal),
+        })[0]
+        patterns.append({
+            'id': pattern.id, 'code': code, 'axle_type': axle_type, 'cost': Decimal(cost),
+            'initial': Decimal(pattern.initial_tread_depth), 'discard': Decimal(pattern.discarding_tread_depth),
+            'ideal': Decimal(pattern.ideal_tire_pressure),
+        })
+    wear_types = [
+        TireWearType.objects.get_or_create(name=name, defaults={
+            'wear_common_cause': cause, 'recovery_scheme': scheme,
+        })[0].id
+        for name, cause, scheme in WEAR_TYPES
+    ]
+    service_types = [
+        ServiceType.objects.get_or_create(service_name=name, defaults={'description': name})[0].id
+        for name in SERVICE_TYPES
+    ]
+    suppliers = [
+        Supplier.objects.get_or_create(supplier_name=name, defaults={
+            'contact_person': 'Fleet Desk', 'phone': '000-0000', 'position': 'Sales',
+            'email': 'fleet@example.com', 'address': 'Generated',
+        })[0].id
+        for name in SUPPLIERS
+    ]
+    employees = [
+        Employee.objects.get_or_create(employment_code=f'GEN{number:03d}', defaults={
+            'first_name': f'Inspector{number}', 'last_name': 'Generated', 'position': 'Inspector',
+            'contact_number': '000-0000', 'email': f'inspector{number}@example.com',
+        })[0].id
+        for number in range(1, EMPLOYEES + 1)
+    ]
+    return {
+        'statuses': statuses, 'patterns': patterns, 'wear_types': wear_types,
+        'service_types': service_types, 'suppliers': suppliers, 'employees': employees,
+    }
+
+
+class FleetGenerator:
+    """
+    vehicles, positions_per_vehicle, inspections_per_tire, years: size of the history
+    seed: random seed; end_date: last day of the history; prefix: plates/serials/numbers
+    """
+
+    def __init__(self, vehicles, positions_per_vehicle=10, inspections_per_tire=12, years=3, seed=42,
+                 end_date=None, prefix='GEN', vehicle_chunk=100, batch_size=5000, metrics=False):
+        self.vehicles = vehicles
+        self.positions_per_vehicle = positions_per_vehicle
+        self.inspections_per_tire = inspections_per_tire
+        self.years = years
+        self.seed = seed
+        self.end_date = end_date or timezone.localdate()
+        self.prefix = prefix
+        self.vehicle_chunk = vehicle_chunk
+        self.batch_size = batch_size
+        self.metrics = metrics
+        self.layout = position_layout(positions_per_vehicle)
+        self.totals = dict.fromkeys(
+            ('vehicles', 'positions', 'tires', 'work_orders', 'inspections', 'assignments', 'maintenance'), 0,
+        )
+
+    def conflicts(self):
+        return Vehicle.objects.filter(license_plate__startswith=f'{self.prefix}-').exists()
+
+    def run(self):
+        """Generate every chunk; yields the running totals after each one"""
+        self.reference = ensure_reference_data()
+        for first in range(0, self.vehicles, self.vehicle_chunk):
+            indexes = range(first, min(first + self.vehicle_chunk, self.vehicles))
+            with transaction.atomic():
+                self.write_chunk(indexes)
+            yield dict(self.totals)
+
+    # ------------------------------------------------------------------------
+    # Simulation
+    # ------------------------------------------------------------------------
+
+    def write_chunk(self, indexes):
+        start_date = self.end_date - timedelta(days=int(self.years * 365))
+        vehicles = []
+        plans = []
+        for index in indexes:
+            # One generator per vehicle: a vehicle's history does not depend on the chunk size
+            rng = random.Random(f'{self.seed}:{index}')
+            km_per_day = rng.uniform(150, 600)
+            start_odometer = rng.randint(0, 50000)
+            vehicles.append(Vehicle(
+                license_plate=f'{self.prefix}-{index:06d}', make=rng.choice(MAKES),
+                year=start_date.year - rng.randint(0, 5), vehicle_type=rng.choice(VEHICLE_TYPES),
+                status='ACTIVE', tire_configuration=f'{len(self.layout)} wheels',
+                odometer=start_odometer, number_of_or_tires=len(self.layout), number_of_sp_tires=0,
+            ))
+            plans.append((index, rng, km_per_day, start_odometer))
+        Vehicle.objects.bulk_create(vehicles, batch_size=self.batch_size)
+
+        positions = [
+            TirePosition(vehicle=vehicle, position_name=name, axle_number=axle, wheel_number=wheel,
+                         axle_type=axle_type, tire_order=order, is_spare=False)
+            for vehicle in vehicles
+            for order, (name, axle, wheel, axle_type) in enumerate(self.layout, start=1)
+        ]
+        TirePosition.objects.bulk_create(positions, batch_size=self.batch_size)
+
+        rows = {'tires': [], 'work_orders': [], 'inspections': [], 'assignments': [], 'maintenance': []}
+        for (index, rng, km_per_day, start_odometer), vehicle, vehicle_positions in zip(
+            plans, vehicles, [positions[i:i + len(self.layout)] for i in range(0, len(positions), len(self.layout))],
+        ):
+            self.simulate_vehicle(index, rng, km_per_day, start_odometer, start_date,
+                                  vehicle, vehicle_positions, rows)
+
+        Tire.objects.bulk_create(rows['tires'], batch_size=self.batch_size)
+        WorkOrder.objects.bulk_create([order for order, _ in rows['work_orders']], batch_size=self.batch_size)
+        # date_created is auto_now_add: put the simulated dates back
+        update_rows(WorkOrder, ['date_created'], [
+            (connection.ops.adapt_datetimefield_value(created), order.pk) for order, created in rows['work_orders']
+        ])
+        TireInspection.objects.bulk_create(rows['inspections'], batch_size=self.batch_size)
+        for assignment in rows['assignments']:
+            # Removal reads the inspection that triggered it, created above
+            assignment.inspection = getattr(assignment, '_inspection', None)
+        TireAssignment.objects.bulk_create(rows['assignments'], batch_size=self.batch_size)
+        MaintenanceRecord.objects.bulk_create(rows['maintenance'], batch_size=self.batch_size)
+        update_rows(
+            TirePosition, ['mounted_tire'],
+            [(position._final_tire.pk, position.pk) for position in positions],
+        )
+        update_rows(Vehicle, ['odometer'], [(vehicle.odometer, vehicle.pk) for vehicle in vehicles])
+
+        tire_ids = [tire.pk for tire in rows['tires']]
+        refresh_latest_inspections(tire_ids)
+        if self.metrics:
+            # The cost rollups are rebuilt once by refresh_derived_data()
+            recompute_tire_metrics(tire_ids, chunk_size=self.batch_size, refresh_rollups=False)
+
+        self.totals['vehicles'] += len(vehicles)
+        self.totals['positions'] += len(positions)
+        for key in ('tires', 'work_orders', 'inspections', 'assignments', 'maintenance'):
+            self.totals[key] += len(rows[key])
+
+    def simulate_vehicle(self, index, rng, km_per_day, start_odometer, start_date, vehicle, positions, rows):
+        reference = self.reference
+        patterns = reference['patterns']
+        interval_days = max(1, round(mean_tire_life_km() / self.inspections_per_tire / km_per_day))
+        rounds = max(1, int(self.years * 365) // interval_days)
+        serials = (f'{self.prefix}-{index:06d}-{n:04d}' for n in range(10 ** 4))
+        work_order_numbers = (f'{self.prefix}-WO-{index:06d}-{n:05d}' for n in range(10 ** 5))
+
+        def moment(day):
+            return timezone.make_aware(datetime.combine(day, datetime_time(8)) + timedelta(
+                minutes=rng.randint(0, 540)))
+
+        def work_order(shift_type, day, odometer, status='CLOSED'):
+            order = WorkOrder(
+                work_order_number=next(work_order_numbers), driver_id=f'DRV{index % 500:03d}',
+                assigned_to_id=rng.choice(reference['employees']), vehicle=vehicle,
+                current_odometer=odometer, shift_type=shift_type, status=status,
+                cost=money(rng.uniform(50, 400)), notes='',
+            )
+            rows['work_orders'].append((order, moment(day)))
+            return order
+
+        def new_tire(position, day, odometer, order):
+            candidates = [p for p in patterns if p['axle_type'] == position.axle_type] or patterns
+            pattern = rng.choice(candidates)
+            tire = Tire(
+                serial_number=next(serials), pattern_id=pattern['id'], size='295/80R22.5',
+                status_id=reference['statuses'][MOUNTED],
+                purchase_date=day - timedelta(days=rng.randint(0, 60)),
+                purchase_cost=money(pattern['cost'] * Decimal(rng.uniform(0.9, 1.1))),
+                supplier_id=rng.choice(reference['suppliers']),
+                initial_tread_depth=pattern['initial'], last_tread_depth=pattern['initial'],
+                retread_count=0, maximum_retreads=2, current_position=position, tire_mileage=0, notes='',
+            )
+            rows['tires'].append(tire)
+            assignment = TireAssignment(
+                tire=tire, tire_position_from=None, tire_position_to=position, assignment_date=day,
+                start_odometer=odometer, work_order=order, notes='Generated mount',
+            )
+            rows['assignments'].append(assignment)
+            state = {
+                'tire': tire, 'pattern': pattern, 'assignment': assignment, 'mounted_odometer': odometer,
+                'tread': pattern['initial'],
+                'wear_per_km': rng.uniform(0.67, 1.33) * MEAN_WEAR_PER_1000_KM / 1000,
+            }
+            return state
+
+        odometer = start_odometer
+        mount_order = work_order('ASSIGNMENT', start_date, odometer)
+        mounted = [new_tire(position, start_date, odometer, mount_order) for position in positions]
+
+        day = start_date
+        for round_number in range(1, rounds + 1):
+            day = start_date + timedelta(days=round_number * interval_days)
+            if day > self.end_date:
+                break
+            odometer += int(interval_days * km_per_day * rng.uniform(0.85, 1.15))
+            last_round = round_number == rounds or day + timedelta(days=interval_days) > self.end_date
+            status = 'OPENED' if last_round and rng.random() < OPEN_LAST_ROUND_PROBABILITY else 'CLOSED'
+            inspection_order = work_order('INSPECTION', day, odometer, status)
+            replacement_order = None
+
+            for slot, (position, state) in enumerate(zip(positions, mounted)):
+                pattern, tire = state['pattern'], state['tire']
+                # Tread only goes down: wear since the last round plus a little measurement noise
+                worn = Decimal(state['wear_per_km'] * (odometer - state['mounted_odometer']) * rng.uniform(0.97, 1.03))
+                tread = max(pattern['discard'] - Decimal('0.5'), min(state['tread'], pattern['initial'] - worn))
+                tread = tread.quantize(Decimal('0.01'))
+                state['tread'] = tread
+                pressure = money(pattern['ideal'] * Decimal(rng.uniform(0.82, 1.05)))
+                inspection = TireInspection(
+                    tire=tire, position=position, inspection_odometer=odometer, inspection_date=day,
+                    inspector_id=inspection_order.assigned_to_id, tread_depth=tread, pressure=pressure,
+                    wear_id_id=rng.choice(reference['wear_types']), work_order=inspection_order,
+                )
+                rows['inspections'].append(inspection)
+                tire.last_tread_depth = tread
+                tire.tire_mileage = odometer - state['mounted_odometer']
+
+                if rng.random() < MAINTENANCE_PROBABILITY:
+                    rows['maintenance'].append(MaintenanceRecord(
+                        tire=tire, service_type_id=rng.choice(reference['service_types']),
+                        service_date=day, service_mileage=odometer, cost=money(rng.uniform(20, 150)),
+                        service_provider_id=rng.choice(reference['suppliers']), notes='Generated',
+                    ))
+
+                if tread <= pattern['discard'] + REPLACE_MARGIN and not last_round:
+                    assignment = state['assignment']
+                    assignment.removal_date = day
+                    assignment.end_odometer = odometer
+                    assignment.removal_mileage = odometer - state['mounted_odometer']
+                    assignment.reason_for_removal = 'Worn to discard depth'
+                    assignment._inspection = inspection
+                    tire.status_id = reference['statuses'][DISCARDED]
+                    tire.current_position = None
+                    if replacement_order is None:
+                        replacement_order = work_order('ASSIGNMENT', day, odometer)
+                    mounted[slot] = new_tire(position, day, odometer, replacement_order)
+
+        vehicle.odometer = odometer
+        for position, state in zip(positions, mounted):
+            position._final_tire = state['tire']
+
+
+def refresh_derived_data():
+    """bulk_create skips the signals that keep the summary counters, the dashboard and the cost rollups current"""
+    invalidate_summary_counts(Tire)
+    invalidate_summary_counts(WorkOrder)
+    refresh_dashboard()
+    refresh_cost_rollups()
+
+
+def mean_tire_life_km():
+    """Average km from mount to replacement at the mean wear rate"""
+    return sum(
+        float(Decimal(initial) - Decimal(discard) - REPLACE_MARGIN) / MEAN_WEAR_PER_1000_KM * 1000
+        for _, _, _, _, initial, discard, _, _ in PATTERNS
+    ) / len(PATTERNS)
+
+
+def inspections_estimate(vehicles, positions_per_vehicle, inspections_per_tire, years):
+    """Rough inspection count for the arguments (vehicles average 375 km/day)"""
+    rounds = years * 365 * 375 * inspections_per_tire / mean_tire_life_km()
+    return int(vehicles * positions_per_vehicle * rounds)
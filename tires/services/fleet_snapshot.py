@@ -0,0 +1,60 @@
+# tires/services/fleet_snapshot.py
+"""
+Fleet snapshot: vehicle -> mounted tires -> latest tread/pressure
+Built from a constant number of queries regardless of fleet size
+"""
+
+from django.db.models import F
+
+from tires.models import TirePosition, Vehicle
+
+
+def mounted_tire_rows(vehicle_ids=None):
+    """
+    One row per occupied position with the mounted tire and its latest inspection readings
+    Single query: positions JOIN tires (readings are denormalized onto Tire)
+    """
+    positions = TirePosition.objects.filter(mounted_tire__isnull=False)
+    if vehicle_ids is not None:
+        positions = positions.filter(vehicle_id__in=vehicle_ids)
+
+    return positions.annotate(
+        latest_tread=F('mounted_tire__last_tread_depth'),
+        latest_pressure=F('mounted_tire__last_pressure'),
+    ).order_by('vehicle_id', 'id').values(
+        'id',
+        'vehicle_id',
+        'position_name',
+        'mounted_tire_id',
+        'mounted_tire__serial_number',
+        'latest_tread',
+        'latest_pressure',
+    )
+
+
+def build_vehicle_tire_data(vehicle_ids=None):
+    """
+    Vehicle snapshot keyed by vehicle id (string keys so the dict is JSON safe)
+    Vehicles without mounted tires map to an empty list
+    """
+    vehicles = Vehicle.objects.all()
+    if vehicle_ids is not None:
+        vehicles = vehicles.filter(id__in=vehicle_ids)
+
+    vehicle_tire_data = {
+        str(vehicle_id): [] for vehicle_id in vehicles.values_list('id', flat=True)
+    }
+
+    for row in mounted_tire_rows(vehicle_ids):
+        tread = row['latest_tread']
+        pressure = row['latest_pressure']
+        vehicle_tire_data.setdefault(str(row['vehicle_id']), []).append({
+            "tire_id": str(row['mounted_tire_id']),
+            "serial": str(row['mounted_tire__serial_number']),
+            "tread": float(tread) if tread is not None else 0.0,
+            "pressure": float(pressure) if pressure is not None else 0.0,
+            "position": str(row['position_name']),
+            "position_id": str(row['id']),
+        })
+
+    return vehicle_tire_data
@@ -0,0 +1,154 @@
+# tires/services/form_options.py
+"""
+Shared <select> option lists for the list pages' create/edit modals
+Each list is one values() query (related labels joined, never fetched per option),
+or none for the cached reference tables,
+and is embedded once per page with json_script, however many rows the page shows
+Only small tables are embedded; tires, positions and work orders are paged to
+lookup selects by the list API
+"""
+
+from tires.models import (
+    Employee, ServiceType, Supplier, Tire, TirePattern, TireStatus, TireWearType, Vehicle,
+    WorkOrder,
+)
+
+from .reference_data import reference_table
+
+
+class OptionList:
+    """
+    build:  callable returning the queryset of offered rows
+    fields: {JSON key: values() path}; 'id' is always included
+    label:  callable(row) -> option text
+    """
+
+    def __init__(self, build, fields, label):
+        self.build = build
+        self.fields = {'id': 'id', **fields}
+        self.label = label
+
+    def option(self, row):
+        option = {key: row[path] for key, path in self.fields.items()}
+        option['label'] = self.label(option)
+        return option
+
+    def rows(self, queryset=None):
+        paths = list(dict.fromkeys(self.fields.values()))
+        queryset = self.build() if queryset is None else queryset
+        return [self.option(row) for row in queryset.values(*paths)]
+
+    def get(self, pk):
+        rows = self.rows(self.build().filter(id=pk))
+        return rows[0] if rows else None
+
+
+class ReferenceOptionList(OptionList):
+    """Option list over a cached reference table (no query); order_by: row fields"""
+
+    def __init__(self, model, order_by, fields, label):
+        super().__init__(None, fields, label)
+        self.model = model
+        self.order_by = order_by
+
+    def rows(self, queryset=None):
+        return [self.option(row) for row in reference_table(self.model).sorted_by(*self.order_by)]
+
+    def get(self, pk):
+        return next((option for option in self.rows() if option['id'] == pk), None)
+
+
+OPTION_LISTS = {
+    'tire_patterns': ReferenceOptionList(
+        TirePattern, ('pattern_code',),
+        {
+            'pattern_code': 'pattern_code',
+            'brand_name': 'brand_name',
+            'country_of_origin': 'country_of_origin',
+            'load_index': 'load_index',
+            'speed_symbol': 'speed_symbol',
+            'road_type': 'road_type',
+        },
+        lambda row: row['pattern_code'],
+    ),
+    'tire_statuses': ReferenceOptionList(
+        TireStatus, ('id',),
+        {'status_name': 'status_name', 'description': 'description'},
+        lambda row: row['status_name'],
+    ),
+    'suppliers': ReferenceOptionList(
+        Supplier, ('supplier_name',),
+        {
+            'supplier_name': 'supplier_name',
+            'contact_person': 'contact_person',
+            'phone': 'phone',
+            'position': 'position',
+            'email': 'email',
+            'address': 'address',
+            'evaluation': 'evaluation',
+        },
+        lambda row: row['supplier_name'],
+    ),
+    'vehicles': OptionList(
+        lambda: Vehicle.objects.order_by('license_plate'),
+        {
+            'license_plate': 'license_plate',
+            'make': 'make',
+            'year': 'year',
+            'vehicle_type': 'vehicle_type',
+            'status': 'status',
+            'tire_configuration': 'tire_configuration',
+            'odometer': 'odometer',
+        },
+        lambda row: f"{row['license_plate']} - {row['make']}",
+    ),
+    'service_types': ReferenceOptionList(
+        ServiceType, ('service_name',),
+        {'service_name': 'service_name'},
+        lambda row: row['service_name'],
+    ),
+    'employees': ReferenceOptionList(
+        Employee, ('first_name', 'last_name'),
+        {
+            'first_name': 'first_name',
+            'last_name': 'last_name',
+            'employment_code': 'employment_code',
+            'position': 'position',
+            'contact_number': 'contact_number',
+            'email': 'email',
+        },
+        lambda row: f"{row['first_name']} {row['last_name']}",
+    ),
+    'wear_types': ReferenceOptionList(
+        TireWearType, ('id',),
+        {'name': 'name'},
+        lambda row: row['name'],
+    ),
+    # Too many to embed (tires, positions and work orders fill lookup selects from the
+    # list API): only used for the option a lookup filter currently holds
+    'tires': OptionList(
+        lambda: Tire.objects.order_by('serial_number'),
+        {'serial_number': 'serial_number', 'brand_name': 'pattern__brand_name'},
+        lambda row: f"{row['serial_number']} - {row['brand_name']}",
+    ),
+    'work_orders': OptionList(
+        lambda: WorkOrder.objects.order_by('-id'),
+        {'work_order_number': 'work_order_number', 'vehicle_id': 'vehicle_id'},
+        lambda row: row['work_order_number'],
+    ),
+}
+
+
+def form_options(*names):
+    """{name: [{'id': ..., 'label': ..., **fields}, ...]} for the requested lists"""
+    return {name: OPTION_LISTS[name].rows() for name in names}
+
+
+def selected_option(name, value):
+    """
+    The one option of a list a filter currently selects, or None: lookup selects (filled from
+    the list API) render only this option server-side
+    """
+    if not str(value or '').isdigit():
+        return None
+    return OPTION_LISTS[name].get(int(value))
@@ -0,0 +1,432 @@
+# tires/services/import_engine.py
+"""
+Bulk Excel import engine
+Rows are validated column-wise with pandas, foreign keys are resolved with one
+`__in` query per referenced model, and valid rows are written with bulk_create
+in chunks inside a single transaction. Invalid rows are reported, not written.
+"""
+
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from tires.models import (
+    Employee, MaintenanceRecord, ServiceType, Supplier, Tire, TireAssignment,
+    TireInspection, TirePattern, TirePosition, TireStatus, TireWearType,
+    Vehicle, WorkOrder,
+)
+
+from .bulk_sql import batched
+from .dashboard import inspections_added, refresh_dashboard
+from .inspection_metrics import recompute_tire_metrics
+from .latest_inspection import refresh_latest_inspections
+from .reference_data import REFERENCE_MODELS, reference_table
+from .summary_counters import invalidate_summary_counts
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def get_chunk_size(chunk_size=None):
+    return chunk_size or getattr(settings, 'IMPORT_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+# ============================================================================
+# Column-wise helpers
+# ============================================================================
+
+class RowErrors:
+    """First error message per row; a row with no message is valid"""
+
+    def __init__(self, index):
+        self.messages = pd.Series('', index=index, dtype=object)
+
+    def add(self, mask, message):
+        mask = mask & (self.messages == '')
+        if isinstance(message, pd.Series):
+            self.messages[mask] = message[mask]
+        else:
+            self.messages[mask] = message
+
+    @property
+    def valid(self):
+        return self.messages == ''
+
+
+def text_column(df, mappings, field, default=''):
+    """Stripped string column for a mapped field ('' for blanks / NaN / unmapped)"""
+    column = mappings.get(field)
+    if not column or column not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    values = df[column].astype(object).where(df[column].notna(), '')
+    values = values.astype(str).str.strip()
+    return values.mask(values.str.lower().isin(['nan', 'none', 'nat']), '')
+
+
+def number_column(df, mappings, field):
+    """Numeric column; blanks and unparseable cells become NaN"""
+    return pd.to_numeric(text_column(df, mappings, field), errors='coerce')
+
+
+def date_column(df, mappings, field):
+    """Date column; blanks and unparseable cells become NaT"""
+    values = text_column(df, mappings, field)
+    dates = pd.to_datetime(values.where(values != ''), errors='coerce', format='mixed')
+    return dates.dt.date.astype(object).where(dates.notna(), None)
+
+
+def unique_keys(series):
+    return sorted({value for value in series if value != ''})
+
+
+def lookup_tires(serials):
+    """serial -> {'id', 'current_position_id'} for every serial present in the database"""
+    tires = {}
+    for batch in batched(unique_keys(serials)):
+        for row in Tire.objects.filter(serial_number__in=batch).values(
+            'id', 'serial_number', 'current_position_id',
+        ):
+            tires[row['serial_number']] = row
+    return tires
+
+
+def lookup_by_key_or_id(model, field, keys, extra=()):
+    """key (or str(id)) -> values row; one query per batch on field IN (...) OR id IN (...)"""
+    found = {}
+    if model in REFERENCE_MODELS:
+        # Small reference table: match against the cached snapshot, no query
+        wanted = set(unique_keys(keys))
+        for row in reference_table(model):
+            for key in (str(row[field]), str(row['id'])):
+                if key in wanted:
+                    found[key] = row
+        return found
+    for batch in batched(unique_keys(keys)):
+        numeric = [int(key) for key in batch if key.isdigit()]
+        query = Q(**{f'{field}__in': batch})
+        if numeric:
+            query |= Q(id__in=numeric)
+        for row in model.objects.filter(query).values('id', field, *extra):
+            found[str(row[field])] = row
+            found[str(row['id'])] = row
+    return found
+
+
+def name_index(model, field):
+    """lower(name) -> id for small reference tables (cached snapshot)"""
+    return {key: row['id'] for key, row in reference_table(model).indexes[field].items()}
+
+
+def first_id(model):
+    return reference_table(model).first_id()
+
+
+def match_names(model, field, keys, default=None):
+    """
+    Lower-cased cells -> ids of a small reference table, matched like the old row
+    importer's icontains: the exact name, else the first (lowest id) name containing
+    the cell, so 'in stock' still finds 'In Stock (Warehouse)'. Blanks and misses get `default`
+    """
+    index = name_index(model, field)
+    names = sorted(index.items(), key=lambda item: item[1])
+    matches = {}
+    for key in unique_keys(keys):
+        matches[key] = index[key] if key in index else next((pk for name, pk in names if key in name), default)
+    return map_column(keys, matches, default)
+
+
+def map_column(series, index, default=None):
+    """Vectorised dict lookup; unmatched keys become `default`"""
+    return series.map(lambda key: index.get(key, default))
+
+
+# ============================================================================
+# Per import type: validate columns and build unsaved model instances
+# ============================================================================
+
+def build_tires(df, mappings):
+    errors = RowErrors(df.index)
+    serials = text_column(df, mappings, 'serial_number')
+    errors.add(serials == '', 'Missing serial number')
+    errors.add(serials.duplicated(keep='first') & (serials != ''), 'Duplicate serial number in file')
+    existing = lookup_tires(serials)
+    errors.add(serials.isin(existing.keys()), 'Tire with this serial number already exists')
+
+    pattern_keys = text_column(df, mappings, 'tire_pattern')
+    patterns = lookup_by_key_or_id(
+        TirePattern, 'pattern_code', pattern_keys, extra=('initial_tread_depth',),
+    )
+    pattern_rows = map_column(pattern_keys, patterns)
+    errors.add(pattern_keys == '', 'Missing tire pattern')
+    errors.add((pattern_keys != '') & pattern_rows.isna(),
+               'Tire pattern not found: ' + pattern_keys)
+
+    status_ids = match_names(
+        TireStatus, 'status_name', text_column(df, mappings, 'tire_status').str.lower(), first_id(TireStatus),
+    )
+    errors.add(status_ids.isna(), 'No tire statuses defined')
+
+    sizes = text_column(df, mappings, 'size')
+    purchase_dates = date_column(df, mappings, 'purchase_date')
+    purchase_costs = number_column(df, mappings, 'purchase_cost').fillna(0)
+    today = timezone.now().date()
+
+    objects = []
+    for i in df.index[errors.valid]:
+        pattern = pattern_rows[i]
+        objects.append(Tire(
+            serial_number=serials[i],
+            size=sizes[i],
+            pattern_id=pattern['id'],
+            status_id=int(status_ids[i]),
+            purchase_date=purchase_dates[i] or today,
+            purchase_cost=round(float(purchase_costs[i]), 2),
+            initial_tread_depth=pattern['initial_tread_depth'],
+            last_tread_depth=pattern['initial_tread_depth'],
+        ))
+    return objects, errors
+
+
+def build_inspections(df, mappings):
+    errors = RowErrors(df.index)
+    if 'tire' not in mappings:
+        errors.add(pd.Series(True, index=df.index), 'Tire column not mapped')
+    if 'inspection_odometer' not in mappings:
+        errors.add(pd.Series(True, index=df.index), 'Inspection odometer column not mapped')
+
+    serials = text_column(df, mappings, 'tire')
+    tires = lookup_tires(serials)
+    tire_rows = map_column(serials, tires)
+    errors.add(serials == '', 'Tire serial number cannot be empty')
+    errors.add((serials != '') & tire_rows.isna(), 'Tire with serial ' + serials + ' not found')
+    position_ids = tire_rows.map(lambda row: row['current_position_id'] if row else None)
+    errors.add(tire_rows.notna() & position_ids.isna(), 'Tire ' + serials + ' is not mounted on a position')
+
+    odometers = number_column(df, mappings, 'inspection_odometer')
+    errors.add(odometers.isna(), 'Inspection odometer is empty or not a number')
+    treads = number_column(df, mappings, 'tread_depth').fillna(0)
+    pressures = number_column(df, mappings, 'pressure').fillna(0)
+
+    inspector_codes = text_column(df, mappings, 'inspector')
+    inspectors = lookup_by_key_or_id(Employee, 'employment_code', inspector_codes)
+    default_inspector = first_id(Employee)
+    inspector_ids = inspector_codes.map(
+        lambda code: inspectors[code]['id'] if code in inspectors else default_inspector
+    )
+    errors.add(inspector_ids.isna(), 'No inspector found')
+
+    default_wear = first_id(TireWearType)
+    errors.add(pd.Series(default_wear is None, index=df.index), 'No wear types defined')
+
+    inspection_dates = date_column(df, mappings, 'inspection_date')
+    today = timezone.now().date()
+
+    objects = []
+    for i in df.index[errors.valid]:
+        objects.append(TireInspection(
+            tire_id=tire_rows[i]['id'],
+            position_id=int(position_ids[i]),
+            inspection_odometer=int(odometers[i]),
+            inspection_date=inspection_dates[i] or today,
+            inspector_id=int(inspector_ids[i]),
+            tread_depth=round(float(treads[i]), 2),
+            pressure=round(float(pressures[i]), 2),
+            wear_id_id=default_wear,
+        ))
+    return objects, errors
+
+
+def build_assignments(df, mappings):
+    errors = RowErrors(df.index)
+    serials = text_column(df, mappings, 'tire')
+    tires = lookup_tires(serials)
+    tire_rows = map_column(serials, tires)
+    errors.add(serials == '', 'Tire serial number cannot be empty')
+    errors.add((serials != '') & tire_rows.isna(), 'Tire with serial ' + serials + ' not found')
+
+    vehicle_keys = text_column(df, mappings, 'vehicle')
+    vehicles = lookup_by_key_or_id(Vehicle, 'license_plate', vehicle_keys)
+    vehicle_ids = vehicle_keys.map(lambda key: vehicles[key]['id'] if key in vehicles else None)
+    errors.add(vehicle_ids.isna(), 'Vehicle not found: ' + vehicle_keys)
+
+    positions = {}
+    vehicle_id_list = sorted({int(v) for v in vehicle_ids.dropna()})
+    for batch in batched(vehicle_id_list):
+        for pk, vehicle_id, name in TirePosition.objects.filter(
+            vehicle_id__in=batch
+        ).values_list('id', 'vehicle_id', 'position_name'):
+            positions[(vehicle_id, name.strip().lower())] = pk
+    position_names = text_column(df, mappings, 'position')
+    position_ids = pd.Series(
+        [
+            positions.get((int(v), name.lower())) if pd.notna(v) else None
+            for v, name in zip(vehicle_ids, position_names)
+        ],
+        index=df.index, dtype=object,
+    )
+    errors.add(position_ids.isna(), 'Position ' + position_names + ' not found on vehicle')
+
+    order_numbers = text_column(df, mappings, 'work_order')
+    work_orders = lookup_by_key_or_id(
+        WorkOrder, 'work_order_number', order_numbers, extra=('current_odometer',),
+    )
+    work_order_rows = map_column(order_numbers, work_orders)
+    errors.add(work_order_rows.isna(), 'Work order not found: ' + order_numbers)
+
+    raw_dates = text_column(df, mappings, 'assignment_date')
+    dates = date_column(df, mappings, 'assignment_date')
+    errors.add((raw_dates != '') & dates.isna(), 'Invalid assignment date: ' + raw_dates)
+    odometers = number_column(df, mappings, 'start_odometer')
+    today = timezone.now().date()
+
+    objects = []
+    for i in df.index[errors.valid]:
+        work_order = work_order_rows[i]
+        start_odometer = odometers[i]
+        objects.append(TireAssignment(
+            tire_id=tire_rows[i]['id'],
+            tire_position_from_id=tire_rows[i]['current_position_id'],
+            tire_position_to_id=int(position_ids[i]),
+            assignment_date=dates[i] or today,
+            start_odometer=int(start_odometer) if pd.notna(start_odometer) else work_order['current_odometer'],
+            work_order_id=work_order['id'],
+        ))
+    return objects, errors
+
+
+def build_maintenance_records(df, mappings):
+    errors = RowErrors(df.index)
+    serials = text_column(df, mappings, 'tire')
+    tires = lookup_tires(serials)
+    tire_rows = map_column(serials, tires)
+    errors.add(serials == '', 'Tire serial number cannot be empty')
+    errors.add((serials != '') & tire_rows.isna(), 'Tire with serial ' + serials + ' not found')
+
+    service_type_ids = match_names(
+        ServiceType, 'service_name', text_column(df, mappings, 'service_type').str.lower(), first_id(ServiceType),
+    )
+    errors.add(service_type_ids.isna(), 'No service types defined')
+
+    provider_ids = match_names(
+        Supplier, 'supplier_name', text_column(df, mappings, 'service_provider').str.lower(), first_id(Supplier),
+    )
+    errors.add(provider_ids.isna(), 'No suppliers defined')
+
+    raw_dates = text_column(df, mappings, 'maintenance_date')
+    dates = date_column(df, mappings, 'maintenance_date')
+    errors.add((raw_dates != '') & dates.isna(), 'Invalid maintenance date: ' + raw_dates)
+    mileages = number_column(df, mappings, 'service_mileage').fillna(0)
+    costs = number_column(df, mappings, 'cost').fillna(0)
+    today = timezone.now().date()
+
+    objects = []
+    for i in df.index[errors.valid]:
+        objects.append(MaintenanceRecord(
+            tire_id=tire_rows[i]['id'],
+            service_type_id=int(service_type_ids[i]),
+            service_date=dates[i] or today,
+            service_mileage=int(mileages[i]),
+            cost=round(float(costs[i]), 2),
+            service_provider_id=int(provider_ids[i]),
+        ))
+    return objects, errors
+
+
+BUILDERS = {
+    'tire': (Tire, build_tires),
+    'inspection': (TireInspection, build_inspections),
+    'assignment': (TireAssignment, build_assignments),
+    'maintenance': (MaintenanceRecord, build_maintenance_records),
+}
+
+
+# ============================================================================
+# Write phase
+# ============================================================================
+
+def build_batch(import_type, rows, mappings, row_numbers=None):
+    """
+    Validate rows and build unsaved instances without touching the database for writes
+    Returns (model, objects, valid_row_numbers, row_errors {row_number: message})
+    """
+    row_numbers = list(row_numbers) if row_numbers is not None else list(range(1, len(rows) + 1))
+    df = pd.DataFrame.from_records(rows)
+    model, build = BUILDERS[import_type]
+
+    objects, row_errors = build(df, mappings)
+    errors = {
+        row_numbers[i]: message
+        for i, message in row_errors.messages.items()
+        if message
+    }
+    valid_row_numbers = [row_numbers[i] for i in df.index[row_errors.valid]]
+    return model, objects, valid_row_numbers, errors
+
+
+def validate_rows(import_type, rows, mappings, row_numbers=None):
+    """Dry run: {row_number: message} for every row the import would reject"""
+    if import_type not in BUILDERS:
+        raise ValueError(f'Unsupported import type: {import_type}')
+    if not rows:
+        return {}
+    return build_batch(import_type, rows, mappings, row_numbers)[3]
+
+
+def run_import(import_type, rows, mappings, chunk_size=None, row_numbers=None):
+    """
+    Import a batch of spreadsheet rows (list of dicts keyed by column header)
+    Returns (created, row_errors, fatal_error):
+      created     {row_number: created pk (None if the backend does not return pks)}
+      row_errors  {row_number: message} for rows rejected by validation
+      fatal_error message if the write transaction was rolled back, else None
+    """
+    if import_type not in BUILDERS:
+        return {}, {}, f'Unsupported import type: {import_type}'
+    if not rows:
+        return {}, {}, None
+
+    chunk_size = get_chunk_size(chunk_size)
+    model, objects, valid_row_numbers, errors = build_batch(
+        import_type, rows, mappings, row_numbers,
+    )
+
+    try:
+        with transaction.atomic():
+            for batch in batched(objects, chunk_size):
+                model.objects.bulk_create(batch, batch_size=chunk_size)
+            if model is TireInspection:
+                # bulk_create skips TireInspection.save(); refresh the tires' latest-inspection pointers
+                tire_ids = {obj.tire_id for obj in objects}
+                refresh_latest_inspections(tire_ids)
+                recompute_tire_metrics(tire_ids, chunk_size=chunk_size)
+                transaction.on_commit(inspections_added)
+            elif model is Tire:
+                transaction.on_commit(lambda: refresh_dashboard(('stats', 'tire_flags')))
+            # bulk_create skips the summary-counter signals
+            transaction.on_commit(lambda: invalidate_summary_counts(model))
+    except Exception as e:
+        return {}, errors, f'Import failed, no rows were written: {e}'
+
+    created = {
+        row_number: obj.pk for row_number, obj in zip(valid_row_numbers, objects)
+    }
+    return created, errors, None
+
+
+def format_errors(row_errors, fatal_error=None):
+    errors = [f'Row {row_number}: {message}' for row_number, message in sorted(row_errors.items())]
+    if fatal_error:
+        errors.append(fatal_error)
+    return errors
+
+
+def import_rows(import_type, rows, mappings, chunk_size=None, row_numbers=None):
+    """
+    Import a batch of spreadsheet rows (list of dicts keyed by column header)
+    Returns (created_count, errors) where errors are 'Row N: message' strings
+    """
+    created, row_errors, fatal_error = run_import(
+        import_type, rows, mappings, chunk_size=chunk_size, row_numbers=row_numbers,
+    )
+    return len(created), format_errors(row_errors, fatal_error)
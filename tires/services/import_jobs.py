@@ -0,0 +1,174 @@
+# tires/services/import_jobs.py
+"""
+Background imports: a database-backed job queue drained by
+`manage.py run_import_worker` processes, no external broker needed
+Progress, throughput and error counts are written to ImportLog after every chunk
+"""
+
+import os
+import socket
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from tires.models import ImportJob, ImportLog
+
+from .import_engine import get_chunk_size
+from .import_staging import import_staged_chunks, staged_rows
+
+DEFAULT_STALE_AFTER = 600  # seconds without a heartbeat before a running job is requeued
+MAX_ATTEMPTS = 3
+ACTIVE_STATUSES = ('queued', 'running')
+FINISHED_STATUSES = ('completed', 'failed')
+
+
+def background_imports_enabled():
+    # Off unless configured: without a running worker a queued job never starts
+    return getattr(settings, 'IMPORT_BACKGROUND_JOBS', False)
+
+
+def import_in_progress(session_id):
+    """True while a queued or running job still reads the session's staged rows"""
+    return bool(session_id) and ImportJob.objects.filter(
+        session_id=session_id, status__in=ACTIVE_STATUSES,
+    ).exists()
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+@transaction.atomic
+def enqueue_import(session_id, import_type, mappings, file_name='', user=None):
+    """Create the ImportLog + queued ImportJob for the approved staged rows of one session"""
+    rows = staged_rows(session_id)
+    log = ImportLog.objects.create(
+        # One log per job: a staging session can be imported more than once
+        session_id=f'{session_id}:{uuid.uuid4().hex[:8]}',
+        import_type=import_type,
+        imported_by=user if user is not None and user.is_authenticated else None,
+        file_name=file_name or '',
+        total_rows=rows.count(),
+        approved_rows=rows.filter(STATUS='approved').count(),
+        stats={'status': 'queued', 'processed_rows': 0, 'rows_per_second': 0},
+    )
+    return ImportJob.objects.create(
+        import_log=log,
+        session_id=session_id,
+        import_type=import_type,
+        mappings=mappings,
+    )
+
+
+def requeue_stale_jobs(stale_after=DEFAULT_STALE_AFTER):
+    """
+    Running jobs whose worker stopped sending heartbeats go back to the queue
+    (or fail after MAX_ATTEMPTS); returns the number of jobs touched
+    """
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    stale = ImportJob.objects.filter(status='running', heartbeat_at__lt=cutoff)
+    failed = stale.filter(attempts__gte=MAX_ATTEMPTS).update(
+        status='failed',
+        error_message='Worker stopped responding',
+        finished_at=timezone.now(),
+    )
+    requeued = stale.update(status='queued', worker='')
+    return failed + requeued
+
+
+def claim_next_job(worker=None):
+    """
+    Claim the oldest queued job with a compare-and-set UPDATE, so several
+    worker processes can poll the same table without handing out a job twice
+    """
+    worker = worker or worker_name()
+    queued = ImportJob.objects.filter(status='queued').order_by('created_at', 'id')
+    for job_id in queued.values_list('id', flat=True)[:10]:
+        now = timezone.now()
+        claimed = ImportJob.objects.filter(id=job_id, status='queued').update(
+            status='running',
+            worker=worker,
+            started_at=now,
+            heartbeat_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return ImportJob.objects.select_related('import_log').get(id=job_id)
+    return None
+
+
+def save_progress(job, status, imported, failed, processed, started, error=None):
+    elapsed = time.monotonic() - started
+    now = timezone.now()
+    ImportLog.objects.filter(id=job.import_log_id).update(
+        imported_rows=imported,
+        failed_rows=failed,
+        import_duration=int(elapsed),
+        stats={
+            'status': status,
+            'processed_rows': processed,
+            'rows_per_second': round(processed / elapsed, 1) if elapsed > 0 else 0,
+            'error': error,
+        },
+    )
+    job_update = {'status': status, 'heartbeat_at': now, 'error_message': error}
+    if status in FINISHED_STATUSES:
+        job_update['finished_at'] = now
+    ImportJob.objects.filter(id=job.id).update(**job_update)
+
+
+def run_job(job, chunk_size=None):
+    """
+    Import the job's approved staged rows chunk by chunk
+    Rows imported by an earlier, interrupted attempt are already marked imported and skipped
+    """
+    log = job.import_log
+    chunk_size = get_chunk_size(chunk_size)
+    started = time.monotonic()
+    imported = log.imported_rows
+    failed = 0
+    processed = imported
+
+    try:
+        for rows, created_count, error_count, fatal_error in import_staged_chunks(
+            job.session_id, job.import_type, job.mappings, chunk_size=chunk_size,
+        ):
+            processed += rows
+            imported += created_count
+            failed += error_count
+            if fatal_error:
+                save_progress(job, 'failed', imported, failed, processed, started, fatal_error)
+                return 'failed'
+            save_progress(job, 'running', imported, failed, processed, started)
+    except Exception as e:
+        save_progress(job, 'failed', imported, failed, processed, started, f'Import failed: {e}')
+        return 'failed'
+
+    save_progress(job, 'completed', imported, failed, processed, started)
+    return 'completed'
+
+
+def job_progress(job):
+    """JSON-safe progress snapshot for the polling endpoint and the success page"""
+    log = job.import_log
+    stats = log.stats or {}
+    processed = stats.get('processed_rows', 0)
+    total = log.approved_rows
+    return {
+        'id': job.id,
+        'status': job.status,
+        'finished': job.status in FINISHED_STATUSES,
+        'total_rows': total,
+        'processed_rows': processed,
+        'imported_rows': log.imported_rows,
+        'failed_rows': log.failed_rows,
+        'percent': min(100, round(processed * 100 / total)) if total else 100,
+        'rows_per_second': stats.get('rows_per_second', 0),
+        'duration': log.import_duration,
+        'error': job.error_message,
+    }
@@ -0,0 +1,314 @@
+# tires/services/import_staging.py
+"""
+Import staging: uploaded spreadsheets are parsed in chunks straight into
+ImportStaging rows keyed by an import session id, so later steps read only
+the rows they need instead of the whole file from the session backend
+"""
+
+import math
+import uuid
+from datetime import date, datetime, time
+
+import pandas as pd
+from django.db import transaction
+from django.db.models import Case, Count, Q, Value, When
+from django.db.models.fields.json import KeyTextTransform
+
+from tires.models import ImportStaging
+
+from .bulk_sql import update_rows
+from .import_engine import get_chunk_size, run_import, validate_rows
+
+# Upload import_type -> ImportStaging.MODEL_TYPE
+MODEL_TYPES = {
+    'tire': 'inventory',
+    'inspection': 'inspection',
+    'assignment': 'assignment',
+    'maintenance': 'maintenance',
+}
+
+
+def new_import_session_id():
+    return uuid.uuid4().hex
+
+
+def clean_value(value):
+    """Spreadsheet cell -> JSON-safe string ('' for blanks, ISO format for dates)"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and math.isnan(value):
+        return ''
+    if value is pd.NaT:
+        return ''
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def clean_headers(headers):
+    cleaned = []
+    for i, header in enumerate(headers):
+        header = clean_value(header).strip()
+        cleaned.append(header or f'Unnamed: {i}')
+    return cleaned
+
+
+def iter_csv_chunks(file, chunk_size):
+    # Cells stay text: '00123' keeps its zeros and '123' does not become '123.0'
+    reader = pd.read_csv(file, encoding='utf-8-sig', chunksize=chunk_size, dtype=str, keep_default_na=False)
+    for chunk in reader:
+        yield clean_headers(chunk.columns), chunk.itertuples(index=False, name=None)
+
+
+def iter_xlsx_chunks(file, chunk_size):
+    """Stream rows with openpyxl's read-only mode instead of loading the sheet into pandas"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        headers = clean_headers(next(rows, ()))
+        chunk = []
+        for values in rows:
+            if all(clean_value(value) == '' for value in values):
+                continue
+            chunk.append(values)
+            if len(chunk) >= chunk_size:
+                yield headers, chunk
+                chunk = []
+        if chunk or not headers:
+            yield headers, chunk
+    finally:
+        workbook.close()
+
+
+def iter_xls_chunks(file, chunk_size):
+    # Legacy .xls has no streaming reader; parse once and stage in chunks
+    df = pd.read_excel(file, sheet_name=0)
+    headers = clean_headers(df.columns)
+    for start in range(0, len(df), chunk_size):
+        yield headers, df.iloc[start:start + chunk_size].itertuples(index=False, name=None)
+    if df.empty:
+        yield headers, []
+
+
+def iter_upload_chunks(file, chunk_size):
+    name = file.name.lower()
+    if name.endswith('.csv'):
+        return iter_csv_chunks(file, chunk_size)
+    if name.endswith('.xls'):
+        return iter_xls_chunks(file, chunk_size)
+    return iter_xlsx_chunks(file, chunk_size)
+
+
+@transaction.atomic
+def stage_upload(file, import_type, session_id, chunk_size=None):
+    """
+    Parse an uploaded CSV/Excel file chunk by chunk into ImportStaging rows
+    Returns (headers, total_rows)
+    """
+    chunk_size = get_chunk_size(chunk_size)
+    model_type = MODEL_TYPES.get(import_type, 'custom')
+    headers = []
+    total_rows = 0
+
+    for headers, values_chunk in iter_upload_chunks(file, chunk_size):
+        staged = []
+        for values in values_chunk:
+            total_rows += 1
+            staged.append(ImportStaging(
+                SESSION_ID=session_id,
+                MODEL_TYPE=model_type,
+                ROW_NUMBER=total_rows,
+                DATA={header: clean_value(value) for header, value in zip(headers, values)},
+            ))
+        ImportStaging.objects.bulk_create(staged, batch_size=chunk_size)
+
+    return headers, total_rows
+
+
+def staged_rows(session_id):
+    return ImportStaging.objects.filter(SESSION_ID=session_id).order_by('ROW_NUMBER')
+
+
+def clear_staging(session_id):
+    if session_id:
+        ImportStaging.objects.filter(SESSION_ID=session_id).delete()
+
+
+def set_page_selection(session_id, page_row_numbers, selected_row_numbers):
+    """Approve the checked rows of one preview page and return the rest of that page to pending"""
+    page_row_numbers = set(page_row_numbers)
+    selected = page_row_numbers & set(selected_row_numbers)
+    rows = staged_rows(session_id).exclude(STATUS='imported')
+    rows.filter(ROW_NUMBER__in=selected).update(STATUS='approved')
+    rows.filter(ROW_NUMBER__in=page_row_numbers - selected).update(STATUS='pending')
+
+
+def filter_staged(queryset, column='', value='', validation='', selection=''):
+    """
+    Narrow staged rows by a column value (case-insensitive contains), validation
+    status ('valid' / 'invalid') and selection status ('selected' / 'unselected')
+    """
+    if column and value:
+        queryset = queryset.annotate(
+            filter_value=KeyTextTransform(column, 'DATA'),
+        ).filter(filter_value__icontains=value)
+
+    has_error = Q(ERROR_MESSAGE__isnull=False) & ~Q(ERROR_MESSAGE='')
+    if validation == 'valid':
+        queryset = queryset.exclude(has_error)
+    elif validation == 'invalid':
+        queryset = queryset.filter(has_error)
+
+    if selection == 'selected':
+        queryset = queryset.filter(STATUS='approved')
+    elif selection == 'unselected':
+        queryset = queryset.exclude(STATUS__in=['approved', 'imported'])
+    return queryset
+
+
+BULK_SELECTION_ACTIONS = ('select_all', 'clear', 'invert')
+
+
+def apply_bulk_selection(queryset, action):
+    """
+    Select, clear or invert every matching row with a single UPDATE
+    Imported rows are never touched; returns the number of rows updated
+    """
+    rows = queryset.exclude(STATUS='imported')
+    if action == 'select_all':
+        return rows.exclude(STATUS='approved').update(STATUS='approved')
+    if action == 'clear':
+        return rows.filter(STATUS='approved').update(STATUS='pending')
+    if action == 'invert':
+        return rows.update(STATUS=Case(
+            When(STATUS='approved', then=Value('pending')),
+            default=Value('approved'),
+        ))
+    raise ValueError(f'Unknown selection action: {action}')
+
+
+def selection_counts(session_id):
+    """{'total', 'selected', 'imported', 'invalid'} for one import session in a single query"""
+    return staged_rows(session_id).order_by().aggregate(
+        total=Count('id'),
+        selected=Count('id', filter=Q(STATUS='approved')),
+        imported=Count('id', filter=Q(STATUS='imported')),
+        invalid=Count('id', filter=Q(ERROR_MESSAGE__isnull=False) & ~Q(ERROR_MESSAGE='')),
+    )
+
+
+def validate_staged(session_id, import_type, mappings, chunk_size=None):
+    """
+    Dry-run the import engine over every staged row that is not yet imported and
+    store the outcome in ERROR_MESSAGE so rows can be filtered by validation status
+    Returns the number of invalid rows
+    """
+    chunk_size = get_chunk_size(chunk_size)
+    pending = staged_rows(session_id).exclude(STATUS='imported')
+
+    row_numbers, rows = [], []
+    for row_number, data in pending.values_list('ROW_NUMBER', 'DATA').iterator(chunk_size=chunk_size):
+        row_numbers.append(row_number)
+        rows.append(data)
+
+    row_errors = validate_rows(import_type, rows, mappings, row_numbers=row_numbers)
+
+    with transaction.atomic():
+        pending.exclude(ERROR_MESSAGE__isnull=True).update(ERROR_MESSAGE=None)
+        if row_errors:
+            params = [
+                (row_errors[row_number], row_id)
+                for row_id, row_number in pending.values_list('id', 'ROW_NUMBER').iterator(chunk_size=chunk_size)
+                if row_number in row_errors
+            ]
+            update_rows(ImportStaging, ['ERROR_MESSAGE'], params, chunk_size)
+    return len(row_errors)
+
+
+def import_staged(session_id, import_type, mappings, queryset=None, chunk_size=None):
+    """
+    Run the bulk import engine over staged rows (approved rows by default) and
+    record the outcome on each staging row
+    Returns (created_count, error_count, fatal_error)
+    """
+    chunk_size = get_chunk_size(chunk_size)
+    if queryset is None:
+        queryset = staged_rows(session_id).filter(STATUS='approved')
+
+    row_numbers, rows = [], []
+    for row_number, data in queryset.values_list('ROW_NUMBER', 'DATA').iterator(chunk_size=chunk_size):
+        row_numbers.append(row_number)
+        rows.append(data)
+
+    created, row_errors, fatal_error = run_import(
+        import_type, rows, mappings, chunk_size=chunk_size, row_numbers=row_numbers,
+    )
+    record_results(session_id, created, row_errors, chunk_size)
+    return len(created), len(row_errors), fatal_error
+
+
+def import_staged_chunks(session_id, import_type, mappings, queryset=None, chunk_size=None):
+    """
+    Chunked variant of import_staged for background jobs: every chunk is written
+    in its own transaction and its outcome recorded before the next one is read,
+    so progress is visible and an interrupted job resumes where it stopped
+    Yields (rows_in_chunk, created_count, error_count, fatal_error) per chunk
+    """
+    chunk_size = get_chunk_size(chunk_size)
+    if queryset is None:
+        queryset = staged_rows(session_id).filter(STATUS='approved')
+
+    last_row_number = 0
+    while True:
+        chunk = list(
+            queryset.filter(ROW_NUMBER__gt=last_row_number)
+            .order_by('ROW_NUMBER')
+            .values_list('ROW_NUMBER', 'DATA')[:chunk_size]
+        )
+        if not chunk:
+            return
+        row_numbers = [row_number for row_number, _ in chunk]
+        rows = [data for _, data in chunk]
+        last_row_number = row_numbers[-1]
+
+        created, row_errors, fatal_error = run_import(
+            import_type, rows, mappings, chunk_size=chunk_size, row_numbers=row_numbers,
+        )
+        record_results(session_id, created, row_errors, chunk_size, row_numbers=row_numbers)
+        yield len(chunk), len(created), len(row_errors), fatal_error
+
+
+def record_results(session_id, created, row_errors, chunk_size, row_numbers=None):
+    """
+    Mark imported rows with their created record id and store validation errors
+    row_numbers: the ROW_NUMBER range that was imported, to avoid scanning the whole session
+    """
+    outcome = {}
+    for row_number, pk in created.items():
+        outcome[row_number] = ('imported', None, str(pk) if pk is not None else None)
+    for row_number, message in row_errors.items():
+        outcome[row_number] = ('approved', message, None)
+    if not outcome:
+        return
+
+    # Match in Python: an IN list of every row number would exceed SQLite's parameter limit
+    rows = staged_rows(session_id).values_list('id', 'ROW_NUMBER')
+    if row_numbers:
+        rows = rows.filter(ROW_NUMBER__gte=min(row_numbers), ROW_NUMBER__lte=max(row_numbers))
+    params = [
+        (*outcome[row_number], row_id)
+        for row_id, row_number in rows.iterator(chunk_size=chunk_size)
+        if row_number in outcome
+    ]
+
+    update_rows(ImportStaging, ['STATUS', 'ERROR_MESSAGE', 'CREATED_RECORD_ID'], params, chunk_size)
+
+
+def staged_errors(session_id, limit=None):
+    errors = staged_rows(session_id).exclude(ERROR_MESSAGE__isnull=True).exclude(ERROR_MESSAGE='')
+    values = errors.values_list('ROW_NUMBER', 'ERROR_MESSAGE')
+    if limit is not None:
+        values = values[:limit]
+    return [f'Row {row_number}: {message}' for row_number, message in values]
@@ -0,0 +1,252 @@
+# tires/services/inspection_metrics.py
+"""
+Inspection metrics engine: CRP, RTD, Cmm, CKm, FCI, FLC, CTV, BTD, KMR and TDW
+computed column-wise over NumPy arrays for one inspection or a whole history
+
+Inputs per inspection
+  CTD / CTO / CTP   current tread depth, odometer and pressure
+  PTD / PTO         previous inspection of the same tire (ordered by odometer, id);
+                    the first inspection uses the pattern's initial tread depth and
+                    the start odometer of the tire's first assignment (PTO is NaN when
+                    the tire has none: CRP then measures from 0 as it always has, KMR is 0)
+  ITD / DTD / ITP   pattern initial / discarding tread depth and ideal pressure
+  TPP               tire purchase price
+  PTM               mileage on the assignment the inspection falls in
+KMR / TDW (km run and tread worn since the previous inspection) feed the monthly
+cost rollups (cost_rollups.py), refreshed for the months of the rows written
+"""
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+
+from tires.models import Tire, TireAssignment, TireInspection
+
+from .bulk_sql import filtered_by_ids, update_rows
+from .cost_rollups import months_changed, refresh_cost_rollups
+
+DEFAULT_CHUNK_SIZE = 2000  # tires per recompute pass
+
+# Output column -> TireInspection field
+METRIC_FIELDS = {
+    'CRP': 'consumption_rate',
+    'RTD': 'remaining_traveling_distance',
+    'Cmm': 'cost_per_mm_tread_depth',
+    'CKm': 'cost_per_1000_km_travel',
+    'FCI': 'fuel_consumption_increase',
+    'FLC': 'fuel_loss_caused',
+    'CTV': 'current_tire_value',
+    'BTD': 'balance_traveling_distance',
+    'KMR': 'distance_travelled',
+    'TDW': 'tread_consumed',
+}
+
+INSPECTION_COLUMNS = {
+    'id': 'id',
+    'tire_id': 'tire_id',
+    'date': 'inspection_date',
+    'CTO': 'inspection_odometer',
+    'CTD': 'tread_depth',
+    'CTP': 'pressure',
+    'ITD': 'tire__pattern__initial_tread_depth',
+    'DTD': 'tire__pattern__discarding_tread_depth',
+    'ITP': 'tire__pattern__ideal_tire_pressure',
+    'TPP': 'tire__purchase_cost',
+    **{f'stored_{column}': field for column, field in METRIC_FIELDS.items()},
+}
+
+
+def field_limit(field_name):
+    """Largest magnitude a TireInspection metric column can hold"""
+    field = TireInspection._meta.get_field(field_name)
+    if field.get_internal_type() == 'DecimalField':
+        return 10 ** (field.max_digits - field.decimal_places) - 10 ** -field.decimal_places
+    return 2 ** 31 - 1
+
+
+def calculate_metrics(frame):
+    """
+    Vectorized metric formulas; `frame` needs CTD, CTO, CTP, PTD, PTO, ITD, DTD, ITP, TPP
+    and optionally PTM. Returns a DataFrame with one column per METRIC_FIELDS key
+    """
+    f = frame.astype({column: float for column in ('CTD', 'CTO', 'CTP', 'PTD', 'PTO', 'ITD', 'DTD', 'ITP', 'TPP')})
+    ctd, cto, ctp = f['CTD'].to_numpy(), f['CTO'].to_numpy(), f['CTP'].to_numpy()
+    ptd, pto = f['PTD'].to_numpy(), f['PTO'].to_numpy()
+    no_baseline = np.isnan(pto)
+    pto = np.where(no_baseline, 0.0, pto)
+    itd, dtd, itp, tpp = f['ITD'].to_numpy(), f['DTD'].to_numpy(), f['ITP'].to_numpy(), f['TPP'].to_numpy()
+    ptm = f['PTM'].astype(float).to_numpy() if 'PTM' in f else np.zeros(len(f))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Consumption rate: mm worn per 10,000 km since the previous inspection
+        worn = (cto > pto) & (ptd > ctd)
+        crp = np.where(worn, (ptd - ctd) * 10000 / (cto - pto), 0.0)
+
+        # Remaining / balance traveling distance at the current wear rate
+        rtd = np.where(crp > 0, (ctd - dtd) / crp * 10000, 0.0)
+
+        usable = (itd - dtd) > 0
+        cmm = np.where(usable, tpp / (itd - dtd), 0.0)
+        ctv = np.where(usable, (ctd - dtd) / (itd - dtd) * tpp, 0.0)
+
+        ckm = 10 * crp * cmm
+        fci = (itp - ctp) / 10 * 0.4
+        flc = fci * (ptm / 100)
+
+        # Distance and tread since the previous inspection (never negative: re-treads, resets)
+        # No previous reading or mount odometer: the distance run is unknown, not the whole odometer
+        kmr = np.where(no_baseline, 0.0, np.clip(cto - pto, 0, None))
+        tdw = np.clip(ptd - ctd, 0, None)
+
+    metrics = pd.DataFrame({
+        'CRP': crp, 'RTD': rtd, 'Cmm': cmm, 'CKm': ckm,
+        'FCI': fci, 'FLC': flc, 'CTV': ctv, 'BTD': rtd,
+        'KMR': kmr, 'TDW': tdw,
+    }, index=frame.index)
+    return metrics.replace([np.inf, -np.inf], np.nan).fillna(0.0)
+
+
+def round_for_storage(metrics):
+    """Round/truncate each metric like its model field would and clip to the column's range"""
+    stored = {}
+    for column, field_name in METRIC_FIELDS.items():
+        field = TireInspection._meta.get_field(field_name)
+        limit = field_limit(field_name)
+        values = metrics[column].clip(-limit, limit)
+        if field.get_internal_type() == 'DecimalField':
+            stored[column] = values.round(field.decimal_places)
+        else:
+            stored[column] = np.trunc(values).astype('int64')
+    return pd.DataFrame(stored, index=metrics.index)
+
+
+# ============================================================================
+# Loading
+# ============================================================================
+
+def load_inspections(tire_ids=None, tire_range=None):
+    """One row per inspection with the tire/pattern inputs and the currently stored metrics"""
+    records = []
+    for queryset in filtered_by_ids(TireInspection.objects.all(), tire_ids, tire_range, 'tire_id'):
+        records.extend(queryset.values_list(*INSPECTION_COLUMNS.values()))
+    return pd.DataFrame.from_records(records, columns=list(INSPECTION_COLUMNS))
+
+
+def load_assignments(tire_ids=None, tire_range=None):
+    records = []
+    fields = ('tire_id', 'assignment_date', 'id', 'start_odometer', 'end_odometer')
+    for queryset in filtered_by_ids(TireAssignment.objects.all(), tire_ids, tire_range, 'tire_id'):
+        records.extend(queryset.values_list(*fields))
+    return pd.DataFrame.from_records(records, columns=list(fields))
+
+
+def add_previous_readings(frame, assignments):
+    """PTD/PTO from the preceding inspection of the same tire, in a single ordered pass"""
+    frame = frame.sort_values(['tire_id', 'CTO', 'id'], kind='mergesort')
+    grouped = frame.groupby('tire_id', sort=False)
+    frame['PTD'] = grouped['CTD'].shift(1)
+    frame['PTO'] = grouped['CTO'].shift(1)
+
+    first = frame['PTD'].isna()
+    frame.loc[first, 'PTD'] = frame.loc[first, 'ITD']
+
+    first_start = (
+        assignments.sort_values(['tire_id', 'assignment_date', 'id'])
+        .drop_duplicates('tire_id')
+        .set_index('tire_id')['start_odometer']
+    )
+    frame.loc[first, 'PTO'] = frame.loc[first, 'tire_id'].map(first_start)
+    return frame
+
+
+def add_position_mileage(frame, assignments):
+    """PTM: (end or current odometer) - start odometer of the assignment the inspection falls in"""
+    stints = assignments.dropna(subset=['start_odometer'])
+    if stints.empty:
+        frame['PTM'] = 0.0
+        return frame
+
+    merged = pd.merge_asof(
+        frame.reset_index().sort_values('CTO').astype({'CTO': 'int64'}),
+        stints[['tire_id', 'start_odometer', 'end_odometer']]
+        .astype({'start_odometer': 'int64'})
+        .sort_values('start_odometer'),
+        left_on='CTO', right_on='start_odometer', by='tire_id', direction='backward',
+    ).set_index('index')
+    end = merged['end_odometer'].astype(float).fillna(merged['CTO'].astype(float))
+    frame['PTM'] = (end - merged['start_odometer'].astype(float)).clip(lower=0).fillna(0.0)
+    return frame
+
+
+# ============================================================================
+# Recompute
+# ============================================================================
+
+def changed_rows(frame, stored):
+    """Rows whose freshly computed metrics differ from what is in the database"""
+    changed = np.zeros(len(frame), dtype=bool)
+    for column in METRIC_FIELDS:
+        current = frame[f'stored_{column}'].astype(float).fillna(0.0).to_numpy()
+        changed |= ~np.isclose(current, stored[column].astype(float).to_numpy(), atol=0.005)
+    return changed
+
+
+def recompute_metrics(tire_ids=None, tire_range=None, chunk_size=1000, refresh_rollups=True):
+    """
+    Recompute every inspection of the given tires (or of all tires) and write
+    only the rows whose metrics changed. Returns (inspections_seen, inspections_updated)
+    The cost rollups of the months written are refreshed on commit unless refresh_rollups=False
+    """
+    frame = load_inspections(tire_ids, tire_range)
+    if frame.empty:
+        return 0, 0
+
+    assignments = load_assignments(tire_ids, tire_range)
+    frame = add_previous_readings(frame, assignments)
+    frame = add_position_mileage(frame, assignments)
+    stored = round_for_storage(calculate_metrics(frame))
+
+    changed = changed_rows(frame, stored)
+    if not changed.any():
+        return len(frame), 0
+
+    columns = list(METRIC_FIELDS)
+    values = stored.loc[changed, columns].astype(object).to_numpy().tolist()
+    ids = frame.loc[changed, 'id'].tolist()
+    params = [(*row, pk) for row, pk in zip(values, ids)]
+    update_rows(TireInspection, list(METRIC_FIELDS.values()), params, chunk_size)
+    if refresh_rollups:
+        months_changed(frame.loc[changed, 'date'].dropna().unique())
+    return len(frame), len(params)
+
+
+def recompute_tire_metrics(tire_ids, chunk_size=1000, refresh_rollups=True):
+    """Incremental entry point for write paths: refresh the histories of the tires just touched"""
+    tire_ids = sorted({tire_id for tire_id in tire_ids if tire_id is not None})
+    if not tire_ids:
+        return 0, 0
+    return recompute_metrics(tire_ids=tire_ids, chunk_size=chunk_size, refresh_rollups=refresh_rollups)
+
+
+def iter_fleet_recompute(chunk_size=DEFAULT_CHUNK_SIZE, start_after=0):
+    """
+    Backfill helper: walk tires by id in keyset chunks, recomputing each chunk's
+    full inspection history in its own transaction; the cost rollups are rebuilt
+    once at the end rather than per chunk
+    Yields (last_tire_id, inspections_seen, inspections_updated) per chunk
+    """
+    last_id = start_after
+    updated_any = False
+    while True:
+        tire_ids = list(
+            Tire.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size]
+        )
+        if not tire_ids:
+            break
+        with transaction.atomic():
+            seen, updated = recompute_metrics(tire_range=(tire_ids[0], tire_ids[-1]), refresh_rollups=False)
+        updated_any = updated_any or bool(updated)
+        last_id = tire_ids[-1]
+        yield last_id, seen, updated
+    if updated_any:
+        refresh_cost_rollups()
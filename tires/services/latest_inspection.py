@@ -0,0 +1,60 @@
+# tires/services/latest_inspection.py
+"""
+Maintains Tire.latest_inspection / last_odometer / last_pressure / last_tread_depth
+Each refresh is one set-based UPDATE per batch of tires, so reads of a tire's
+latest state are a plain join instead of a correlated query per tire
+"""
+
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from tires.models import Tire, TireInspection
+
+from .bulk_sql import filtered_by_ids
+from .dashboard import refresh_tire_flags
+
+
+def latest_inspection_values(field):
+    """Correlated subquery: `field` of the tire's newest inspection (highest odometer, then id)"""
+    latest = TireInspection.objects.filter(
+        tire=OuterRef('pk')
+    ).order_by('-inspection_odometer', '-id')
+    return Subquery(latest.values(field)[:1])
+
+
+def refresh_latest_inspections(tire_ids=None, tire_range=None):
+    """
+    Point each tire at its newest inspection and copy its readings
+    Tires without inspections keep their last_tread_depth (set from the pattern
+    on creation) and get no pressure/odometer. Returns the number of tires updated
+    """
+    if tire_ids is not None:
+        tire_ids = sorted({tire_id for tire_id in tire_ids if tire_id is not None})
+        if not tire_ids:
+            return 0
+
+    updated = 0
+    for tires in filtered_by_ids(Tire.objects.all(), tire_ids, tire_range):
+        updated += tires.update(
+            latest_inspection=latest_inspection_values('id'),
+            last_odometer=latest_inspection_values('inspection_odometer'),
+            last_pressure=latest_inspection_values('pressure'),
+            last_tread_depth=Coalesce(latest_inspection_values('tread_depth'), F('last_tread_depth')),
+        )
+    # update() skips signals: re-evaluate the dashboard's tread/pressure flags here
+    refresh_tire_flags(tire_ids, tire_range)
+    return updated
+
+
+def iter_rebuild_latest_inspections(chunk_size=5000):
+    """Walk all tires in keyset chunks; yields (last_tire_id, tires_updated)"""
+    last_id = 0
+    while True:
+        tire_ids = list(
+            Tire.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size]
+        )
+        if not tire_ids:
+            return
+        updated = refresh_latest_inspections(tire_range=(tire_ids[0], tire_ids[-1]))
+        last_id = tire_ids[-1]
+        yield last_id, updated
@@ -0,0 +1,324 @@
+# tires/services/list_specs.py
+"""
+Per-model list specifications: which GET params filter, which keys sort,
+which related rows are joined and which fields the JSON endpoints return
+Filter param names match the ones the list templates already submit
+"""
+
+from tires.models import (
+    MaintenanceRecord, Tire, TireAssignment, TireInspection,
+    TirePosition, Vehicle, WorkOrder,
+)
+
+from .pagination import ListSpec
+
+LIST_SPECS = {
+    'tires': ListSpec(
+        Tire,
+        default_sort='id',
+        filters={
+            'status_filter': 'status_id',
+            'pattern_filter': 'pattern_id',
+            'supplier_filter': 'supplier_id',
+            'vehicle_filter': 'current_position__vehicle_id',
+            'unmounted_filter': 'current_position__isnull',
+            'serial': 'serial_number__icontains',
+        },
+        sorts={
+            'serial_number': 'serial_number',
+            'purchase_date': 'purchase_date',
+            'purchase_cost': 'purchase_cost',
+        },
+        select_related=('pattern', 'status', 'supplier', 'current_position__vehicle'),
+        fields={
+            'id': 'id',
+            'serial_number': 'serial_number',
+            'size': 'size',
+            'pattern': 'pattern__pattern_code',
+            'brand': 'pattern__brand_name',
+            'status': 'status__status_name',
+            'supplier': 'supplier__supplier_name',
+            'purchase_date': 'purchase_date',
+            'purchase_cost': 'purchase_cost',
+            'last_tread_depth': 'last_tread_depth',
+            'last_pressure': 'last_pressure',
+            'last_odometer': 'last_odometer',
+            'latest_inspection_id': 'latest_inspection_id',
+            'vehicle': 'current_position__vehicle__license_plate',
+            'position': 'current_position__position_name',
+        },
+        detail_fields={
+            'pattern_id': 'pattern_id',
+            'status_id': 'status_id',
+            'supplier_id': 'supplier_id',
+            'current_position_id': 'current_position_id',
+            'initial_tread_depth': 'initial_tread_depth',
+            'retread_count': 'retread_count',
+            'maximum_retreads': 'maximum_retreads',
+            'tire_mileage': 'tire_mileage',
+            'notes': 'notes',
+        },
+    ),
+    'tire_inspections': ListSpec(
+        TireInspection,
+        filters={
+            'tire_filter': 'tire_id',
+            'axle_type_filter': 'position__axle_type',
+            'inspector_filter': 'inspector_id',
+            'wear_filter': 'wear_id',
+            'work_order_filter': 'work_order_id',
+            'vehicle_filter': 'position__vehicle_id',
+        },
+        sorts={
+            'inspection_odometer': 'inspection_odometer',
+            'tread_depth': 'tread_depth',
+            'pressure': 'pressure',
+        },
+        select_related=('tire__pattern', 'position__vehicle', 'inspector', 'wear_id', 'work_order'),
+        fields={
+            'id': 'id',
+            'tire_id': 'tire_id',
+            'tire': 'tire__serial_number',
+            'vehicle': 'position__vehicle__license_plate',
+            'position': 'position__position_name',
+            'axle_type': 'position__axle_type',
+            'inspection_odometer': 'inspection_odometer',
+            'inspection_date': 'inspection_date',
+            'tread_depth': 'tread_depth',
+            'pressure': 'pressure',
+            'inspector': 'inspector__employment_code',
+            'wear_type': 'wear_id__name',
+            'work_order': 'work_order__work_order_number',
+        },
+        export_fields={
+            'id': 'id',
+            'tire': 'tire__serial_number',
+            'pattern': 'tire__pattern__pattern_code',
+            'vehicle': 'position__vehicle__license_plate',
+            'position': 'position__position_name',
+            'axle_type': 'position__axle_type',
+            'inspection_date': 'inspection_date',
+            'inspection_odometer': 'inspection_odometer',
+            'tread_depth': 'tread_depth',
+            'pressure': 'pressure',
+            'wear_type': 'wear_id__name',
+            'inspector': 'inspector__employment_code',
+            'work_order': 'work_order__work_order_number',
+            'consumption_rate': 'consumption_rate',
+            'remaining_traveling_distance': 'remaining_traveling_distance',
+            'cost_per_1000_km_travel': 'cost_per_1000_km_travel',
+            'current_tire_value': 'current_tire_value',
+        },
+        detail_fields={
+            'position_id': 'position_id',
+            'inspector_id': 'inspector_id',
+            'wear_type_id': 'wear_id_id',
+            'inspector_first_name': 'inspector__first_name',
+            'inspector_last_name': 'inspector__last_name',
+            'wear_cause': 'wear_id__wear_common_cause',
+            'pattern': 'tire__pattern__pattern_code',
+            'brand': 'tire__pattern__brand_name',
+            'consumption_rate': 'consumption_rate',
+            'remaining_traveling_distance': 'remaining_traveling_distance',
+            'cost_per_mm_tread_depth': 'cost_per_mm_tread_depth',
+            'cost_per_1000_km_travel': 'cost_per_1000_km_travel',
+            'fuel_consumption_increase': 'fuel_consumption_increase',
+            'fuel_loss_caused': 'fuel_loss_caused',
+            'current_tire_value': 'current_tire_value',
+            'balance_traveling_distance': 'balance_traveling_distance',
+            'initial_tread_depth': 'tire__pattern__initial_tread_depth',
+            'discarding_tread_depth': 'tire__pattern__discarding_tread_depth',
+            'ideal_tire_pressure': 'tire__pattern__ideal_tire_pressure',
+            'purchase_cost': 'tire__purchase_cost',
+        },
+    ),
+    'tire_assignments': ListSpec(
+        TireAssignment,
+        filters={
+            'tire_filter': 'tire_id',
+            'work_order_filter': 'work_order_id',
+            'vehicle_filter': 'tire_position_to__vehicle_id',
+        },
+        sorts={
+            'assignment_date': 'assignment_date',
+            'start_odometer': 'start_odometer',
+        },
+        select_related=(
+            'tire', 'tire_position_from__vehicle', 'tire_position_to__vehicle',
+            'work_order', 'inspection',
+        ),
+        fields={
+            'id': 'id',
+            'tire_id': 'tire_id',
+            'tire': 'tire__serial_number',
+            'from_vehicle': 'tire_position_from__vehicle__license_plate',
+            'from_position': 'tire_position_from__position_name',
+            'to_vehicle': 'tire_position_to__vehicle__license_plate',
+            'to_position': 'tire_position_to__position_name',
+            'assignment_date': 'assignment_date',
+            'removal_date': 'removal_date',
+            'start_odometer': 'start_odometer',
+            'end_odometer': 'end_odometer',
+            'work_order': 'work_order__work_order_number',
+            'inspection_id': 'inspection_id',
+        },
+        export_fields={
+            'id': 'id',
+            'tire': 'tire__serial_number',
+            'from_vehicle': 'tire_position_from__vehicle__license_plate',
+            'from_position': 'tire_position_from__position_name',
+            'to_vehicle': 'tire_position_to__vehicle__license_plate',
+            'to_position': 'tire_position_to__position_name',
+            'discarded': 'is_discard_operation',
+            'assignment_date': 'assignment_date',
+            'removal_date': 'removal_date',
+            'start_odometer': 'start_odometer',
+            'end_odometer': 'end_odometer',
+            'removal_mileage': 'removal_mileage',
+            'reason_for_removal': 'reason_for_removal',
+            'work_order': 'work_order__work_order_number',
+            'notes': 'notes',
+        },
+        detail_fields={
+            'tire_position_from_id': 'tire_position_from_id',
+            'tire_position_to_id': 'tire_position_to_id',
+            'work_order_id': 'work_order_id',
+            'reason_for_removal': 'reason_for_removal',
+            'notes': 'notes',
+            'tire_status': 'tire__status__status_name',
+            'current_vehicle': 'tire__current_position__vehicle__license_plate',
+            'current_position': 'tire__current_position__position_name',
+        },
+    ),
+    'maintenance_records': ListSpec(
+        MaintenanceRecord,
+        filters={
+            'tire_filter': 'tire_id',
+            'service_type_filter': 'service_type_id',
+            'service_provider_filter': 'service_provider_id',
+        },
+        sorts={
+            'service_date': 'service_date',
+            'service_mileage': 'service_mileage',
+            'cost': 'cost',
+        },
+        select_related=('tire', 'service_type', 'service_provider'),
+        fields={
+            'id': 'id',
+            'tire_id': 'tire_id',
+            'tire': 'tire__serial_number',
+            'service_type': 'service_type__service_name',
+            'service_date': 'service_date',
+            'service_mileage': 'service_mileage',
+            'cost': 'cost',
+            'service_provider': 'service_provider__supplier_name',
+        },
+        detail_fields={
+            'service_type_id': 'service_type_id',
+            'service_provider_id': 'service_provider_id',
+            'notes': 'notes',
+        },
+        export_fields={
+            'id': 'id',
+            'tire': 'tire__serial_number',
+            'service_type': 'service_type__service_name',
+            'service_date': 'service_date',
+            'service_mileage': 'service_mileage',
+            'cost': 'cost',
+            'service_provider': 'service_provider__supplier_name',
+            'notes': 'notes',
+        },
+    ),
+    'work_orders': ListSpec(
+        WorkOrder,
+        filters={
+            'status_filter': 'status',
+            'shift_type_filter': 'shift_type',
+            'vehicle_filter': 'vehicle_id',
+            'assigned_to_filter': 'assigned_to_id',
+            'number': 'work_order_number__icontains',
+        },
+        sorts={
+            'date_created': 'date_created',
+            'work_order_number': 'work_order_number',
+            'current_odometer': 'current_odometer',
+        },
+        select_related=('assigned_to', 'vehicle'),
+        fields={
+            'id': 'id',
+            'work_order_number': 'work_order_number',
+            'date_created': 'date_created',
+            'vehicle': 'vehicle__license_plate',
+            'assigned_to': 'assigned_to__employment_code',
+            'current_odometer': 'current_odometer',
+            'shift_type': 'shift_type',
+            'status': 'status',
+            'cost': 'cost',
+        },
+        detail_fields={
+            'assigned_to_id': 'assigned_to_id',
+            'assigned_to_first_name': 'assigned_to__first_name',
+            'assigned_to_last_name': 'assigned_to__last_name',
+            'vehicle_id': 'vehicle_id',
+            'vehicle_make': 'vehicle__make',
+        },
+    ),
+    'tire_positions': ListSpec(
+        TirePosition,
+        default_sort='id',
+        filters={
+            'vehicle_filter': 'vehicle_id',
+            'axle_type_filter': 'axle_type',
+            'empty_filter': 'mounted_tire__isnull',
+            'plate': 'vehicle__license_plate__icontains',
+        },
+        sorts={
+            'axle_number': 'axle_number',
+            'wheel_number': 'wheel_number',
+        },
+        select_related=('vehicle', 'mounted_tire__pattern', 'mounted_tire__status'),
+        fields={
+            'id': 'id',
+            'vehicle': 'vehicle__license_plate',
+            'position_name': 'position_name',
+            'axle_number': 'axle_number',
+            'wheel_number': 'wheel_number',
+            'axle_type': 'axle_type',
+            'is_spare': 'is_spare',
+            'mounted_tire_id': 'mounted_tire_id',
+            'mounted_tire': 'mounted_tire__serial_number',
+        },
+        detail_fields={
+            'vehicle_id': 'vehicle_id',
+            'vehicle_make': 'vehicle__make',
+            'tire_order': 'tire_order',
+            'tire_pattern': 'mounted_tire__pattern__brand_name',
+            'tire_status': 'mounted_tire__status__status_name',
+        },
+    ),
+    'vehicles': ListSpec(
+        Vehicle,
+        default_sort='id',
+        filters={
+            'status_filter': 'status',
+            'type_filter': 'vehicle_type',
+            'year_filter': 'year',
+            'plate': 'license_plate__icontains',
+        },
+        sorts={
+            'license_plate': 'license_plate',
+            'year': 'year',
+            'odometer': 'odometer',
+        },
+        fields={
+            'id': 'id',
+            'license_plate': 'license_plate',
+            'make': 'make',
+            'year': 'year',
+            'vehicle_type': 'vehicle_type',
+            'status': 'status',
+            'tire_configuration': 'tire_configuration',
+            'odometer': 'odometer',
+        },
+    ),
+}
@@ -0,0 +1,160 @@
+# tires/services/occupancy.py
+"""
+Occupancy reconciliation: Tire.current_position and TirePosition.mounted_tire
+record the same fact twice and drift apart when a write updates only one side
+
+Inconsistencies are found with one join query per kind; only the tires they
+involve are loaded and resolved, so a healthy fleet costs four indexed queries
+TirePosition.mounted_tire is taken as the truth (it is what the assignment
+screens and the rotation API read):
+  position holds a discarded tire    position emptied, tire unpointed
+  tire mounted in several positions  kept where the tire points, else where it was
+                                     last assigned; the other positions emptied
+  position not claimed by its tire   tire pointed at the position
+  tire claims a position that holds  position filled if it is empty and the tire is
+  another tire or none               mounted nowhere else, otherwise tire unpointed
+Repairs are applied with set-based updates in one transaction
+"""
+
+import time
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from tires.models import Tire, TireAssignment, TirePosition
+
+from .bulk_sql import batched, update_rows
+from .dashboard import refresh_tire_flags
+from .summary_counters import status_ids
+
+DISCARDED_STATUS_NAMES = ('DISCARDED', 'Scrap')
+
+DISCARDED_MOUNTED = 'position_holds_discarded_tire'
+MOUNTED_TWICE = 'tire_mounted_twice'
+UNCLAIMED = 'position_not_claimed_by_tire'
+CLAIMS_ELSEWHERE = 'tire_claims_other_position'
+ISSUE_KINDS = (DISCARDED_MOUNTED, MOUNTED_TWICE, UNCLAIMED, CLAIMS_ELSEWHERE)
+
+
+# ============================================================================
+# Finding
+# ============================================================================
+
+def find_issues(discarded):
+    """{kind: [(tire_id, position_id), ...]} from one join query per kind"""
+    occupied = TirePosition.objects.filter(mounted_tire__isnull=False)
+    twice = occupied.values('mounted_tire').annotate(positions=Count('id')).filter(positions__gt=1)
+    claimed = Tire.objects.filter(current_position__isnull=False).annotate(
+        holder=F('current_position__mounted_tire_id'))
+    held = occupied.annotate(claim=F('mounted_tire__current_position_id'))
+    return {
+        DISCARDED_MOUNTED: list(
+            occupied.filter(mounted_tire__status_id__in=discarded).values_list('mounted_tire_id', 'id')),
+        MOUNTED_TWICE: list(
+            occupied.filter(mounted_tire__in=twice.values('mounted_tire')).values_list('mounted_tire_id', 'id')),
+        UNCLAIMED: list(
+            held.filter(Q(claim__isnull=True) | ~Q(claim=F('id'))).values_list('mounted_tire_id', 'id')),
+        CLAIMS_ELSEWHERE: list(
+            claimed.filter(Q(holder__isnull=True) | ~Q(holder=F('id'))).values_list('id', 'current_position_id')),
+    }
+
+
+# ============================================================================
+# Resolving
+# ============================================================================
+
+def load_state(tire_ids):
+    """Current side of every affected tire: ({tire_id: (current_position_id, status_id)},
+    {tire_id: [positions holding it]}, {position_id: holder})"""
+    tires, held, holders = {}, {}, {}
+    for batch in batched(tire_ids):
+        for tire_id, position_id, status_id in Tire.objects.filter(id__in=batch).values_list(
+                'id', 'current_position_id', 'status_id'):
+            tires[tire_id] = (position_id, status_id)
+        for position_id, tire_id in TirePosition.objects.filter(mounted_tire_id__in=batch).values_list(
+                'id', 'mounted_tire_id'):
+            held.setdefault(tire_id, []).append(position_id)
+            holders[position_id] = tire_id
+    claimed = {position_id for position_id, _ in tires.values() if position_id is not None} - set(holders)
+    for batch in batched(claimed):
+        holders.update(TirePosition.objects.filter(id__in=batch).values_list('id', 'mounted_tire_id'))
+    return tires, held, holders
+
+
+def last_assigned(tire_ids):
+    """{tire_id: position_id} of each tire's latest assignment"""
+    latest = {}
+    for batch in batched(tire_ids):
+        for tire_id, position_id in TireAssignment.objects.filter(
+            tire_id__in=batch, tire_position_to__isnull=False,
+        ).order_by('assignment_date', 'id').values_list('tire_id', 'tire_position_to_id'):
+            latest[tire_id] = position_id
+    return latest
+
+
+def plan_repairs(tires, held, holders, latest, discarded):
+    """
+    ({position_id: tire_id or None}, {tire_id: position_id or None}) that make both sides agree
+    Tires still held by a position are settled first, so positions they release can be refilled
+    """
+    positions, pointers = {}, {}
+
+    def holder(position_id):
+        return positions.get(position_id, holders.get(position_id))
+
+    for tire_id in sorted(tires, key=lambda tire_id: tire_id not in held):
+        claim, status_id = tires[tire_id]
+        mounted = sorted(held.get(tire_id, []))
+        keep = None
+        if status_id not in discarded:
+            if claim in mounted:
+                keep = claim
+            elif mounted:
+                keep = latest.get(tire_id) if latest.get(tire_id) in mounted else mounted[0]
+            elif claim is not None and holder(claim) is None:
+                keep = claim
+        for position_id in mounted:
+            if position_id != keep:
+                positions[position_id] = None
+        if keep is not None and holder(keep) != tire_id:
+            positions[keep] = tire_id
+        if claim != keep:
+            pointers[tire_id] = keep
+    return positions, pointers
+
+
+# ============================================================================
+# Reconcile
+# ============================================================================
+
+def reconcile_occupancy(apply=False):
+    """
+    Find (and with apply=True, repair) every occupancy inconsistency
+    Returns {'issues': {kind: [(tire_id, position_id)]}, 'positions': {id: tire or None},
+    'tires': {id: position or None}, 'timings': {step: seconds}}
+    """
+    timings = {}
+    started = time.monotonic()
+    discarded = status_ids(*DISCARDED_STATUS_NAMES)
+
+    with transaction.atomic():
+        issues = find_issues(discarded)
+        timings['find'] = time.monotonic() - started
+
+        started = time.monotonic()
+        tire_ids = sorted({tire_id for rows in issues.values() for tire_id, _ in rows})
+        tires, held, holders = load_state(tire_ids)
+        latest = last_assigned([tire_id for tire_id, positions in held.items() if len(positions) > 1])
+        positions, pointers = plan_repairs(tires, held, holders, latest, discarded)
+        timings['plan'] = time.monotonic() - started
+
+        if apply and (positions or pointers):
+            started = time.monotonic()
+            update_rows(TirePosition, ['mounted_tire'], [(tire_id, pk) for pk, tire_id in positions.items()])
+            update_rows(Tire, ['current_position'], [(position_id, pk) for pk, position_id in pointers.items()])
+            # Set-based writes skip signals; the dashboard flags show each tire's position
+            changed = set(pointers) | {tire_id for tire_id in positions.values() if tire_id is not None}
+            transaction.on_commit(lambda: refresh_tire_flags(changed))
+            timings['apply'] = time.monotonic() - started
+
+    return {'issues': issues, 'positions': positions, 'tires': pointers, 'timings': timings}
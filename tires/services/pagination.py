@@ -0,0 +1,257 @@
+# tires/services/pagination.py
+"""
+Keyset (cursor) pagination with declarative filter and sort whitelists
+Shared by the *_list views and the JSON list endpoints
+"""
+
+import base64
+import datetime
+import json
+from functools import cached_property
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class InvalidListQuery(ValueError):
+    """Raised for unknown sort keys, bad filter values or malformed cursors (strict mode)"""
+
+
+class ListSpec:
+    """
+    Declarative description of a paginated list
+
+    filters: {GET param: ORM lookup}        e.g. {'tire_filter': 'tire_id'}
+             __isnull lookups take '1'/'0'  e.g. {'empty_filter': 'mounted_tire__isnull'}
+    sorts:   {sort key: non-null model field} (id is always the tiebreaker)
+    fields:  {JSON key: values() path}      used by the JSON endpoints
+    detail_fields: {JSON key: values() path} added for the single-record endpoint
+                   that fills the edit/details modals
+    export_fields: {column header: values() path} for CSV/XLSX exports (default: fields)
+    """
+
+    def __init__(self, model, filters=None, sorts=None, default_sort='-id',
+                 fields=None, select_related=(), detail_fields=None, export_fields=None):
+        self.model = model
+        self.filters = filters or {}
+        self.sorts = {'id': 'id', **(sorts or {})}
+        self.default_sort = default_sort
+        self.fields = fields or {'id': 'id'}
+        self.select_related = select_related
+        self.detail_fields = detail_fields or {}
+        self.export_fields = export_fields or self.fields
+
+    def get_queryset(self):
+        queryset = self.model.objects.all()
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        return queryset
+
+    def get_detail(self, pk):
+        """One record as {JSON key: value} over fields + detail_fields, or None; a single query"""
+        fields = {**self.fields, **self.detail_fields}
+        row = self.model.objects.filter(pk=pk).values(*dict.fromkeys(fields.values())).first()
+        if row is None:
+            return None
+        return {key: row[path] for key, path in fields.items()}
+
+    def apply_filters(self, queryset, params, strict=False):
+        for param, lookup in self.filters.items():
+            value = params.get(param, '')
+            if value == '':
+                continue
+            if lookup.endswith('__isnull'):
+                # Django only rejects a non-bool isnull value when the query is compiled
+                if value not in ('0', '1'):
+                    if strict:
+                        raise InvalidListQuery(f'Invalid value for {param}: {value}')
+                    continue
+                value = value == '1'
+            try:
+                queryset = queryset.filter(**{lookup: value})
+            except (ValueError, TypeError, ValidationError):
+                if strict:
+                    raise InvalidListQuery(f'Invalid value for {param}: {value}')
+        return queryset
+
+    def resolve_sort(self, value, strict=False):
+        """Return (sort key, field, descending) for a `sort` param such as '-purchase_date'"""
+        value = value or self.default_sort
+        descending = value.startswith('-')
+        key = value.lstrip('-')
+        if key not in self.sorts:
+            if strict:
+                raise InvalidListQuery(f'Unknown sort: {value}')
+            return self.resolve_sort(self.default_sort)
+        return value, self.sorts[key], descending
+
+
+def _cursor_value(value):
+    # DjangoJSONEncoder cuts datetimes to milliseconds; a truncated key makes the keyset
+    # predicate repeat or skip rows, so datetimes keep their microseconds
+    if isinstance(value, datetime.datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, (list, tuple)):
+        return [_cursor_value(item) for item in value]
+    return value
+
+
+def _parse_cursor_value(value):
+    if isinstance(value, dict):
+        return datetime.datetime.fromisoformat(value['dt'])
+    if isinstance(value, list):
+        return [_parse_cursor_value(item) for item in value]
+    return value
+
+
+def encode_cursor(value, pk, direction):
+    payload = json.dumps({'v': _cursor_value(value), 'id': pk, 'd': direction}, cls=DjangoJSONEncoder)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return _parse_cursor_value(payload['v']), int(payload['id']), payload['d']
+    except (ValueError, KeyError, TypeError):
+        raise InvalidListQuery('Malformed cursor')
+
+
+def parse_page_size(value, strict=False):
+    if not value:
+        return DEFAULT_PAGE_SIZE
+    try:
+        page_size = int(value)
+    except (TypeError, ValueError):
+        if strict:
+            raise InvalidListQuery(f'Invalid page_size: {value}')
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def keyset_filter(field, descending, value, pk, forward):
+    """Rows strictly after (value, pk) in the requested direction"""
+    after = descending == forward  # walking towards smaller keys
+    op = 'lt' if after else 'gt'
+    if field == 'id':
+        return Q(**{f'id__{op}': pk})
+    return Q(**{f'{field}__{op}': value}) | Q(**{field: value, f'id__{op}': pk})
+
+
+class CursorPage:
+    """One window of a keyset-paginated list"""
+
+    def __init__(self, spec, queryset, object_list, params, sort, page_size,
+                 next_cursor, previous_cursor):
+        self.spec = spec
+        self.queryset = queryset
+        self.object_list = object_list
+        self.params = params
+        self.sort = sort
+        self.page_size = page_size
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @cached_property
+    def total_count(self):
+        """COUNT(*) of the filtered list; only computed when a template or client asks for it"""
+        return self.queryset.count()
+
+    def _query(self, cursor):
+        params = self.params.copy()
+        params.pop('cursor', None)
+        if cursor:
+            params['cursor'] = cursor
+        return params.urlencode()
+
+    @property
+    def next_query(self):
+        return self._query(self.next_cursor)
+
+    @property
+    def previous_query(self):
+        return self._query(self.previous_cursor)
+
+    @property
+    def first_query(self):
+        return self._query(None)
+
+
+def _row_value(row, field):
+    if isinstance(row, dict):
+        return row[field]
+    return getattr(row, field)
+
+
+def paginate(spec, params, strict=False, values=False):
+    """
+    Apply the spec's filters/sort to its queryset and return one CursorPage
+    params: request.GET (or any QueryDict); recognises `sort`, `cursor` and `page_size`
+    values=True returns dict rows shaped by spec.fields instead of model instances
+    """
+    queryset = spec.apply_filters(spec.get_queryset(), params, strict=strict)
+    sort, field, descending = spec.resolve_sort(params.get('sort'), strict=strict)
+    page_size = parse_page_size(params.get('page_size'), strict=strict)
+
+    cursor = params.get('cursor')
+    forward = True
+    window = queryset
+    if cursor:
+        try:
+            value, pk, direction = decode_cursor(cursor)
+        except InvalidListQuery:
+            if strict:
+                raise
+            cursor = None
+        else:
+            forward = direction != 'prev'
+            window = window.filter(keyset_filter(field, descending, value, pk, forward))
+
+    walk_descending = descending == forward
+    prefix = '-' if walk_descending else ''
+    ordering = [f'{prefix}{field}', f'{prefix}id'] if field != 'id' else [f'{prefix}id']
+    window = window.order_by(*ordering)
+
+    if values:
+        paths = list(dict.fromkeys([*spec.fields.values(), field, 'id']))
+        window = window.values(*paths)
+
+    rows = list(window[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if not forward:
+        rows.reverse()
+
+    next_cursor = previous_cursor = None
+    if rows:
+        first, last = rows[0], rows[-1]
+        if (forward and has_more) or (not forward and cursor):
+            next_cursor = encode_cursor(_row_value(last, field), _row_value(last, 'id'), 'next')
+        if (forward and cursor) or (not forward and has_more):
+            previous_cursor = encode_cursor(_row_value(first, field), _row_value(first, 'id'), 'prev')
+
+    if values:
+        rows = [{key: row[path] for key, path in spec.fields.items()} for row in rows]
+
+    return CursorPage(
+        spec, queryset, rows, params, sort, page_size, next_cursor, previous_cursor,
+    )
@@ -0,0 +1,178 @@
+# tires/services/position_layouts.py
+"""
+TirePosition rows from a vehicle's tire_configuration, for one vehicle or a fleet
+
+Layouts (case-insensitive, optional "+N" spares suffix)
+  2-4-4+1      tires per axle, front to back: 2 = single wheels, 4 = duals; an axle
+               type letter may follow the count (S steering, D drive, T trailer,
+               L liftable), e.g. 2S-4D-4L
+  6x4, 8x4+1   drive formula: wheel hubs x driven hubs; steering axle(s) at the
+               front on single wheels, the driven axles last, other axles liftable
+  10 wheels    a tire count: a steering axle, then dual axles
+Anything else (a tire size such as 12R22.5) falls back to the vehicle's
+number_of_or_tires / number_of_sp_tires counts
+
+Positions follow the hand-entered data: Front Left/Right on axle 1, "Axle N Left
+Outer ... Right Outer" on duals, spares on axle 0; tire_order runs front to back
+Generation only adds missing (axle_number, wheel_number) slots, so it is
+idempotent and never touches a position that may hold a tire or history
+"""
+
+import re
+
+from django.db import transaction
+
+from tires.models import TirePosition
+
+from .bulk_sql import batched
+
+AXLE_CODES = {'S': 'STEERING', 'D': 'DRIVE', 'T': 'TRAILER', 'L': 'LIFTABLE'}
+WHEEL_SIDES = {
+    2: ('Left', 'Right'),
+    4: ('Left Outer', 'Left Inner', 'Right Inner', 'Right Outer'),
+}
+MAX_AXLES = 12
+MAX_SPARES = 4
+SPARE_AXLE = 0
+
+AXLE_LIST = re.compile(r'^(\d+[SDTL]?)([-\s]+\d+[SDTL]?)*$')
+DRIVE_FORMULA = re.compile(r'^(\d+)\s*X\s*(\d+)$')
+TIRE_COUNT = re.compile(r'^(\d+)(\s*(WHEELS?|TIRES?))?$')
+SPARES = re.compile(r'\+\s*(\d+)\s*$')
+
+
+class InvalidLayout(ValueError):
+    pass
+
+
+def default_axle_type(axle_number, vehicle_type):
+    if vehicle_type == 'TRAILER':
+        return 'TRAILER'
+    return 'STEERING' if axle_number == 1 else 'DRIVE'
+
+
+def axles_from_count(count, vehicle_type):
+    """A steering axle on single wheels (none on trailers), then duals; an odd pair ends on singles"""
+    if count < 2 or count % 2:
+        raise InvalidLayout(f'{count} tires cannot be laid out on axles')
+    tires = []
+    if vehicle_type != 'TRAILER':
+        tires.append(2)
+        count -= 2
+    tires += [4] * (count // 4) + [2] * (count % 4 // 2)
+    return [(number, default_axle_type(axle, vehicle_type)) for axle, number in enumerate(tires, start=1)]
+
+
+def axles_from_formula(hubs, driven, vehicle_type):
+    axle_count, driven_count = hubs // 2, driven // 2
+    if hubs % 2 or driven % 2 or not 1 <= axle_count <= MAX_AXLES or not 1 <= driven_count <= axle_count:
+        raise InvalidLayout(f'{hubs}x{driven} is not a drive formula')
+    steering = 2 if axle_count >= 4 else 1
+    rear_tires = 2 if vehicle_type == 'VAN' else 4
+    axles = []
+    for axle in range(1, axle_count + 1):
+        if axle <= steering:
+            axles.append((2, 'STEERING'))
+        else:
+            axles.append((rear_tires, 'DRIVE' if axle > axle_count - driven_count else 'LIFTABLE'))
+    return axles
+
+
+def parse_layout(configuration, vehicle_type=None, default_tires=0, default_spares=0):
+    """
+    ([(tires, axle_type) per axle, front first], spares) for a tire_configuration
+    Raises InvalidLayout when neither the configuration nor the default counts give one
+    """
+    text = (configuration or '').strip().upper()
+    spares = default_spares
+    match = SPARES.search(text)
+    if match:
+        spares = int(match.group(1))
+        text = text[:match.start()].strip()
+
+    if TIRE_COUNT.match(text):
+        axles = axles_from_count(int(TIRE_COUNT.match(text).group(1)), vehicle_type)
+    elif AXLE_LIST.match(text):
+        axles = []
+        for axle, token in enumerate(re.split(r'[-\s]+', text), start=1):
+            number, code = int(token.rstrip('SDTL')), token[-1]
+            if number not in WHEEL_SIDES:
+                raise InvalidLayout(f'axle {axle}: {number} tires (use 2 for singles or 4 for duals)')
+            axles.append((number, AXLE_CODES.get(code) or default_axle_type(axle, vehicle_type)))
+    elif DRIVE_FORMULA.match(text):
+        hubs, driven = DRIVE_FORMULA.match(text).groups()
+        axles = axles_from_formula(int(hubs), int(driven), vehicle_type)
+    elif default_tires:
+        axles = axles_from_count(default_tires, vehicle_type)
+    else:
+        raise InvalidLayout(
+            f'"{configuration}" is not a layout (e.g. 2-4-4+1 or 6x4+1) and the vehicle has no tire count'
+        )
+
+    if len(axles) > MAX_AXLES:
+        raise InvalidLayout(f'{len(axles)} axles (at most {MAX_AXLES})')
+    if spares > MAX_SPARES:
+        raise InvalidLayout(f'{spares} spares (at most {MAX_SPARES})')
+    return axles, spares
+
+
+def layout_positions(axles, spares):
+    """(position_name, axle_number, wheel_number, axle_type, tire_order, is_spare) for a parsed layout"""
+    positions = []
+    for axle, (tires, axle_type) in enumerate(axles, start=1):
+        prefix = 'Front' if axle == 1 else f'Axle {axle}'
+        for wheel, side in enumerate(WHEEL_SIDES[tires], start=1):
+            positions.append((f'{prefix} {side}', axle, wheel, axle_type))
+    spare_type = axles[0][1] if axles else 'DRIVE'
+    for wheel in range(1, spares + 1):
+        positions.append(('Spare' if wheel == 1 else f'Spare {wheel}', SPARE_AXLE, wheel, spare_type))
+    return [(*position, order, position[1] == SPARE_AXLE) for order, position in enumerate(positions, start=1)]
+
+
+def vehicle_layout(vehicle, layout=None):
+    """Parsed layout of a vehicle; `layout` overrides its tire_configuration"""
+    return parse_layout(
+        layout or vehicle.tire_configuration, vehicle.vehicle_type,
+        default_tires=0 if layout else vehicle.number_of_or_tires,
+        default_spares=0 if layout else vehicle.number_of_sp_tires,
+    )
+
+
+def generate_positions(vehicles, layout=None, dry_run=False):
+    """
+    Create the missing positions of every vehicle in one transaction
+    Returns {'created': n, 'existing': n, 'vehicles': vehicles given new positions,
+    'errors': {license_plate: message}}; vehicles whose layout cannot be read are skipped
+    """
+    vehicles = list(vehicles)
+    result = {'created': 0, 'existing': 0, 'vehicles': 0, 'errors': {}}
+    planned = {}
+    for vehicle in vehicles:
+        try:
+            planned[vehicle.id] = layout_positions(*vehicle_layout(vehicle, layout))
+        except InvalidLayout as e:
+            result['errors'][vehicle.license_plate] = str(e)
+
+    existing = set()
+    for batch in batched(planned):
+        existing.update(TirePosition.objects.filter(vehicle_id__in=batch).values_list(
+            'vehicle_id', 'axle_number', 'wheel_number'))
+
+    missing = []
+    for vehicle_id, positions in planned.items():
+        new = [
+            TirePosition(vehicle_id=vehicle_id, position_name=name, axle_number=axle, wheel_number=wheel,
+                         axle_type=axle_type, tire_order=order, is_spare=is_spare)
+            for name, axle, wheel, axle_type, order, is_spare in positions
+            if (vehicle_id, axle, wheel) not in existing
+        ]
+        result['existing'] += len(positions) - len(new)
+        result['vehicles'] += bool(new)
+        missing += new
+
+    result['created'] = len(missing)
+    if missing and not dry_run:
+        with transaction.atomic():
+            # A concurrent run may have added some slots since they were read: skip those
+            TirePosition.objects.bulk_create(missing, batch_size=500, ignore_conflicts=True)
+    return result
@@ -0,0 +1,123 @@
+# tires/services/query_plans.py
+"""
+Registry of hot queries and the indexes their plans are expected to use
+`manage.py check --database default` explains each one and reports a
+full table scan, a temporary sort or a missing expected index
+"""
+
+from django.db import DatabaseError, connections, transaction
+from django.db.models import Q
+
+from tires.models import ImportStaging, Tire, TireAssignment, TireInspection, TirePosition, WorkOrder
+
+
+class HotQuery:
+    """
+    A query on a hot path
+    build: callable returning the queryset (parameter values are placeholders)
+    index: name of the index the plan must use, or None when any index will do
+    """
+
+    def __init__(self, name, build, index=None):
+        self.name = name
+        self.build = build
+        self.index = index
+
+
+HOT_QUERIES = [
+    HotQuery(
+        'latest_inspection',
+        lambda: TireInspection.objects.filter(tire_id=1).order_by('-inspection_odometer', '-id').values('id')[:1],
+        index='insp_tire_odometer_idx',
+    ),
+    HotQuery(
+        'inspection_history',
+        lambda: TireInspection.objects.filter(tire_id__gte=1, tire_id__lte=1000)
+        .values_list('id', 'tire_id', 'inspection_odometer'),
+        index='insp_tire_odometer_idx',
+    ),
+    HotQuery(
+        'tire_assignments',
+        lambda: TireAssignment.objects.filter(tire_id=1).order_by('assignment_date', 'id'),
+        index='assign_tire_date_idx',
+    ),
+    HotQuery(
+        'empty_positions',
+        lambda: TirePosition.objects.filter(vehicle_id=1, mounted_tire__isnull=True),
+        index='pos_empty_vehicle_idx',
+    ),
+    HotQuery(
+        'mounted_positions',
+        lambda: TirePosition.objects.filter(mounted_tire__isnull=False).order_by('vehicle_id', 'id').values('id'),
+        index='pos_mounted_vehicle_idx',
+    ),
+    HotQuery(
+        'open_work_orders',
+        lambda: WorkOrder.objects.filter(Q(status='OPENED') | Q(status='PENDING')),
+        index='wo_status_vehicle_idx',
+    ),
+    HotQuery(
+        'vehicle_open_work_order',
+        lambda: WorkOrder.objects.filter(vehicle_id=1, status='OPENED'),
+        index='wo_status_vehicle_idx',
+    ),
+    HotQuery(
+        'tires_by_status',
+        lambda: Tire.objects.filter(status_id=1).order_by('id'),
+    ),
+    HotQuery(
+        'staged_rows',
+        lambda: ImportStaging.objects.filter(SESSION_ID='session').order_by('ROW_NUMBER'),
+        index='staging_session_row_idx',
+    ),
+]
+
+
+def explain(queryset, using='default'):
+    """Query plan text; on PostgreSQL sequential scans are disabled so only a missing index shows one"""
+    vendor = connections[using].vendor
+    queryset = queryset.using(using)
+    if vendor == 'postgresql':
+        with transaction.atomic(using=using):
+            with connections[using].cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            return queryset.explain()
+    return queryset.explain()
+
+
+def plan_problems(plan, vendor):
+    """Full scans and temporary sorts found in a plan"""
+    problems = []
+    for line in plan.splitlines():
+        if vendor == 'sqlite':
+            # "<id> <parent> 0 SCAN tires_workorder"; "SCAN ... USING [COVERING] INDEX" walks an index only
+            detail = line.split(' ', 3)[-1].strip()
+            if detail.startswith('SCAN ') and ' USING ' not in detail:
+                problems.append(f'full scan ({detail})')
+            elif detail.startswith('USE TEMP B-TREE'):
+                problems.append(f'temporary sort ({detail})')
+        elif vendor == 'postgresql' and 'Seq Scan on' in line:
+            problems.append(f'full scan ({line.strip()})')
+    return problems
+
+
+def check_hot_queries(using='default'):
+    """
+    Explain every registered hot query; returns [(name, problem)]
+    Vendors other than SQLite/PostgreSQL are skipped, as are unmigrated databases
+    """
+    vendor = connections[using].vendor
+    if vendor not in ('sqlite', 'postgresql'):
+        return []
+
+    found = []
+    for query in HOT_QUERIES:
+        try:
+            plan = explain(query.build(), using)
+        except DatabaseError:
+            return []
+        for problem in plan_problems(plan, vendor):
+            found.append((query.name, problem))
+        if query.index and query.index not in plan:
+            found.append((query.name, f'does not use index {query.index}'))
+    return found
@@ -0,0 +1,143 @@
+# tires/services/reference_data.py
+"""
+Cached snapshots of the small reference tables (statuses, patterns, service types,
+wear types, suppliers, employees)
+
+Each table has a version counter in the Django cache, bumped by tires/signals.py
+after every committed save/delete. A process keeps its snapshot until the shared
+version moves, so a lookup costs one cache read instead of a query
+Queryset update()/bulk_create() skip signals: call bump_version() after those
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from tires.models import Employee, ServiceType, Supplier, TirePattern, TireStatus, TireWearType
+
+# model -> name/code fields indexed case-insensitively
+REFERENCE_MODELS = {
+    TireStatus: ('status_name',),
+    TirePattern: ('pattern_code',),
+    ServiceType: ('service_name',),
+    TireWearType: ('name',),
+    Supplier: ('supplier_name',),
+    Employee: ('employment_code',),
+}
+
+SNAPSHOT_TIMEOUT = 24 * 60 * 60  # old versions simply expire
+
+_local = {}  # model label -> (version, ReferenceTable)
+
+
+def normalize_key(value):
+    return str(value).strip().lower()
+
+
+class ReferenceTable:
+    """
+    One table's rows as values() dicts ordered by id
+    by_id:   {id: row}
+    indexes: {field: {normalized name/code: row}} for the model's REFERENCE_MODELS fields
+    """
+
+    def __init__(self, model, rows):
+        self.model = model
+        self.rows = rows
+        self.by_id = {row['id']: row for row in rows}
+        self.indexes = {
+            field: {normalize_key(row[field]): row for row in rows}
+            for field in REFERENCE_MODELS.get(model, ())
+        }
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def get(self, pk):
+        try:
+            return self.by_id.get(int(pk))
+        except (TypeError, ValueError):
+            return None
+
+    def lookup(self, field, key):
+        """Row whose `field` matches key (case-insensitive), or None"""
+        return self.indexes[field].get(normalize_key(key))
+
+    def lookup_key_or_id(self, field, key):
+        """Row by name/code, falling back to a numeric id"""
+        row = self.lookup(field, key)
+        if row is None and str(key).strip().isdigit():
+            row = self.get(key)
+        return row
+
+    def ids(self):
+        return set(self.by_id)
+
+    def first_id(self):
+        return self.rows[0]['id'] if self.rows else None
+
+    def sorted_by(self, *fields):
+        def sort_key(row):
+            return tuple(
+                row[field].lower() if isinstance(row[field], str) else row[field]
+                for field in fields
+            )
+        return sorted(self.rows, key=sort_key)
+
+
+def reference_cache():
+    return caches[getattr(settings, 'REFERENCE_DATA_CACHE', 'default')]
+
+
+def version_key(model):
+    return f'refdata:{model._meta.label_lower}:version'
+
+
+def snapshot_key(model, version):
+    return f'refdata:{model._meta.label_lower}:{version}'
+
+
+def fresh_version():
+    # Never reuses a number an evicted counter may have had
+    return time.time_ns()
+
+
+def current_version(model):
+    cache = reference_cache()
+    version = cache.get(version_key(model))
+    if version is None:
+        cache.add(version_key(model), fresh_version(), timeout=None)
+        version = cache.get(version_key(model))
+    return version
+
+
+def bump_version(model):
+    """Invalidate every process's snapshot of `model`"""
+    cache = reference_cache()
+    try:
+        cache.incr(version_key(model))
+    except ValueError:
+        cache.set(version_key(model), fresh_version(), timeout=None)
+    _local.pop(model._meta.label_lower, None)
+
+
+def reference_table(model):
+    """The cached ReferenceTable of a REFERENCE_MODELS model"""
+    version = current_version(model)
+    label = model._meta.label_lower
+    local = _local.get(label)
+    if local is not None and local[0] == version:
+        return local[1]
+
+    cache = reference_cache()
+    rows = cache.get(snapshot_key(model, version))
+    if rows is None:
+        rows = list(model.objects.order_by('id').values())
+        cache.set(snapshot_key(model, version), rows, timeout=SNAPSHOT_TIMEOUT)
+    table = ReferenceTable(model, rows)
+    _local[label] = (version, table)
+    return table
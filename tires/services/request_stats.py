@@ -0,0 +1,127 @@
+# tires/services/request_stats.py
+"""
+Per-request query/latency measurements and rolling per-view aggregates
+Filled by tires.middleware.RequestStatsMiddleware; aggregates live in this
+process's memory (one set per worker) and are shown on the staff stats page
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+DEFAULT_QUERY_BUDGET = 30
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r'\s+')
+
+
+def normalize_sql(sql):
+    """SQL shape: literals and IN-lists collapsed, so N+1 repeats compare equal"""
+    sql = _IN_LIST.sub('IN (...)', sql)
+    sql = _LITERAL.sub('?', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+def query_budget(view_name):
+    """Max queries for a view: REQUEST_QUERY_BUDGETS[view] or REQUEST_QUERY_BUDGET"""
+    budgets = getattr(settings, 'REQUEST_QUERY_BUDGETS', {})
+    return budgets.get(view_name, getattr(settings, 'REQUEST_QUERY_BUDGET', DEFAULT_QUERY_BUDGET))
+
+
+class QueryRecorder:
+    """connection.execute_wrapper(): times every query of one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+            self.shapes[normalize_sql(sql)] += 1
+
+    def duplicates(self):
+        """Queries beyond the first of each repeated shape, and the most repeated shape"""
+        repeated = {shape: count for shape, count in self.shapes.items() if count > 1}
+        worst = max(repeated.items(), key=lambda item: item[1], default=(None, 0))
+        return sum(count - 1 for count in repeated.values()), worst
+
+
+class ViewStats:
+    def __init__(self, view_name):
+        self.view_name = view_name
+        self.requests = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.total_queries = 0
+        self.max_queries = 0
+        self.total_sql_ms = 0.0
+        self.duplicate_queries = 0
+        self.over_budget = 0
+        self.worst_duplicate = None  # (normalized SQL, times in one request)
+
+    def add(self, sample):
+        self.requests += 1
+        self.total_ms += sample['ms']
+        self.max_ms = max(self.max_ms, sample['ms'])
+        self.total_queries += sample['queries']
+        self.max_queries = max(self.max_queries, sample['queries'])
+        self.total_sql_ms += sample['sql_ms']
+        self.duplicate_queries += sample['duplicates']
+        self.over_budget += sample['over_budget']
+        shape, times = sample['worst_duplicate']
+        if shape and (self.worst_duplicate is None or times > self.worst_duplicate[1]):
+            self.worst_duplicate = (shape, times)
+
+    def as_dict(self):
+        requests = self.requests or 1
+        return {
+            'view_name': self.view_name,
+            'requests': self.requests,
+            'avg_ms': self.total_ms / requests,
+            'max_ms': self.max_ms,
+            'avg_queries': self.total_queries / requests,
+            'max_queries': self.max_queries,
+            'avg_sql_ms': self.total_sql_ms / requests,
+            'duplicate_queries': self.duplicate_queries,
+            'over_budget': self.over_budget,
+            'budget': query_budget(self.view_name),
+            'worst_duplicate': self.worst_duplicate,
+        }
+
+
+class RequestStats:
+    """Rolling aggregates per view name, since process start or the last reset()"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+        self.since = time.time()
+
+    def record(self, sample):
+        with self._lock:
+            stats = self._views.get(sample['view'])
+            if stats is None:
+                stats = self._views[sample['view']] = ViewStats(sample['view'])
+            stats.add(sample)
+
+    def snapshot(self):
+        with self._lock:
+            return [stats.as_dict() for stats in self._views.values()]
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+            self.since = time.time()
+
+
+request_stats = RequestStats()
@@ -0,0 +1,310 @@
+# tires/services/rotations.py
+"""
+Tire rotations: every move, mount, discard and swap of one work order's vehicle
+validated together against the vehicle's occupancy and applied in one transaction
+
+The vehicle's positions and the tires involved are locked once; the moves are
+checked as a whole (a position emptied by one move may be filled by another, so
+swaps need no temporary removal) and written with bulk_create/bulk_update
+
+Payload
+  {
+    "work_order_id": 7, "vehicle_id": 12,                     # vehicle_id optional, must match the order
+    "assignment_date": "2026-10-18", "odometer": 154000,      # default: today, the order's odometer
+    "moves": [
+      {"from_position_id": 101, "to_position_id": 104},               # move (tire_id optional, checked)
+      {"tire_id": 41, "to_position_id": 101},                         # mount an unmounted tire
+      {"from_position_id": 105, "discard": true, "reason": "Cut"},    # discard
+      ...                                                             # optional: inspection_id, notes, reason
+    ],
+    "swaps": [[102, 103], ...]                                # exchange the tires of two positions
+  }
+"""
+
+from django.db import transaction
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from tires.models import Tire, TireAssignment, TireInspection, TirePosition, TireStatus, WorkOrder
+
+from .batch_inspections import parse_int
+from .cost_rollups import inspections_moving, months_changed
+from .dashboard import tires_moved
+from .reference_data import reference_table
+from .summary_counters import SUMMARY_COUNTERS
+
+MAX_MOVES = 200
+DISCARDED = 'DISCARDED'
+MOUNTED = 'MOUNTED'
+READY = 'READY'
+
+
+class InvalidRotation(ValueError):
+    """Raised with every validation error of a rotation; nothing is written"""
+
+    def __init__(self, errors):
+        super().__init__('; '.join(errors))
+        self.errors = errors
+
+
+def status_id(name, description):
+    row = reference_table(TireStatus).lookup('status_name', name)
+    if row is not None:
+        return row['id']
+    return TireStatus.objects.get_or_create(status_name=name, defaults={'description': description})[0].id
+
+
+def optional_id(entry, key, errors, where):
+    value = entry.get(key)
+    if value in (None, ''):
+        return None
+    number = parse_int(value)
+    if number is None:
+        errors.append(f'{where}: {key} must be an id')
+    return number
+
+
+def parse_moves(payload, occupancy, errors):
+    """
+    Normalized moves {tire_id, from, to, discard, reason, notes, inspection_id, where}
+    from the payload's moves and swaps; swaps read the tires from `occupancy`
+    """
+    moves = payload.get('moves') or []
+    swaps = payload.get('swaps') or []
+    if not isinstance(moves, list) or not isinstance(swaps, list):
+        errors.append('moves and swaps must be lists')
+        return []
+    if not moves and not swaps:
+        errors.append('moves or swaps must be a non-empty list')
+    if len(moves) + 2 * len(swaps) > MAX_MOVES:
+        errors.append(f'at most {MAX_MOVES} moves per rotation')
+        return []
+
+    parsed = []
+    for m, entry in enumerate(moves):
+        where = f'moves[{m}]'
+        if not isinstance(entry, dict):
+            errors.append(f'{where}: must be an object')
+            continue
+        parsed.append({
+            'where': where,
+            'tire_id': optional_id(entry, 'tire_id', errors, where),
+            'from': optional_id(entry, 'from_position_id', errors, where),
+            'to': optional_id(entry, 'to_position_id', errors, where),
+            'discard': entry.get('discard') is True,
+            'reason': str(entry.get('reason') or ''),
+            'notes': str(entry.get('notes') or ''),
+            'inspection_id': optional_id(entry, 'inspection_id', errors, where),
+        })
+
+    for s, pair in enumerate(swaps):
+        where = f'swaps[{s}]'
+        pair = [parse_int(value) for value in pair] if isinstance(pair, list) else []
+        if len(pair) != 2 or None in pair:
+            errors.append(f'{where}: must be a pair of position ids')
+            continue
+        first, second = pair
+        for source, target in ((first, second), (second, first)):
+            parsed.append({
+                'where': where, 'tire_id': occupancy.get(source), 'from': source, 'to': target,
+                'discard': False, 'reason': 'Rotation', 'notes': '', 'inspection_id': None,
+            })
+    return parsed
+
+
+def validate_moves(moves, positions, occupancy, tires, inspections):
+    """Check the moves as one change of the vehicle's occupancy; returns the errors"""
+    errors = []
+    vacated, filled, moved = set(), set(), set()
+    for move in moves:
+        where, source, target, tire_id = move['where'], move['from'], move['to'], move['tire_id']
+
+        if source is not None:
+            if source not in positions:
+                errors.append(f'{where}: position {source} is not on this vehicle')
+            elif occupancy[source] is None:
+                errors.append(f'{where}: position {source} is empty')
+            elif tire_id is not None and tire_id != occupancy[source]:
+                errors.append(f'{where}: tire {tire_id} is not in position {source}')
+            else:
+                move['tire_id'] = tire_id = occupancy[source]
+            if source in vacated:
+                errors.append(f'{where}: position {source} is emptied twice')
+            vacated.add(source)
+        elif tire_id is None:
+            errors.append(f'{where}: tire_id or from_position_id is required')
+        elif tire_id not in tires:
+            errors.append(f'{where}: tire {tire_id} not found')
+        elif tires[tire_id].current_position_id is not None:
+            errors.append(f'{where}: tire {tire_id} is mounted elsewhere; move it from its position')
+
+        if move['discard']:
+            if source is None:
+                errors.append(f'{where}: a discard needs from_position_id')
+            if target is not None:
+                errors.append(f'{where}: a discard has no to_position_id')
+            if not move['reason'].strip():
+                errors.append(f'{where}: a discard needs a reason')
+        elif target is None:
+            errors.append(f'{where}: to_position_id is required')
+        else:
+            if target not in positions:
+                errors.append(f'{where}: position {target} is not on this vehicle')
+            if target == source:
+                errors.append(f'{where}: tire stays in position {target}')
+            if target in filled:
+                errors.append(f'{where}: position {target} is filled twice')
+            filled.add(target)
+
+        if tire_id is not None:
+            if tire_id in moved:
+                errors.append(f'{where}: tire {tire_id} is moved twice')
+            moved.add(tire_id)
+
+        inspection_id = move['inspection_id']
+        if inspection_id is not None:
+            inspection = inspections.get(inspection_id)
+            if inspection is None:
+                errors.append(f'{where}: inspection {inspection_id} not found')
+            elif tire_id is not None and inspection.tire_id != tire_id:
+                errors.append(f'{where}: inspection {inspection_id} is not for tire {tire_id}')
+
+    # Targets must be free once the rotation's own removals are applied
+    for target in sorted(filled - vacated):
+        if target in occupancy and occupancy[target] is not None:
+            errors.append(f'position {target} is occupied by tire {occupancy[target]} and not emptied by this rotation')
+    return errors
+
+
+def load_rotation(payload):
+    """Locked rows and parsed moves for a payload, or raise InvalidRotation"""
+    errors = []
+    work_order_id = parse_int(payload.get('work_order_id'))
+    work_order = WorkOrder.objects.filter(id=work_order_id).first() if work_order_id is not None else None
+    if work_order is None:
+        raise InvalidRotation(['work_order_id: work order not found'])
+    vehicle_id = payload.get('vehicle_id')
+    if vehicle_id not in (None, '') and parse_int(vehicle_id) != work_order.vehicle_id:
+        errors.append(f'vehicle_id: work order {work_order.work_order_number} is for another vehicle')
+
+    odometer = payload.get('odometer')
+    odometer = work_order.current_odometer if odometer in (None, '') else parse_int(odometer)
+    if odometer is None:
+        errors.append('odometer must be a non-negative integer')
+    assignment_date = payload.get('assignment_date')
+    assignment_date = timezone.localdate() if assignment_date in (None, '') else parse_date(str(assignment_date))
+    if assignment_date is None:
+        errors.append('assignment_date must be a YYYY-MM-DD date')
+
+    # One lock per table: the vehicle's positions, then every tire the moves touch
+    positions = {
+        position.id: position
+        for position in TirePosition.objects.select_for_update().filter(vehicle_id=work_order.vehicle_id)
+    }
+    occupancy = {position_id: position.mounted_tire_id for position_id, position in positions.items()}
+    moves = parse_moves(payload, occupancy, errors)
+
+    tire_ids = {move['tire_id'] for move in moves} | {
+        occupancy.get(move['from']) for move in moves if move['from'] is not None
+    }
+    tires = Tire.objects.select_for_update().filter(id__in=tire_ids - {None})
+    tires = {tire.id: tire for tire in tires}
+    inspection_ids = {move['inspection_id'] for move in moves} - {None}
+    inspections = {inspection.id: inspection for inspection in TireInspection.objects.filter(id__in=inspection_ids)}
+
+    errors += validate_moves(moves, positions, occupancy, tires, inspections)
+    if errors:
+        raise InvalidRotation(errors)
+    return {
+        'work_order': work_order, 'odometer': odometer, 'assignment_date': assignment_date,
+        'moves': moves, 'positions': positions, 'tires': tires, 'inspections': inspections,
+    }
+
+
+def apply_rotation(payload):
+    """
+    Validate and apply a rotation atomically
+    Returns the created assignments; raises InvalidRotation without writing anything
+    """
+    with transaction.atomic():
+        rotation = load_rotation(payload)
+        work_order, moves = rotation['work_order'], rotation['moves']
+        positions, tires, inspections = rotation['positions'], rotation['tires'], rotation['inspections']
+        discarded_id = mounted_id = None
+        ready = reference_table(TireStatus).lookup('status_name', READY)
+
+        assignments = []
+        changed_positions = {}
+        status_changes = []
+        history = []
+        for move in moves:
+            tire = tires[move['tire_id']]
+            source = positions.get(move['from'])
+            target = positions.get(move['to'])
+            assignments.append(TireAssignment(
+                tire=tire,
+                tire_position_from=source,
+                tire_position_to=target,
+                work_order=work_order,
+                inspection_id=move['inspection_id'],
+                assignment_date=rotation['assignment_date'],
+                start_odometer=rotation['odometer'],
+                reason_for_removal=move['reason'],
+                notes=move['notes'],
+                is_discard_operation=move['discard'],
+            ))
+
+            # Empty every source first, so a position both emptied and filled ends up filled
+            if source is not None and changed_positions.get(source.id) is None:
+                changed_positions[source.id] = None
+            old_state = (tire.status_id, tire.purchase_cost)
+            if move['discard']:
+                discarded_id = discarded_id or status_id(DISCARDED, 'Tire has been discarded')
+                tire.status_id = discarded_id
+                tire.current_position = None
+            else:
+                if ready is not None and tire.status_id == ready['id']:
+                    mounted_id = mounted_id or status_id(MOUNTED, 'Currently mounted')
+                    tire.status_id = mounted_id
+                tire.current_position = target
+                changed_positions[target.id] = tire
+                if source is not None:
+                    history.append((tire.id, source.id, target.id))
+                inspection = inspections.get(move['inspection_id'])
+                if inspection is not None:
+                    inspection.position = target
+                    inspection.work_order = work_order
+            if tire.status_id != old_state[0]:
+                status_changes.append((old_state, (tire.status_id, tire.purchase_cost)))
+
+        for position_id, tire in changed_positions.items():
+            positions[position_id].mounted_tire = tire
+
+        created = TireAssignment.objects.bulk_create(assignments)
+        TirePosition.objects.bulk_update([positions[position_id] for position_id in changed_positions], ['mounted_tire'])
+        Tire.objects.bulk_update(list(tires.values()), ['current_position', 'status'])
+        if inspections:
+            TireInspection.objects.bulk_update(list(inspections.values()), ['position', 'work_order'])
+            months_changed(inspection.inspection_date for inspection in inspections.values())
+        if history:
+            # Like a single move: the tire's inspections at its old position follow it
+            moving = TireInspection.objects.filter(
+                Q(*[Q(tire_id=tire_id, position_id=source) for tire_id, source, _ in history], _connector=Q.OR)
+            )
+            inspections_moving(moving)
+            moving.update(position=Case(
+                *[When(tire_id=tire_id, position_id=source, then=Value(target)) for tire_id, source, target in history],
+                output_field=IntegerField(),
+            ))
+
+        # bulk_update skips the signals that keep the header counters and the dashboard current
+        counters = SUMMARY_COUNTERS['tires']
+        deltas = {}
+        for old_state, new_state in status_changes:
+            for name, delta in counters.deltas(old_state[:1], new_state[:1]).items():
+                deltas[name] = deltas.get(name, 0) + delta
+        tire_ids = list(tires)
+        transaction.on_commit(lambda: counters.apply(deltas))
+        transaction.on_commit(lambda: tires_moved(tire_ids, status_changes))
+    return created
@@ -0,0 +1,133 @@
+# tires/services/summary_counters.py
+"""
+Cached header counters for the list pages (active tires, open work orders, ...)
+
+A group's counters are computed together in one conditional-aggregation query and
+cached one key per counter. Saves and deletes then adjust the cached values with
+incr/decr (tires/signals.py), so reading the header costs one cache get_many
+Bulk writes skip signals: call invalidate_summary_counts() after those
+"""
+
+from django.db.models import Count, Q
+
+from tires.models import Tire, TireStatus, WorkOrder
+
+from .reference_data import normalize_key, reference_cache, reference_table
+
+COUNTER_TIMEOUT = 10 * 60  # recount now and then in case a write slipped past the signals
+
+ACTIVE_STATUS_NAMES = ('Active', 'READY', 'MOUNTED')
+OPEN_WORK_ORDER_STATUSES = ('OPENED', 'PENDING')
+
+
+def status_ids(*names):
+    """TireStatus ids for status names (case-insensitive); unknown names are ignored"""
+    index = reference_table(TireStatus).indexes['status_name']
+    return {index[key]['id'] for key in map(normalize_key, names) if key in index}
+
+
+class Counter:
+    """
+    Rows whose `field` value is in `values`
+    values: iterable, or callable returning one when it depends on reference data
+    """
+
+    def __init__(self, name, field, values):
+        self.name = name
+        self.field = field
+        self.values = values
+
+    def resolved_values(self):
+        return set(self.values() if callable(self.values) else self.values)
+
+
+class CounterGroup:
+    """
+    The counters shown on one page header
+    depends_on: reference models whose changes remap the counters (recount)
+    """
+
+    def __init__(self, name, model, counters, depends_on=()):
+        self.name = name
+        self.model = model
+        self.counters = counters
+        self.depends_on = depends_on
+        self.fields = tuple(dict.fromkeys(counter.field for counter in counters))
+
+    def key(self, counter):
+        return f'summary:{self.name}:{counter.name}'
+
+    def compute(self):
+        """All counters in one query"""
+        return self.model.objects.aggregate(**{
+            counter.name: Count('id', filter=Q(**{f'{counter.field}__in': counter.resolved_values()}))
+            for counter in self.counters
+        })
+
+    def counts(self):
+        cache = reference_cache()
+        keys = {self.key(counter): counter.name for counter in self.counters}
+        cached = cache.get_many(keys)
+        if len(cached) == len(keys):
+            return {name: cached[key] for key, name in keys.items()}
+        counts = self.compute()
+        cache.set_many({key: counts[name] for key, name in keys.items()}, timeout=COUNTER_TIMEOUT)
+        return counts
+
+    def invalidate(self):
+        reference_cache().delete_many([self.key(counter) for counter in self.counters])
+
+    def state(self, values):
+        """Counted field values from {attname: value}, or None if any of them is missing (deferred)"""
+        try:
+            return tuple(values[field] for field in self.fields)
+        except KeyError:
+            return None
+
+    def deltas(self, old_state, new_state):
+        """{counter name: +1/-1} for a row moving from old_state to new_state (None = no row)"""
+        deltas = {}
+        for counter in self.counters:
+            position = self.fields.index(counter.field)
+            values = counter.resolved_values()
+            was = old_state is not None and old_state[position] in values
+            now = new_state is not None and new_state[position] in values
+            if was != now:
+                deltas[counter.name] = 1 if now else -1
+        return deltas
+
+    def apply(self, deltas):
+        cache = reference_cache()
+        for counter in self.counters:
+            delta = deltas.get(counter.name)
+            if not delta:
+                continue
+            try:
+                cache.incr(self.key(counter), delta)
+            except ValueError:
+                pass  # not cached: the next read recounts
+
+
+SUMMARY_COUNTERS = {
+    'tires': CounterGroup('tires', Tire, [
+        Counter('active_count', 'status_id', lambda: status_ids(*ACTIVE_STATUS_NAMES)),
+        Counter('under_repair_count', 'status_id', lambda: status_ids('Under Repair')),
+        Counter('inactive_count', 'status_id', lambda: status_ids('Inactive', 'Scrap')),
+    ], depends_on=(TireStatus,)),
+    'work_orders': CounterGroup('work_orders', WorkOrder, [
+        Counter('open_count', 'status', OPEN_WORK_ORDER_STATUSES),
+        Counter('inspection_count', 'shift_type', ('INSPECTION',)),
+    ]),
+}
+
+
+def summary_counts(name):
+    """{counter name: count} for a page header"""
+    return SUMMARY_COUNTERS[name].counts()
+
+
+def invalidate_summary_counts(model):
+    """Drop the cached counters over `model` (after bulk writes that skip signals)"""
+    for group in SUMMARY_COUNTERS.values():
+        if group.model is model or model in group.depends_on:
+            group.invalidate()
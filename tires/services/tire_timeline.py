@@ -0,0 +1,148 @@
+# tires/services/tire_timeline.py
+"""
+One tire's history: its assignments, inspections and maintenance records as a
+single stream, newest first, read with one UNION ALL query per page
+
+Each arm is filtered on tire_id and served by a (tire, date, id) index; pages are
+keyset-paginated on (date, odometer, kind rank, id), so a page costs the same
+however long the history is
+"""
+
+import datetime
+
+from django.db.models import BooleanField, CharField, DateField, DecimalField, F, IntegerField, Q, Value
+from django.db.models.functions import Coalesce
+
+from tires.models import MaintenanceRecord, TireAssignment, TireInspection
+
+from .pagination import InvalidListQuery, decode_cursor, encode_cursor, parse_page_size
+
+# Undated (legacy) inspections sort as the oldest events
+UNDATED = datetime.date.min
+
+# Output columns, in SELECT order (every arm must produce all of them)
+COLUMNS = {
+    'event_date': DateField(),
+    'odometer': IntegerField(),
+    'rank': IntegerField(),
+    'event_id': IntegerField(),
+    'kind': CharField(),
+    'vehicle': CharField(),
+    'position': CharField(),
+    'from_position': CharField(),
+    'work_order': CharField(),
+    'tread_depth': DecimalField(max_digits=5, decimal_places=2),
+    'pressure': DecimalField(max_digits=5, decimal_places=2),
+    'service': CharField(),
+    'cost': DecimalField(max_digits=10, decimal_places=2),
+    'discarded': BooleanField(),
+    'notes': CharField(),
+}
+
+# kind: (model, rank, {column: expression}); rank orders events on the same day and odometer
+ARMS = {
+    'assignment': (TireAssignment, 1, {
+        'event_date': F('assignment_date'),
+        'odometer': F('start_odometer'),
+        'vehicle': Coalesce('tire_position_to__vehicle__license_plate',
+                            'tire_position_from__vehicle__license_plate'),
+        'position': F('tire_position_to__position_name'),
+        'from_position': F('tire_position_from__position_name'),
+        'work_order': F('work_order__work_order_number'),
+        'discarded': F('is_discard_operation'),
+        'notes': F('reason_for_removal'),
+    }),
+    'inspection': (TireInspection, 2, {
+        'event_date': Coalesce('inspection_date', Value(UNDATED), output_field=DateField()),
+        'odometer': F('inspection_odometer'),
+        'vehicle': F('position__vehicle__license_plate'),
+        'position': F('position__position_name'),
+        'work_order': F('work_order__work_order_number'),
+        'tread_depth': F('tread_depth'),
+        'pressure': F('pressure'),
+    }),
+    'maintenance': (MaintenanceRecord, 3, {
+        'event_date': F('service_date'),
+        'odometer': F('service_mileage'),
+        'service': F('service_type__service_name'),
+        'cost': F('cost'),
+        'notes': F('notes'),
+    }),
+}
+ORDERING = ('event_date', 'odometer', 'rank', 'event_id')
+
+
+def alias(column):
+    # Annotations may not shadow model fields (work_order, notes, ...)
+    return f'tl_{column}'
+
+
+def arm_queryset(kind, tire_id, after=None):
+    model, rank, expressions = ARMS[kind]
+    annotations = {}
+    for column, output_field in COLUMNS.items():
+        if column == 'rank':
+            expression = Value(rank, output_field=output_field)
+        elif column == 'event_id':
+            expression = F('id')
+        elif column == 'kind':
+            expression = Value(kind, output_field=output_field)
+        else:
+            expression = expressions.get(column, Value(None, output_field=output_field))
+        annotations[alias(column)] = expression
+    queryset = model.objects.filter(tire_id=tire_id).annotate(**annotations)
+    if after is not None:
+        queryset = queryset.filter(before(after))
+    return queryset.values(*annotations)
+
+
+def before(key):
+    """Rows that come after `key` (date, odometer, rank, id) in newest-first order"""
+    condition = Q()
+    equal = {}
+    for column, value in zip(ORDERING, key):
+        condition |= Q(**equal, **{f'{alias(column)}__lt': value})
+        equal[alias(column)] = value
+    return condition
+
+
+def cursor_key(cursor):
+    values, event_id, _ = decode_cursor(cursor)
+    try:
+        event_date, odometer, rank = values
+        return datetime.date.fromisoformat(event_date), int(odometer), int(rank), event_id
+    except (TypeError, ValueError):
+        raise InvalidListQuery('Malformed cursor')
+
+
+def tire_timeline(tire_id, cursor=None, page_size=None):
+    """
+    One page of the tire's events, newest first:
+    {'results': [{kind, id, date, odometer, ...}], 'next_cursor': str or None}
+    Raises InvalidListQuery for a malformed cursor or page size
+    """
+    page_size = parse_page_size(page_size, strict=True)
+    after = cursor_key(cursor) if cursor else None
+
+    first, *rest = [arm_queryset(kind, tire_id, after) for kind in ARMS]
+    merged = first.union(*rest, all=True).order_by(*(f'-{alias(column)}' for column in ORDERING))
+    rows = [{column: row[alias(column)] for column in COLUMNS} for row in merged[:page_size + 1]]
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor([last['event_date'], last['odometer'], last['rank']], last['event_id'], 'next')
+
+    results = []
+    for row in rows:
+        event_date = row.pop('event_date')
+        row.pop('rank')
+        results.append({
+            'kind': row.pop('kind'),
+            'id': row.pop('event_id'),
+            'date': event_date if event_date != UNDATED else None,
+            **row,
+        })
+    return {'results': results, 'next_cursor': next_cursor}
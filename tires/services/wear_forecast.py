@@ -0,0 +1,227 @@
+# tires/services/wear_forecast.py
+"""
+Tread-wear forecasts: per mounted tire, a least-squares line of tread depth against
+the km the tire has run (running sum of TireInspection.distance_travelled from the
+mounting reading, as in inspection_metrics.py), extended to the pattern's discarding
+tread depth. Vehicle odometers are not comparable once a tire has moved between
+vehicles, so they only place the result: the removal odometer is the odometer of
+the latest reading plus the km left
+
+The fits are grouped sums over flat NumPy arrays (np.bincount per tire), so a
+chunk of tires costs a few vectorized passes whatever its size. The removal
+date comes from a second fit of tire km against inspection date (km per day)
+Results replace TireWearForecast rows chunk by chunk
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+from django.utils import timezone
+
+from tires.models import Tire, TireInspection, TireWearForecast
+
+from .bulk_sql import filtered_by_ids
+from .inspection_metrics import load_assignments
+
+DEFAULT_CHUNK_SIZE = 5000  # tires per pass
+EPOCH = datetime.date(1970, 1, 1)
+MAX_FORECAST_DAYS = 36500  # removal dates are clipped to a century from the last reading
+INT_LIMIT = 2 ** 31 - 1
+
+
+# ============================================================================
+# Fitting
+# ============================================================================
+
+def grouped_fit(groups, x, y, count):
+    """
+    Least squares y = intercept + slope * x for each group 0..count-1
+    Returns (points, slope, intercept, r_squared); slope is NaN where x does not vary
+    """
+    points = np.bincount(groups, minlength=count)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x = np.bincount(groups, x, count) / points
+        mean_y = np.bincount(groups, y, count) / points
+        # Centered sums: odometers are large, raw sums of squares lose precision
+        dx = x - mean_x[groups]
+        dy = y - mean_y[groups]
+        sxx = np.bincount(groups, dx * dx, count)
+        sxy = np.bincount(groups, dx * dy, count)
+        syy = np.bincount(groups, dy * dy, count)
+        slope = np.where(sxx > 0, sxy / sxx, np.nan)
+        intercept = mean_y - slope * mean_x
+        r_squared = np.where(syy > 0, slope * sxy / syy, np.nan)
+    return points, slope, intercept, r_squared
+
+
+def forecast(tires, readings):
+    """
+    tires: DataFrame of tire_id, DTD; readings: tire_id, km, odometer, tread, day
+    (days since EPOCH, NaN when undated), oldest first within each tire
+    Returns one row per tire with readings
+    """
+    codes = pd.Index(tires['tire_id']).get_indexer(readings['tire_id'])
+    readings = readings[codes >= 0]
+    groups = codes[codes >= 0]
+    count = len(tires)
+
+    km = readings['km'].to_numpy(float)
+    tread = readings['tread'].to_numpy(float)
+    points, slope, intercept, r_squared = grouped_fit(groups, km, tread, count)
+
+    # Latest reading per tire: the last row of its group
+    last_row = np.full(count, -1)
+    np.maximum.at(last_row, groups, np.arange(len(groups)))
+    has_readings = last_row >= 0
+    last_km = np.where(has_readings, km[last_row], np.nan)
+    last_odometer = np.where(has_readings, readings['odometer'].to_numpy(float)[last_row], np.nan)
+
+    dated = ~np.isnan(readings['day'].to_numpy(float))
+    day = readings['day'].to_numpy(float)[dated]
+    _, km_per_day, _, _ = grouped_fit(groups[dated], day, km[dated], count)
+    last_day = np.full(count, -np.inf)
+    np.maximum.at(last_day, groups[dated], day)
+
+    dtd = tires['DTD'].to_numpy(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        km_left = (dtd - intercept) / slope - last_km
+        fitted = intercept + slope * last_km
+        days_left = km_left / km_per_day
+    removal_odometer = last_odometer + km_left
+
+    wearing = slope < 0
+    status = np.select(
+        [np.isnan(slope), ~wearing, km_left <= 0],
+        [TireWearForecast.INSUFFICIENT, TireWearForecast.NO_WEAR, TireWearForecast.DUE],
+        TireWearForecast.FORECAST,
+    )
+    removal_odometer = np.where(wearing, removal_odometer, np.nan).clip(-INT_LIMIT, INT_LIMIT)
+    days_left = np.where(wearing & (km_per_day > 0), days_left, np.nan).clip(-MAX_FORECAST_DAYS, MAX_FORECAST_DAYS)
+
+    result = pd.DataFrame({
+        'tire_id': tires['tire_id'].to_numpy(),
+        'status': status,
+        'readings': points,
+        'wear_rate': np.where(wearing, -slope * 10000, np.nan).clip(-99999, 99999).round(3),
+        'r_squared': r_squared,
+        'fitted_tread_depth': fitted.clip(-999, 999).round(2),
+        'DTD': dtd,
+        'last_odometer': last_odometer,
+        'last_day': last_day,
+        'km_per_day': np.where(km_per_day > 0, km_per_day, np.nan),
+        'removal_odometer': np.round(removal_odometer),
+        'removal_day': last_day + np.round(days_left),
+    })
+    return result[points > 0]
+
+
+# ============================================================================
+# Loading and storing
+# ============================================================================
+
+def load_tires(tire_range):
+    """Mounted tires only: a forecast for a tire in storage has no odometer to run on"""
+    tires = Tire.objects.filter(current_position__isnull=False)
+    records = []
+    for queryset in filtered_by_ids(tires, id_range=tire_range):
+        records.extend(queryset.values_list('id', 'pattern__initial_tread_depth', 'pattern__discarding_tread_depth'))
+    return pd.DataFrame.from_records(records, columns=['tire_id', 'ITD', 'DTD'])
+
+
+def load_readings(tires, tire_range):
+    """
+    Every inspection of the chunk, plus each tire's mounting reading (pattern ITD at
+    the first assignment), oldest first: the mounting reading, then by inspection date
+    (undated rows first), odometer and id. km is the running sum of distance_travelled
+    """
+    records = []
+    fields = ('tire_id', 'id', 'inspection_odometer', 'distance_travelled', 'tread_depth', 'inspection_date')
+    for queryset in filtered_by_ids(TireInspection.objects.all(), id_range=tire_range, field='tire_id'):
+        records.extend(queryset.values_list(*fields))
+    inspections = pd.DataFrame.from_records(
+        records, columns=['tire_id', 'id', 'odometer', 'distance', 'tread', 'date'],
+    ).assign(mount=False)
+
+    assignments = load_assignments(tire_range=tire_range)
+    mounts = (
+        assignments.dropna(subset=['start_odometer'])
+        .sort_values(['tire_id', 'assignment_date', 'id'])
+        .drop_duplicates('tire_id')
+        .merge(tires[['tire_id', 'ITD']], on='tire_id')
+        .rename(columns={'start_odometer': 'odometer', 'ITD': 'tread', 'assignment_date': 'date'})
+        .assign(distance=0, mount=True)
+    )
+    columns = ['tire_id', 'id', 'mount', 'odometer', 'distance', 'tread', 'date']
+    readings = pd.concat([inspections[columns], mounts[columns]], ignore_index=True)
+    dates = pd.to_datetime(readings['date'])
+    readings['day'] = (dates - pd.Timestamp(EPOCH)).dt.days
+    readings = readings.astype({'odometer': float, 'distance': float, 'tread': float, 'day': float})
+    readings = readings.sort_values(
+        ['tire_id', 'mount', 'day', 'odometer', 'id'], ascending=[True, False, True, True, True],
+        na_position='first', kind='mergesort',
+    )
+    readings['km'] = readings.groupby('tire_id')['distance'].cumsum()
+    return readings[['tire_id', 'km', 'odometer', 'tread', 'day']].reset_index(drop=True)
+
+
+def day_to_date(day):
+    return EPOCH + datetime.timedelta(days=int(day)) if np.isfinite(day) else None
+
+
+def finite(value, convert=float):
+    return convert(value) if np.isfinite(value) else None
+
+
+def forecast_objects(frame, computed_at):
+    for row in frame.itertuples(index=False):
+        yield TireWearForecast(
+            tire_id=int(row.tire_id),
+            status=str(row.status),
+            readings=int(row.readings),
+            wear_rate=finite(row.wear_rate),
+            r_squared=finite(row.r_squared),
+            fitted_tread_depth=finite(row.fitted_tread_depth),
+            discarding_tread_depth=row.DTD,
+            last_odometer=int(row.last_odometer),
+            last_inspection_date=day_to_date(row.last_day),
+            km_per_day=finite(row.km_per_day),
+            removal_odometer=finite(row.removal_odometer, int),
+            removal_date=day_to_date(row.removal_day),
+            computed_at=computed_at,
+        )
+
+
+def forecast_tires(tire_range, computed_at=None):
+    """
+    Replace the forecasts of the tires in the inclusive id range
+    Returns {status: tires} for the rows written
+    """
+    computed_at = computed_at or timezone.now()
+    tires = load_tires(tire_range)
+    frame = forecast(tires, load_readings(tires, tire_range)) if not tires.empty else None
+
+    with transaction.atomic():
+        TireWearForecast.objects.filter(tire_id__gte=tire_range[0], tire_id__lte=tire_range[1]).delete()
+        if frame is None or frame.empty:
+            return {}
+        TireWearForecast.objects.bulk_create(forecast_objects(frame, computed_at), batch_size=1000)
+    return frame['status'].value_counts().to_dict()
+
+
+def iter_fleet_forecast(chunk_size=DEFAULT_CHUNK_SIZE):
+    """Walk all tires in keyset chunks; yields (last_tire_id, {status: tires}) per chunk"""
+    computed_at = timezone.now()
+    last_id = 0
+    while True:
+        tire_ids = list(
+            Tire.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size]
+        )
+        if not tire_ids:
+            break
+        counts = forecast_tires((tire_ids[0], tire_ids[-1]), computed_at)
+        last_id = tire_ids[-1]
+        yield last_id, counts
+    # Tires deleted since the last run cascade; anything past the last tire is stale
+    TireWearForecast.objects.filter(tire_id__gt=last_id).delete()
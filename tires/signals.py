@@ -0,0 +1,155 @@
+# tires/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+
+from tires.models import Tire, TireInspection, TirePattern, TireStatus, Vehicle, WorkOrder
+from tires.services import cost_rollups, dashboard
+from tires.services.reference_data import REFERENCE_MODELS, bump_version
+from tires.services.summary_counters import SUMMARY_COUNTERS, invalidate_summary_counts
+
+# Dashboard parts rebuilt when a reference table they depend on changes
+DASHBOARD_PARTS = {
+    TireStatus: ('stats', 'tire_flags'),
+    TirePattern: ('tire_flags',),
+}
+
+
+def reference_data_changed(sender, **kwargs):
+    # After commit: bumping earlier lets another worker cache the pre-commit rows under the new version
+    transaction.on_commit(lambda: bump_version(sender))
+    transaction.on_commit(lambda: invalidate_summary_counts(sender))
+    if sender in DASHBOARD_PARTS:
+        transaction.on_commit(lambda: dashboard.refresh_dashboard(DASHBOARD_PARTS[sender]))
+
+
+for model in REFERENCE_MODELS:
+    post_save.connect(reference_data_changed, sender=model, dispatch_uid=f'refdata_save_{model.__name__}')
+    post_delete.connect(reference_data_changed, sender=model, dispatch_uid=f'refdata_delete_{model.__name__}')
+
+
+# Incremental counters: remember the counted fields as loaded, adjust by the change on save/delete
+
+DASHBOARD_FIELDS = {
+    Tire: ('status_id', 'purchase_cost'),
+    WorkOrder: ('status',),
+}
+
+
+def counter_groups(sender):
+    return [group for group in SUMMARY_COUNTERS.values() if group.model is sender]
+
+
+def tracked_fields(sender):
+    fields = [field for group in counter_groups(sender) for field in group.fields]
+    return tuple(dict.fromkeys(fields + list(DASHBOARD_FIELDS.get(sender, ()))))
+
+
+def loaded_values(instance, fields):
+    # Deferred fields are missing from __dict__ (reading them would cost a query)
+    return {field: instance.__dict__[field] for field in fields if field in instance.__dict__}
+
+
+def dashboard_state(sender, values):
+    """DASHBOARD_FIELDS values, or None if any of them was not loaded"""
+    try:
+        return tuple(values[field] for field in DASHBOARD_FIELDS[sender])
+    except KeyError:
+        return None
+
+
+def remember_loaded_values(sender, instance, **kwargs):
+    instance._loaded_values = loaded_values(instance, tracked_fields(sender))
+
+
+def adjust_counters(group, old_state, new_state, known=True):
+    if not known:
+        transaction.on_commit(group.invalidate)
+        return
+    deltas = group.deltas(old_state, new_state)
+    if deltas:
+        transaction.on_commit(lambda: group.apply(deltas))
+
+
+def adjust_dashboard(sender, instance, old_values, new_values):
+    """new_values is None for a delete; old_values is None for a create"""
+    old_state = dashboard_state(sender, old_values) if old_values is not None else None
+    new_state = dashboard_state(sender, new_values) if new_values is not None else None
+    known = (old_values is None or old_state is not None) and (new_values is None or new_state is not None)
+    if sender is Tire:
+        tire_id = instance.pk
+        if known:
+            transaction.on_commit(lambda: dashboard.tire_changed(tire_id, old_state, new_state))
+        else:
+            transaction.on_commit(lambda: dashboard.refresh_dashboard(('stats', 'tire_flags')))
+    elif sender is WorkOrder:
+        if known:
+            transaction.on_commit(lambda: dashboard.work_order_changed(
+                old_state and old_state[0], new_state and new_state[0],
+            ))
+        else:
+            transaction.on_commit(lambda: dashboard.refresh_dashboard(('stats', dashboard.PENDING_WORK_ORDERS)))
+
+
+def tracked_row_saved(sender, instance, created, update_fields=None, **kwargs):
+    old_values = None if created else getattr(instance, '_loaded_values', {})
+    new_values = loaded_values(instance, tracked_fields(sender))
+    changed = None if update_fields is None else {
+        sender._meta.get_field(name).attname for name in update_fields
+    }
+    for group in counter_groups(sender):
+        if changed is not None and not set(group.fields) & changed:
+            continue
+        old_state = None if created else group.state(old_values)
+        new_state = group.state(new_values)
+        adjust_counters(group, old_state, new_state, known=created or None not in (old_state, new_state))
+    if sender in DASHBOARD_FIELDS:
+        adjust_dashboard(sender, instance, old_values, new_values)
+    instance._loaded_values = new_values
+
+
+def tracked_row_deleted(sender, instance, **kwargs):
+    old_values = getattr(instance, '_loaded_values', {})
+    for group in counter_groups(sender):
+        old_state = group.state(old_values)
+        adjust_counters(group, old_state, None, known=old_state is not None)
+    if sender in DASHBOARD_FIELDS:
+        adjust_dashboard(sender, instance, old_values, None)
+
+
+for model in {group.model for group in SUMMARY_COUNTERS.values()} | set(DASHBOARD_FIELDS):
+    post_init.connect(remember_loaded_values, sender=model, dispatch_uid=f'tracked_init_{model.__name__}')
+    post_save.connect(tracked_row_saved, sender=model, dispatch_uid=f'tracked_save_{model.__name__}')
+    post_delete.connect(tracked_row_deleted, sender=model, dispatch_uid=f'tracked_delete_{model.__name__}')
+
+
+# Dashboard rows with no tracked fields
+
+def inspection_saved(sender, instance, created, **kwargs):
+    inspection_id = instance.pk
+    if created:
+        transaction.on_commit(lambda: dashboard.inspections_added([inspection_id]))
+    else:
+        transaction.on_commit(lambda: dashboard.inspection_edited(inspection_id))
+        # An edit may move the inspection to another position (axle type) without changing its metrics
+        cost_rollups.months_changed([instance.inspection_date])
+
+
+def inspection_deleted(sender, instance, **kwargs):
+    inspection_id, inspection_date = instance.pk, instance.inspection_date
+    transaction.on_commit(lambda: dashboard.inspection_removed(inspection_id, inspection_date))
+    cost_rollups.months_changed([instance.inspection_date])
+
+
+def vehicle_saved(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: dashboard.vehicle_count_changed(1))
+
+
+def vehicle_deleted(sender, instance, **kwargs):
+    transaction.on_commit(lambda: dashboard.vehicle_count_changed(-1))
+
+
+post_save.connect(inspection_saved, sender=TireInspection, dispatch_uid='dashboard_inspection_save')
+post_delete.connect(inspection_deleted, sender=TireInspection, dispatch_uid='dashboard_inspection_delete')
+post_save.connect(vehicle_saved, sender=Vehicle, dispatch_uid='dashboard_vehicle_save')
+post_delete.connect(vehicle_deleted, sender=Vehicle, dispatch_uid='dashboard_vehicle_delete')
@@ -0,0 +1,92 @@
+# tires/tests/base.py
+"""
+Shared fixture for the service tests
+Run with: python manage.py test tires
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from tires.models import (
+    Employee, Tire, TirePattern, TirePosition, TireStatus, TireWearType, Vehicle, WorkOrder,
+)
+from tires.services import reference_data
+
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class FleetTestCase(TestCase):
+    """
+    One vehicle with four positions: P1-P3 hold T1-T3, P4 is empty; SPARE is unmounted
+    The reference-data cache is emptied per test (version bumps run on commit, which
+    a TestCase never reaches)
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ready = TireStatus.objects.create(status_name='READY')
+        cls.mounted = TireStatus.objects.create(status_name='MOUNTED')
+        cls.discarded = TireStatus.objects.create(status_name='DISCARDED')
+        cls.pattern = TirePattern.objects.create(
+            pattern_code='P-100', brand_name='Brand', country_of_origin='X', load_index='150',
+            speed_symbol='L', road_type='Highway', initial_tread_depth=Decimal('15.00'),
+            discarding_tread_depth=Decimal('3.00'), ideal_tire_pressure=Decimal('100.00'),
+        )
+        cls.inspector = Employee.objects.create(
+            employment_code='E1', first_name='Ann', last_name='Lee', position='Inspector',
+            contact_number='1', email='ann@example.com',
+        )
+        cls.wear = TireWearType.objects.create(name='Even', wear_common_cause='-', recovery_scheme='-')
+        cls.vehicle = Vehicle.objects.create(
+            license_plate='TRK-1', make='Volvo', year=2020, vehicle_type='TRUCK', tire_configuration='4x2',
+        )
+        cls.other_vehicle = Vehicle.objects.create(
+            license_plate='TRK-2', make='Volvo', year=2020, vehicle_type='TRUCK', tire_configuration='4x2',
+        )
+        cls.positions = [
+            TirePosition.objects.create(
+                vehicle=cls.vehicle, position_name=f'P{n}', axle_number=(n + 1) // 2, wheel_number=n,
+            )
+            for n in range(1, 5)
+        ]
+        cls.tires = [cls.make_tire(f'T{n}', cls.mounted) for n in range(1, 4)]
+        for tire, position in zip(cls.tires, cls.positions):
+            cls.mount(tire, position)
+        cls.spare = cls.make_tire('SPARE', cls.ready)
+        cls.work_order = WorkOrder.objects.create(
+            work_order_number='WO-1', assigned_to=cls.inspector, vehicle=cls.vehicle,
+            current_odometer=100000, shift_type='ASSIGNMENT', status='OPENED',
+        )
+
+    @classmethod
+    def make_tire(cls, serial, status):
+        return Tire.objects.create(
+            serial_number=serial, pattern=cls.pattern, size='315/80R22.5', status=status,
+            purchase_date=date(2025, 1, 1), purchase_cost=Decimal('600.00'),
+            initial_tread_depth=Decimal('15.00'),
+        )
+
+    @staticmethod
+    def mount(tire, position):
+        TirePosition.objects.filter(id=position.id).update(mounted_tire=tire)
+        Tire.objects.filter(id=tire.id).update(current_position=position)
+
+    def setUp(self):
+        caches['default'].clear()
+        reference_data._local.clear()
+
+    def occupancy(self):
+        """{position name: serial or None} of the vehicle"""
+        return {
+            name: serial
+            for name, serial in TirePosition.objects.filter(vehicle=self.vehicle)
+            .order_by('id').values_list('position_name', 'mounted_tire__serial_number')
+        }
+
+    def current_positions(self):
+        """{serial: position name or None} for every tire"""
+        return dict(Tire.objects.values_list('serial_number', 'current_position__position_name'))
@@ -0,0 +1,62 @@
+# tires/tests/test_batch_inspections.py
+from decimal import Decimal
+
+from tires.models import Tire, TireInspection
+from tires.services.batch_inspections import (
+    InvalidInspectionBatch, build_inspection_batch, submit_inspection_batch,
+)
+
+from .base import FleetTestCase
+
+
+class BatchInspectionTests(FleetTestCase):
+
+    def batch(self, readings, **entry):
+        return {
+            'inspector_id': self.inspector.id,
+            'vehicles': [{'vehicle_id': self.vehicle.id, 'odometer': 120000, 'readings': readings, **entry}],
+        }
+
+    def reading(self, tire, **values):
+        return {'tire_id': tire.id, 'tread_depth': 11.5, 'pressure': 98, **values}
+
+    def test_valid_batch_is_written_at_the_mounted_positions(self):
+        t1, t2 = self.tires[0], self.tires[1]
+        created = submit_inspection_batch(self.batch([self.reading(t1), self.reading(t2, tread_depth='10')]))
+
+        self.assertEqual(len(created), 2)
+        rows = dict(TireInspection.objects.values_list('tire_id', 'position_id'))
+        self.assertEqual(rows, {t1.id: self.positions[0].id, t2.id: self.positions[1].id})
+        self.assertEqual(Tire.objects.get(id=t2.id).last_tread_depth, Decimal('10.00'))
+
+    def test_every_error_is_reported_and_nothing_is_written(self):
+        t1 = self.tires[0]
+        payload = self.batch([
+            self.reading(t1),
+            self.reading(t1),
+            self.reading(self.spare),
+            self.reading(self.tires[2], tread_depth='deep', pressure=-1),
+        ], inspector_id=999, work_order_id=999)
+
+        with self.assertRaises(InvalidInspectionBatch) as raised:
+            submit_inspection_batch(payload)
+
+        self.assertEqual(raised.exception.errors, [
+            'vehicles[0]: inspector not found',
+            'vehicles[0]: work order 999 not found',
+            f'vehicles[0].readings[1]: tire {t1.id} appears twice for this vehicle',
+            f'vehicles[0].readings[2]: tire {self.spare.id} is not mounted on vehicle {self.vehicle.id}',
+            'vehicles[0].readings[3]: tread_depth must be a number between 0 and 99.99',
+            'vehicles[0].readings[3]: pressure must be a number between 0 and 999.99',
+        ])
+        self.assertFalse(TireInspection.objects.exists())
+
+    def test_payload_shape_is_checked_first(self):
+        for payload, message in (
+            ({}, 'vehicles must be a non-empty list'),
+            ({'vehicles': ['x']}, 'every vehicles entry must be an object'),
+            (self.batch([]), 'vehicles[0]: readings must be a non-empty list'),
+        ):
+            with self.assertRaises(InvalidInspectionBatch) as raised:
+                build_inspection_batch(payload)
+            self.assertIn(message, raised.exception.errors)
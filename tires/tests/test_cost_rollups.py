@@ -0,0 +1,160 @@
+# tires/tests/test_cost_rollups.py
+import importlib
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from django.apps import apps
+from django.test import TestCase
+
+from tires.models import CostRollup, Tire, TireAssignment, TireInspection
+from tires.services.cost_rollups import cost_report, refresh_cost_rollups
+from tires.services.inspection_metrics import calculate_metrics, recompute_tire_metrics
+
+from .base import FleetTestCase
+
+backfill_migration = importlib.import_module('tires.migrations.0010_backfill_inspection_distance')
+
+
+class CostRollupTestCase(FleetTestCase):
+
+    def inspect(self, tire, odometer, tread, inspected=date(2026, 3, 10)):
+        return TireInspection.objects.create(
+            tire=tire, position=tire.current_position, inspection_odometer=odometer, inspection_date=inspected,
+            inspector=self.inspector, tread_depth=Decimal(tread), pressure=Decimal('100'), wear_id=self.wear,
+        )
+
+    def assign(self, tire, start_odometer):
+        TireAssignment.objects.create(
+            tire=tire, tire_position_to=tire.current_position, assignment_date=date(2026, 1, 1),
+            start_odometer=start_odometer, work_order=self.work_order,
+        )
+
+    def distances(self):
+        return list(TireInspection.objects.order_by('id').values_list('distance_travelled', 'tread_consumed'))
+
+
+class DistanceBackfillTests(CostRollupTestCase):
+
+    def test_backfill_matches_the_metrics_engine(self):
+        t1, t2 = Tire.objects.get(serial_number='T1'), Tire.objects.get(serial_number='T2')
+        self.assign(t1, 40000)
+        self.inspect(t1, 50000, '13')
+        self.inspect(t1, 60000, '12')
+        self.inspect(t2, 70000, '14')  # no mount odometer: distance unknown
+        recompute_tire_metrics([t1.id, t2.id], refresh_rollups=False)
+        expected = self.distances()
+        TireInspection.objects.update(distance_travelled=0, tread_consumed=0)
+
+        backfill_migration.backfill_distance_and_tread(apps, None)
+
+        self.assertEqual(self.distances(), expected)
+        self.assertEqual(expected, [
+            (10000, Decimal('2.00')), (10000, Decimal('1.00')), (0, Decimal('1.00')),
+        ])
+
+
+class DistanceFormulaTests(TestCase):
+
+    def frame(self, **overrides):
+        values = {
+            'CTD': 10, 'CTO': 60000, 'CTP': 90, 'PTD': 12, 'PTO': 50000,
+            'ITD': 15, 'DTD': 3, 'ITP': 100, 'TPP': 600, 'PTM': 20000,
+        }
+        values.update(overrides)
+        return pd.DataFrame({key: [value] for key, value in values.items()})
+
+    def test_distance_and_tread_since_the_previous_reading(self):
+        metrics = calculate_metrics(self.frame()).iloc[0]
+        self.assertAlmostEqual(metrics['KMR'], 10000.0)
+        self.assertAlmostEqual(metrics['TDW'], 2.0)
+
+    def test_never_negative(self):
+        self.assertEqual(calculate_metrics(self.frame(CTD=13)).iloc[0]['TDW'], 0.0)     # re-tread
+        self.assertEqual(calculate_metrics(self.frame(CTO=40000)).iloc[0]['KMR'], 0.0)  # odometer reset
+
+    def test_missing_baseline_odometer_runs_no_distance(self):
+        metrics = calculate_metrics(self.frame(PTO=np.nan)).iloc[0]
+        self.assertEqual(metrics['KMR'], 0.0)
+        self.assertAlmostEqual(metrics['CRP'], 2 * 10000 / 60000)  # measured from 0 as before
+
+
+class StoredDistanceTests(CostRollupTestCase):
+
+    def test_history_stores_distance_and_tread(self):
+        tire = Tire.objects.get(serial_number='T1')
+        self.assign(tire, 40000)
+        self.inspect(tire, 50000, '13')
+        self.inspect(tire, 60000, '12')
+        recompute_tire_metrics([tire.id], refresh_rollups=False)
+
+        self.assertEqual(self.distances(), [(10000, Decimal('2.00')), (10000, Decimal('1.00'))])
+
+    def test_first_inspection_without_assignment_runs_no_distance(self):
+        tire = Tire.objects.get(serial_number='T2')
+        self.inspect(tire, 80000, '14')
+        recompute_tire_metrics([tire.id], refresh_rollups=False)
+
+        self.assertEqual(self.distances(), [(0, Decimal('1.00'))])
+
+
+class RollupTests(CostRollupTestCase):
+    """T1: 20,000 km and 3 mm in March, T2: 5,000 km and 1 mm in April; 50.00 per mm (600 / 12)"""
+
+    def setUp(self):
+        super().setUp()
+        t1, t2 = Tire.objects.get(serial_number='T1'), Tire.objects.get(serial_number='T2')
+        self.assign(t1, 40000)
+        self.assign(t2, 70000)
+        self.inspect(t1, 50000, '13', date(2026, 3, 5))
+        self.inspect(t1, 60000, '12', date(2026, 3, 25))
+        self.inspect(t2, 75000, '14', date(2026, 4, 2))
+        recompute_tire_metrics([t1.id, t2.id], refresh_rollups=False)
+
+    def totals(self, dimension):
+        return list(
+            CostRollup.objects.filter(dimension=dimension).order_by('month', 'key')
+            .values_list('month', 'key', 'label', 'tires', 'km', 'tread_consumed', 'cost')
+        )
+
+    def test_monthly_totals_per_dimension(self):
+        self.assertEqual(refresh_cost_rollups(), 8)
+
+        self.assertEqual(self.totals('brand'), [
+            (date(2026, 3, 1), 'Brand', 'Brand', 1, 20000, Decimal('3.00'), Decimal('150.00')),
+            (date(2026, 4, 1), 'Brand', 'Brand', 1, 5000, Decimal('1.00'), Decimal('50.00')),
+        ])
+        pattern = str(self.pattern.id)
+        self.assertEqual([row[1:3] for row in self.totals('pattern')], [(pattern, 'Brand - P-100')] * 2)
+        self.assertEqual([row[2] for row in self.totals('supplier')], ['No supplier'] * 2)
+
+    def test_report_sums_the_range(self):
+        refresh_cost_rollups()
+        rows, monthly = cost_report('brand', date(2026, 3, 1), date(2026, 4, 1))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(
+            (rows[0]['km'], rows[0]['cost'], rows[0]['tire_months'], rows[0]['cost_per_1000_km']),
+            (25000, Decimal('200.00'), 2, Decimal('8.00')),
+        )
+        self.assertEqual([month['cost_per_1000_km'] for month in monthly], [Decimal('7.50'), Decimal('10.00')])
+
+    def test_month_refresh_leaves_other_months(self):
+        refresh_cost_rollups()
+        TireInspection.objects.filter(inspection_date__month=4).delete()
+
+        refresh_cost_rollups([date(2026, 4, 15)])
+        self.assertEqual({row[0] for row in self.totals('brand')}, {date(2026, 3, 1)})
+        self.assertEqual(CostRollup.objects.filter(month=date(2026, 3, 1)).count(), 4)
+
+    def test_recompute_refreshes_the_months_it_writes_on_commit(self):
+        t1 = Tire.objects.get(serial_number='T1')
+        TireInspection.objects.filter(tire=t1).update(distance_travelled=0, tread_consumed=0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            recompute_tire_metrics([t1.id])
+
+        self.assertEqual(self.totals('brand'), [
+            (date(2026, 3, 1), 'Brand', 'Brand', 1, 20000, Decimal('3.00'), Decimal('150.00')),
+        ])
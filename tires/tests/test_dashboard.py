@@ -0,0 +1,73 @@
+# tires/tests/test_dashboard.py
+from datetime import date
+from decimal import Decimal
+
+from django.urls import reverse
+
+from tires.models import DashboardSnapshot, Tire, TireInspection
+from tires.services.dashboard import dashboard_data, refresh_dashboard
+from tires.services.latest_inspection import refresh_latest_inspections
+
+from .base import FleetTestCase
+
+
+class DashboardSnapshotTests(FleetTestCase):
+    """Fixture: 2 vehicles, 4 active tires at 600.00, WO-1 open"""
+
+    def setUp(self):
+        super().setUp()
+        refresh_dashboard()
+
+    def stats(self):
+        data = dashboard_data()
+        return {name: data[name] for name in ('total_vehicles', 'active_tires', 'fleet_value', 'active_work_orders')}
+
+    def test_landing_page_reads_the_snapshot(self):
+        self.assertEqual(
+            self.stats(),
+            {'total_vehicles': 2, 'active_tires': 4, 'fleet_value': Decimal('2400.00'), 'active_work_orders': 1},
+        )
+        with self.assertNumQueries(5):  # stats + one per list
+            response = self.client.get(reverse('menu_page'))
+        self.assertEqual(
+            [row['work_order_number'] for row in response.context['pending_work_orders']], ['WO-1'],
+        )
+
+    def test_first_read_builds_the_snapshot(self):
+        DashboardSnapshot.objects.all().delete()
+        self.assertEqual(self.stats()['active_tires'], 4)
+
+    def test_writes_keep_the_snapshot_current(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.work_order.status = 'CLOSED'
+            self.work_order.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            spare = Tire.objects.get(id=self.spare.id)
+            spare.status = self.discarded
+            spare.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other_vehicle.delete()
+
+        self.assertEqual(
+            self.stats(),
+            {'total_vehicles': 1, 'active_tires': 3, 'fleet_value': Decimal('1800.00'), 'active_work_orders': 0},
+        )
+        self.assertEqual(dashboard_data()['pending_work_orders'], [])
+
+    def test_inspection_readings_flag_tires(self):
+        tire = self.tires[0]
+        TireInspection.objects.create(
+            tire=tire, position=self.positions[0], inspection_odometer=90000, inspection_date=date(2026, 3, 1),
+            inspector=self.inspector, tread_depth=Decimal('2.50'), pressure=Decimal('80'), wear_id=self.wear,
+        )
+        refresh_latest_inspections([tire.id])
+
+        data = dashboard_data()
+        self.assertEqual((data['below_discard_count'], data['under_inflated_count']), (1, 1))
+        self.assertEqual(data['below_discard_tires'][0]['serial_number'], 'T1')
+        self.assertEqual(data['under_inflated_tires'][0]['position'], 'TRK-1 - P1')
+
+        TireInspection.objects.filter(tire=tire).update(tread_depth=Decimal('9.00'), pressure=Decimal('100'))
+        refresh_latest_inspections([tire.id])
+        data = dashboard_data()
+        self.assertEqual((data['below_discard_count'], data['under_inflated_count']), (0, 0))
@@ -0,0 +1,62 @@
+# tires/tests/test_exports.py
+import csv
+import io
+from unittest import mock
+
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from tires.models import Tire
+
+from .base import FleetTestCase
+
+
+class ListExportTests(FleetTestCase):
+    """Exports take the list page's filters and sort; tires export their list fields"""
+
+    def export(self, resource, file_format, **params):
+        response = self.client.get(reverse('list_export', args=[resource, file_format]), params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def csv_rows(self, response):
+        content = b''.join(response.streaming_content).decode('utf-8')
+        self.assertTrue(content.startswith('\ufeff'))
+        return list(csv.reader(io.StringIO(content[1:])))
+
+    def test_csv_keeps_the_filters_and_sort(self):
+        Tire.objects.filter(id=self.tires[1].id).update(serial_number='T9')
+        rows = self.csv_rows(self.export('tires', 'csv', status_filter=self.mounted.id, sort='-serial_number'))
+
+        self.assertEqual(rows[0][:3], ['id', 'serial_number', 'size'])
+        serial = rows[0].index('serial_number')
+        self.assertEqual([row[serial] for row in rows[1:]], ['T9', 'T3', 'T1'])
+        self.assertEqual(rows[1][rows[0].index('vehicle')], 'TRK-1')
+
+    def test_csv_is_streamed_in_chunks(self):
+        with mock.patch('tires.services.exports.CSV_ROWS_PER_CHUNK', 2):
+            response = self.export('tires', 'csv')
+            chunks = list(response.streaming_content)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(len(chunks), 3)  # 4 tires: two full chunks, then the (empty) remainder
+        self.assertIn('attachment; filename="tires-', response['Content-Disposition'])
+
+    def test_xlsx_continues_on_new_sheets(self):
+        with mock.patch('tires.services.exports.XLSX_MAX_ROWS', 3):
+            response = self.export('tires', 'xlsx', sort='serial_number')
+            workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+
+        sheets = [list(sheet.values) for sheet in workbook.worksheets]
+        self.assertEqual(workbook.sheetnames, ['tires', 'tires 2'])
+        self.assertEqual([row[1] for sheet in sheets for row in sheet[1:]], ['SPARE', 'T1', 'T2', 'T3'])
+        self.assertEqual(sheets[1][0], sheets[0][0])
+
+    def test_empty_export_has_headers(self):
+        rows = self.csv_rows(self.export('tire_inspections', 'csv'))
+        self.assertEqual(len(rows), 1)
+        self.assertIn('tread_depth', rows[0])
+
+    def test_unknown_list_or_format(self):
+        self.assertEqual(self.client.get(reverse('list_export', args=['nope', 'csv'])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('list_export', args=['tires', 'pdf'])).status_code, 404)
@@ -0,0 +1,72 @@
+# tires/tests/test_import_engine.py
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from tires.models import Tire, TireInspection, TireStatus
+from tires.services.import_engine import run_import
+from tires.services.import_staging import stage_upload, staged_rows
+
+from .base import FleetTestCase
+
+
+class ImportEngineTests(FleetTestCase):
+    TIRE_MAPPINGS = {'serial_number': 'Serial', 'tire_pattern': 'Pattern', 'size': 'Size'}
+
+    def test_invalid_rows_are_reported_and_valid_rows_written(self):
+        rows = [
+            {'Serial': 'NEW-1', 'Pattern': 'P-100', 'Size': '315'},
+            {'Serial': 'T1', 'Pattern': 'P-100', 'Size': '315'},
+            {'Serial': 'NEW-2', 'Pattern': 'NOPE', 'Size': '315'},
+            {'Serial': 'NEW-1', 'Pattern': 'P-100', 'Size': '315'},
+        ]
+        created, errors, fatal = run_import('tire', rows, self.TIRE_MAPPINGS)
+
+        self.assertIsNone(fatal)
+        self.assertEqual(list(created), [1])
+        self.assertEqual(errors, {
+            2: 'Tire with this serial number already exists',
+            3: 'Tire pattern not found: NOPE',
+            4: 'Duplicate serial number in file',
+        })
+        self.assertTrue(Tire.objects.filter(serial_number='NEW-1').exists())
+
+    def test_failure_after_the_inserts_rolls_back_every_row(self):
+        rows = [
+            {'Tire': serial, 'Odometer': 110000, 'Tread': 12}
+            for serial in ('T1', 'T2', 'T3')
+        ]
+        mappings = {'tire': 'Tire', 'inspection_odometer': 'Odometer', 'tread_depth': 'Tread'}
+        with mock.patch('tires.services.import_engine.recompute_tire_metrics', side_effect=RuntimeError('boom')):
+            created, errors, fatal = run_import('inspection', rows, mappings, chunk_size=2)
+
+        self.assertEqual(created, {})
+        self.assertEqual(errors, {})
+        self.assertEqual(fatal, 'Import failed, no rows were written: boom')
+        self.assertFalse(TireInspection.objects.exists())
+        self.assertFalse(Tire.objects.filter(latest_inspection__isnull=False).exists())
+
+    def test_status_cells_match_like_the_old_importer(self):
+        in_stock = TireStatus.objects.create(status_name='In Stock (Warehouse)')
+        rows = [
+            {'Serial': 'NEW-1', 'Pattern': 'P-100', 'Size': '315', 'Status': 'Mounted '},
+            {'Serial': 'NEW-2', 'Pattern': 'P-100', 'Size': '315', 'Status': 'in stock'},
+            {'Serial': 'NEW-3', 'Pattern': 'P-100', 'Size': '315', 'Status': 'Lost'},
+        ]
+        created, errors, fatal = run_import('tire', rows, {**self.TIRE_MAPPINGS, 'tire_status': 'Status'})
+
+        self.assertEqual((errors, fatal), ({}, None))
+        self.assertEqual(
+            dict(Tire.objects.filter(serial_number__startswith='NEW').values_list('serial_number', 'status_id')),
+            {'NEW-1': self.mounted.id, 'NEW-2': in_stock.id, 'NEW-3': self.ready.id},
+        )
+
+    def test_csv_cells_are_staged_as_text(self):
+        upload = SimpleUploadedFile('tires.csv', 'Serial,Cost\n00123,600\n,\n'.encode())
+        headers, total = stage_upload(upload, 'tire', 'session-1')
+
+        self.assertEqual((headers, total), (['Serial', 'Cost'], 2))
+        self.assertEqual(
+            [row.DATA for row in staged_rows('session-1')],
+            [{'Serial': '00123', 'Cost': '600'}, {'Serial': '', 'Cost': ''}],
+        )
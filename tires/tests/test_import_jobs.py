@@ -0,0 +1,105 @@
+# tires/tests/test_import_jobs.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+
+from tires.models import ImportJob, Tire
+from tires.services.import_jobs import (
+    MAX_ATTEMPTS, background_imports_enabled, claim_next_job, enqueue_import, requeue_stale_jobs, run_job,
+)
+from tires.services.import_staging import apply_bulk_selection, stage_upload, staged_rows
+
+from .base import FleetTestCase
+
+
+MAPPINGS = {'serial_number': 'Serial', 'tire_pattern': 'Pattern', 'size': 'Size'}
+
+
+def stage(session_id, *serials):
+    """Stage one tire row per serial, approve them all and queue the import"""
+    lines = ['Serial,Pattern,Size', *(f'{serial},P-100,315' for serial in serials)]
+    stage_upload(SimpleUploadedFile('tires.csv', '\n'.join(lines).encode()), 'tire', session_id)
+    apply_bulk_selection(staged_rows(session_id), 'select_all')
+    return enqueue_import(session_id, 'tire', MAPPINGS, file_name='tires.csv')
+
+
+class ImportJobTests(FleetTestCase):
+
+    def test_jobs_are_claimed_oldest_first_and_only_once(self):
+        first = stage('session-1', 'NEW-1')
+        second = stage('session-2', 'NEW-2')
+
+        claimed = claim_next_job('worker-a')
+        self.assertEqual(claimed.id, first.id)
+        self.assertEqual((claimed.status, claimed.worker, claimed.attempts), ('running', 'worker-a', 1))
+        self.assertEqual(claim_next_job('worker-b').id, second.id)
+        self.assertIsNone(claim_next_job('worker-c'))
+
+    def test_claimed_job_imports_the_approved_rows(self):
+        job = stage('session-1', 'NEW-1', 'NEW-2', 'T1')
+
+        self.assertEqual(run_job(claim_next_job('worker-a'), chunk_size=2), 'completed')
+        job.refresh_from_db()
+        job.import_log.refresh_from_db()
+        self.assertEqual(job.status, 'completed')
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual((job.import_log.imported_rows, job.import_log.failed_rows), (2, 1))
+        self.assertEqual(job.import_log.stats['processed_rows'], 3)
+        self.assertEqual(Tire.objects.filter(serial_number__in=['NEW-1', 'NEW-2']).count(), 2)
+
+    def test_stale_running_jobs_are_requeued(self):
+        stale = stage('session-1', 'NEW-1')
+        fresh = stage('session-2', 'NEW-2')
+        claim_next_job('worker-a')
+        claim_next_job('worker-b')
+        ImportJob.objects.filter(id=stale.id).update(heartbeat_at=timezone.now() - timedelta(seconds=700))
+
+        self.assertEqual(requeue_stale_jobs(stale_after=600), 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual((stale.status, stale.worker), ('queued', ''))
+        self.assertEqual(fresh.status, 'running')
+        self.assertEqual(claim_next_job('worker-c').id, stale.id)
+
+    def test_jobs_fail_after_the_last_attempt(self):
+        job = stage('session-1', 'NEW-1')
+        claim_next_job('worker-a')
+        ImportJob.objects.filter(id=job.id).update(
+            attempts=MAX_ATTEMPTS, heartbeat_at=timezone.now() - timedelta(seconds=700),
+        )
+
+        self.assertEqual(requeue_stale_jobs(stale_after=600), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error_message), ('failed', 'Worker stopped responding'))
+        self.assertIsNone(claim_next_job('worker-b'))
+
+
+class ImportUploadTests(FleetTestCase):
+
+    def upload(self, previous_session_id):
+        session = self.client.session
+        session['import_session_id'] = previous_session_id
+        session.save()
+        upload = SimpleUploadedFile('next.csv', b'Serial,Pattern,Size\nNEXT-1,P-100,315\n')
+        return self.client.post(reverse('import_excel_upload'), {'file': upload, 'import_type': 'tire'})
+
+    def test_imports_run_in_the_request_unless_configured(self):
+        with self.settings():
+            del settings.IMPORT_BACKGROUND_JOBS
+            self.assertFalse(background_imports_enabled())
+
+    def test_upload_keeps_the_rows_a_queued_or_running_job_reads(self):
+        queued = stage('session-1', 'NEW-1')
+        self.upload('session-1')
+        self.assertEqual(staged_rows('session-1').count(), 1)
+
+        claim_next_job('worker-a')
+        self.upload('session-1')
+        self.assertEqual(staged_rows('session-1').count(), 1)
+
+        run_job(ImportJob.objects.select_related('import_log').get(id=queued.id))
+        self.upload('session-1')
+        self.assertFalse(staged_rows('session-1').exists())
@@ -0,0 +1,94 @@
+# tires/tests/test_import_staging.py
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+
+from tires.models import ImportStaging
+from tires.services.import_staging import (
+    apply_bulk_selection, filter_staged, selection_counts, set_page_selection, stage_upload, staged_rows,
+)
+
+from .base import FleetTestCase
+
+
+def tire_csv(count, name='tires.csv'):
+    lines = ['Serial,Pattern,Size', *(f'NEW-{number},P-100,315' for number in range(1, count + 1))]
+    return SimpleUploadedFile(name, '\n'.join(lines).encode())
+
+
+class StagingTests(FleetTestCase):
+
+    def test_upload_is_staged_in_chunks(self):
+        headers, total = stage_upload(tire_csv(5), 'tire', 'session-1', chunk_size=2)
+
+        self.assertEqual((headers, total), (['Serial', 'Pattern', 'Size'], 5))
+        rows = staged_rows('session-1')
+        self.assertEqual(list(rows.values_list('ROW_NUMBER', flat=True)), [1, 2, 3, 4, 5])
+        self.assertEqual(set(rows.values_list('MODEL_TYPE', 'STATUS')), {('inventory', 'pending')})
+        self.assertEqual(rows.last().DATA, {'Serial': 'NEW-5', 'Pattern': 'P-100', 'Size': '315'})
+
+    def test_session_keeps_only_metadata_and_replaces_the_previous_upload(self):
+        self.client.post(reverse('import_excel_upload'), {'file': tire_csv(3), 'import_type': 'tire'})
+        first_session_id = self.client.session['import_session_id']
+
+        self.assertEqual(self.client.session['total_rows'], 3)
+        self.assertNotIn('data', self.client.session)
+        self.assertEqual(staged_rows(first_session_id).count(), 3)
+
+        self.client.post(reverse('import_excel_upload'), {'file': tire_csv(2), 'import_type': 'tire'})
+        second_session_id = self.client.session['import_session_id']
+
+        self.assertNotEqual(first_session_id, second_session_id)
+        self.assertEqual(ImportStaging.objects.filter(SESSION_ID=first_session_id).count(), 0)
+        self.assertEqual(staged_rows(second_session_id).count(), 2)
+
+
+class SelectionTests(FleetTestCase):
+    """Selection lives on ImportStaging.STATUS, so it spans every preview page"""
+
+    def setUp(self):
+        super().setUp()
+        stage_upload(tire_csv(30), 'tire', 'session-1')
+        staged_rows('session-1').filter(ROW_NUMBER=30).update(STATUS='imported')
+        staged_rows('session-1').filter(ROW_NUMBER__in=[3, 13]).update(ERROR_MESSAGE='Duplicate serial')
+
+    def selected(self):
+        return list(staged_rows('session-1').filter(STATUS='approved').values_list('ROW_NUMBER', flat=True))
+
+    def test_page_selection_only_touches_that_page(self):
+        set_page_selection('session-1', range(1, 11), [1, 2])
+        set_page_selection('session-1', range(11, 21), [11])
+        set_page_selection('session-1', range(1, 11), [2])
+
+        self.assertEqual(self.selected(), [2, 11])
+
+    def test_bulk_actions_cover_every_matching_row(self):
+        self.assertEqual(apply_bulk_selection(staged_rows('session-1'), 'select_all'), 29)
+        self.assertEqual(
+            apply_bulk_selection(filter_staged(staged_rows('session-1'), validation='invalid'), 'clear'), 2,
+        )
+        self.assertEqual(selection_counts('session-1'), {'total': 30, 'selected': 27, 'imported': 1, 'invalid': 2})
+
+        # NEW-2 and NEW-20..NEW-29 match; NEW-30 is imported and stays out of every action
+        apply_bulk_selection(filter_staged(staged_rows('session-1'), column='Serial', value='new-2'), 'invert')
+        self.assertEqual(self.selected(), [1, *range(4, 13), *range(14, 20)])
+        self.assertEqual(staged_rows('session-1').get(ROW_NUMBER=30).STATUS, 'imported')
+
+    def test_preview_bulk_action_spans_pages_and_keeps_the_filters(self):
+        session = self.client.session
+        session.update({
+            'import_session_id': 'session-1', 'import_type': 'tire',
+            'headers': ['Serial', 'Pattern', 'Size'], 'mappings': {},
+        })
+        session.save()
+
+        response = self.client.post(reverse('import_excel_preview'), {
+            'action': 'select_all', 'validation': 'valid', 'current_page': '2',
+        })
+
+        self.assertRedirects(response, f"{reverse('import_excel_preview')}?validation=valid&page=2")
+        self.assertEqual(len(self.selected()), 27)
+
+        response = self.client.get(reverse('import_excel_preview'), {'page_size': 25, 'selection': 'selected'})
+        self.assertEqual((len(response.context['data']), response.context['page_obj'].paginator.num_pages), (25, 2))
+        self.assertEqual(response.context['counts']['selected'], 27)
+        self.assertEqual(self.client.get(reverse('import_excel_preview')).context['page_size'], 25)
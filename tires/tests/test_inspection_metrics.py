@@ -0,0 +1,78 @@
+# tires/tests/test_inspection_metrics.py
+from datetime import date
+from decimal import Decimal
+
+import pandas as pd
+from django.test import TestCase
+
+from tires.models import Tire, TireAssignment, TireInspection
+from tires.services.inspection_metrics import calculate_metrics, recompute_metrics, recompute_tire_metrics
+
+from .base import FleetTestCase
+
+
+class MetricFormulaTests(TestCase):
+
+    def frame(self, **overrides):
+        values = {
+            'CTD': 10, 'CTO': 60000, 'CTP': 90, 'PTD': 12, 'PTO': 50000,
+            'ITD': 15, 'DTD': 3, 'ITP': 100, 'TPP': 600, 'PTM': 20000,
+        }
+        values.update(overrides)
+        return pd.DataFrame({key: [value] for key, value in values.items()})
+
+    def test_formulas(self):
+        metrics = calculate_metrics(self.frame()).iloc[0]
+
+        self.assertAlmostEqual(metrics['CRP'], 2.0)       # 2 mm over 10,000 km
+        self.assertAlmostEqual(metrics['RTD'], 35000.0)   # 7 mm left at 2 mm / 10,000 km
+        self.assertAlmostEqual(metrics['BTD'], 35000.0)
+        self.assertAlmostEqual(metrics['Cmm'], 50.0)      # 600 / (15 - 3)
+        self.assertAlmostEqual(metrics['CKm'], 1000.0)    # 10 * CRP * Cmm
+        self.assertAlmostEqual(metrics['CTV'], 350.0)     # 7 / 12 of 600
+        self.assertAlmostEqual(metrics['FCI'], 0.4)       # 10 PSI under ideal
+        self.assertAlmostEqual(metrics['FLC'], 80.0)      # FCI * PTM / 100
+
+    def test_no_wear_or_no_distance_gives_zero_rate(self):
+        for overrides in ({'CTD': 12}, {'CTO': 50000}, {'CTD': 13}):
+            metrics = calculate_metrics(self.frame(**overrides)).iloc[0]
+            self.assertEqual(metrics['CRP'], 0.0)
+            self.assertEqual(metrics['RTD'], 0.0)
+            self.assertEqual(metrics['CKm'], 0.0)
+
+    def test_pattern_without_usable_tread_gives_zero_values(self):
+        metrics = calculate_metrics(self.frame(ITD=3)).iloc[0]
+        self.assertEqual(metrics['Cmm'], 0.0)
+        self.assertEqual(metrics['CTV'], 0.0)
+
+
+class MetricRecomputeTests(FleetTestCase):
+
+    def inspect(self, tire, odometer, tread, position=None):
+        return TireInspection.objects.create(
+            tire=tire, position=position or tire.current_position, inspection_odometer=odometer,
+            inspector=self.inspector, tread_depth=Decimal(tread), pressure=Decimal('100'), wear_id=self.wear,
+        )
+
+    def test_history_uses_previous_inspection_and_mount_odometer(self):
+        tire = Tire.objects.get(serial_number='T1')
+        TireAssignment.objects.create(
+            tire=tire, tire_position_to=self.positions[0], assignment_date=date(2025, 1, 1),
+            start_odometer=40000, work_order=self.work_order,
+        )
+        first = self.inspect(tire, 50000, '13')
+        second = self.inspect(tire, 60000, '12')
+        recompute_tire_metrics([tire.id], refresh_rollups=False)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.consumption_rate, Decimal('2.00'))    # 15 -> 13 over 40,000 -> 50,000
+        self.assertEqual(second.consumption_rate, Decimal('1.00'))   # 13 -> 12 over 10,000 km
+
+    def test_recompute_only_writes_changed_rows(self):
+        tire = Tire.objects.get(serial_number='T1')
+        self.inspect(tire, 50000, '13')
+        self.inspect(tire, 60000, '12')
+
+        self.assertEqual(recompute_metrics([tire.id], refresh_rollups=False), (2, 2))
+        self.assertEqual(recompute_metrics([tire.id], refresh_rollups=False), (2, 0))
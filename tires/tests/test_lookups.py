@@ -0,0 +1,55 @@
+# tires/tests/test_lookups.py
+from django.urls import reverse
+
+from .base import FleetTestCase
+
+
+class LookupFilterTests(FleetTestCase):
+    """The list API filters behind the lookup selects that replace embedded option lists"""
+
+    def lookup(self, resource, **params):
+        response = self.client.get(reverse('list_api', args=[resource]), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['results']
+
+    def test_positions_split_into_mounted_and_empty(self):
+        mounted = self.lookup('tire_positions', vehicle_filter=self.vehicle.id, empty_filter=0)
+        empty = self.lookup('tire_positions', vehicle_filter=self.vehicle.id, empty_filter=1)
+        self.assertEqual(
+            [(row['position_name'], row['mounted_tire_id']) for row in mounted],
+            [(position.position_name, tire.id) for position, tire in zip(self.positions, self.tires)],
+        )
+        self.assertEqual([row['position_name'] for row in empty], ['P4'])
+
+    def test_unmounted_tires(self):
+        self.assertEqual([row['serial_number'] for row in self.lookup('tires', unmounted_filter=1)], ['SPARE'])
+
+    def test_invalid_flag_is_rejected(self):
+        response = self.client.get(reverse('list_api', args=['tire_positions']), {'empty_filter': 'yes'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_plate_search(self):
+        self.assertEqual([row['license_plate'] for row in self.lookup('vehicles', plate='trk-2')], ['TRK-2'])
+        self.assertEqual(len(self.lookup('tire_positions', plate='TRK-1')), 4)
+
+
+class AssignmentPageTests(FleetTestCase):
+
+    def test_create_form_does_not_embed_fleet_tables(self):
+        response = self.client.get(reverse('tire_assignment_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'id="formOptions"')
+        for serial in ('T1', 'SPARE', 'WO-1', 'TRK-2'):
+            self.assertNotContains(response, serial)
+
+
+class ListPageOptionTests(FleetTestCase):
+    """form_options embeds small reference tables only; tires and positions come from lookups"""
+
+    def test_pages_do_not_embed_tires_or_positions(self):
+        for name in ('tires_list', 'tire_inspections_list', 'maintenance_records_list', 'tire_position_list'):
+            with self.subTest(page=name):
+                response = self.client.get(reverse(name))
+                self.assertEqual(response.status_code, 200)
+                options = response.context['form_options']
+                self.assertFalse({'tires', 'tire_positions'} & set(options))
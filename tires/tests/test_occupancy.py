@@ -0,0 +1,67 @@
+# tires/tests/test_occupancy.py
+from django.test import TestCase
+
+from tires.models import Tire, TirePosition
+from tires.services.occupancy import plan_repairs, reconcile_occupancy
+
+from .base import FleetTestCase
+
+
+class PlanRepairsTests(TestCase):
+    DISCARDED = {9}
+
+    def plan(self, tires, held=None, holders=None, latest=None):
+        return plan_repairs(tires, held or {}, holders or {}, latest or {}, self.DISCARDED)
+
+    def test_tire_mounted_twice_keeps_the_position_it_points_at(self):
+        positions, pointers = self.plan({1: (11, 1)}, held={1: [10, 11]}, holders={10: 1, 11: 1})
+        self.assertEqual((positions, pointers), ({10: None}, {}))
+
+    def test_tire_mounted_twice_without_a_pointer_keeps_its_last_assignment(self):
+        positions, pointers = self.plan({1: (None, 1)}, held={1: [10, 11]}, holders={10: 1, 11: 1},
+                                        latest={1: 11})
+        self.assertEqual((positions, pointers), ({10: None}, {1: 11}))
+
+    def test_discarded_tire_is_taken_off(self):
+        positions, pointers = self.plan({1: (10, 9)}, held={1: [10]}, holders={10: 1})
+        self.assertEqual((positions, pointers), ({10: None}, {1: None}))
+
+    def test_unclaimed_position_points_its_tire_back(self):
+        positions, pointers = self.plan({1: (None, 1)}, held={1: [10]}, holders={10: 1})
+        self.assertEqual((positions, pointers), ({}, {1: 10}))
+
+    def test_claim_on_an_empty_position_fills_it(self):
+        positions, pointers = self.plan({1: (10, 1)}, holders={10: None})
+        self.assertEqual((positions, pointers), ({10: 1}, {}))
+
+    def test_claim_on_a_position_holding_another_tire_is_dropped(self):
+        positions, pointers = self.plan({1: (10, 1)}, holders={10: 2})
+        self.assertEqual((positions, pointers), ({}, {1: None}))
+
+    def test_position_released_by_one_tire_can_be_claimed_by_another(self):
+        # Tire 2 is held twice and keeps 11 (where it points); 10 is freed and tire 1 claims it
+        positions, pointers = self.plan(
+            {1: (10, 1), 2: (11, 1)}, held={2: [10, 11]}, holders={10: 2, 11: 2},
+        )
+        self.assertEqual((positions, pointers), ({10: 1}, {}))
+
+
+class ReconcileOccupancyTests(FleetTestCase):
+
+    def test_dry_run_reports_and_apply_repairs(self):
+        t1, t2 = self.tires[0], self.tires[1]
+        Tire.objects.filter(id=t1.id).update(current_position=None)       # P1 not claimed by T1
+        TirePosition.objects.filter(id=self.positions[3].id).update(mounted_tire=t2)  # T2 in P2 and P4
+        Tire.objects.filter(id=self.tires[2].id).update(status=self.discarded)         # discarded in P3
+
+        report = reconcile_occupancy()
+        self.assertIn((t1.id, self.positions[0].id), report['issues']['position_not_claimed_by_tire'])
+        self.assertEqual(self.occupancy(), {'P1': 'T1', 'P2': 'T2', 'P3': 'T3', 'P4': 'T2'})
+
+        reconcile_occupancy(apply=True)
+        self.assertEqual(self.occupancy(), {'P1': 'T1', 'P2': 'T2', 'P3': None, 'P4': None})
+        self.assertEqual(self.current_positions(), {'T1': 'P1', 'T2': 'P2', 'T3': None, 'SPARE': None})
+        self.assertEqual(reconcile_occupancy()['issues'], {
+            'position_holds_discarded_tire': [], 'tire_mounted_twice': [],
+            'position_not_claimed_by_tire': [], 'tire_claims_other_position': [],
+        })
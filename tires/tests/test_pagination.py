@@ -0,0 +1,98 @@
+# tires/tests/test_pagination.py
+import datetime
+from decimal import Decimal
+
+from django.http import QueryDict
+from django.urls import reverse
+from django.utils import timezone
+
+from tires.models import WorkOrder
+from tires.services.list_specs import LIST_SPECS
+from tires.services.pagination import decode_cursor, encode_cursor, paginate
+
+from .base import FleetTestCase
+
+
+class CursorTests(FleetTestCase):
+
+    def test_datetimes_round_trip_with_microseconds(self):
+        created = datetime.datetime(2026, 3, 1, 8, 30, 0, 123456, tzinfo=datetime.timezone.utc)
+        self.assertEqual(decode_cursor(encode_cursor(created, 7, 'next')), (created, 7, 'next'))
+
+    def test_other_values_round_trip_as_json(self):
+        for value, decoded in (
+            ('T-001', 'T-001'),
+            (42, 42),
+            (Decimal('12.50'), '12.50'),
+            (datetime.date(2026, 3, 1), '2026-03-01'),
+            ([datetime.date(2026, 3, 1), 90000, 2], ['2026-03-01', 90000, 2]),
+        ):
+            self.assertEqual(decode_cursor(encode_cursor(value, 1, 'prev')), (decoded, 1, 'prev'))
+
+
+class PageWalkTests(FleetTestCase):
+    """Seven work orders created within the same millisecond, walked three at a time"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        base = timezone.now().replace(microsecond=0)
+        for n in range(2, 8):
+            WorkOrder.objects.create(
+                work_order_number=f'WO-{n}', assigned_to=cls.inspector, vehicle=cls.vehicle,
+                current_odometer=100000, shift_type='INSPECTION', status='OPENED',
+            )
+        for n, order in enumerate(WorkOrder.objects.order_by('id')):
+            # Sub-millisecond apart, two sharing a timestamp to exercise the id tiebreaker
+            WorkOrder.objects.filter(id=order.id).update(
+                date_created=base + datetime.timedelta(microseconds=100 * min(n, 5)),
+            )
+
+    def walk(self, sort, cursor=None, direction='next'):
+        """[(ids, page)] following next (or previous) cursors, at most ten pages"""
+        params = QueryDict(f'sort={sort}&page_size=3', mutable=True)
+        pages = []
+        for _ in range(10):
+            if cursor:
+                params['cursor'] = cursor
+            page = paginate(LIST_SPECS['work_orders'], params, strict=True)
+            pages.append(([order.id for order in page], page))
+            cursor = page.next_cursor if direction == 'next' else page.previous_cursor
+            if cursor is None:
+                return pages
+        self.fail(f'{sort}: pagination did not end')
+
+    def expected(self, sort):
+        descending = sort.startswith('-')
+        prefix = '-' if descending else ''
+        return list(WorkOrder.objects.order_by(f'{prefix}date_created', f'{prefix}id').values_list('id', flat=True))
+
+    def test_every_row_appears_once(self):
+        for sort in ('date_created', '-date_created', 'work_order_number', '-current_odometer', 'id'):
+            with self.subTest(sort=sort):
+                pages = [ids for ids, _ in self.walk(sort)]
+                ids = [pk for page in pages for pk in page]
+                self.assertEqual([len(page) for page in pages], [3, 3, 1])
+                self.assertEqual(len(set(ids)), 7)
+                if 'date_created' in sort:
+                    self.assertEqual(ids, self.expected(sort))
+
+    def test_previous_cursors_walk_back_to_the_first_page(self):
+        for sort in ('date_created', '-date_created'):
+            with self.subTest(sort=sort):
+                forward = self.walk(sort)
+                last_ids, last_page = forward[-1]
+                backward = self.walk(sort, last_page.previous_cursor, direction='prev')
+                self.assertEqual([ids for ids, _ in backward][::-1] + [last_ids], [ids for ids, _ in forward])
+
+    def test_json_endpoint_follows_next_cursor(self):
+        url = reverse('list_api', args=['work_orders'])
+        params = {'sort': '-date_created', 'page_size': 3}
+        ids = []
+        for _ in range(10):
+            payload = self.client.get(url, params).json()
+            ids.extend(row['id'] for row in payload['results'])
+            if payload['next_cursor'] is None:
+                break
+            params['cursor'] = payload['next_cursor']
+        self.assertEqual(ids, self.expected('-date_created'))
@@ -0,0 +1,95 @@
+# tires/tests/test_position_layouts.py
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from tires.models import TirePosition, Vehicle
+from tires.services.position_layouts import InvalidLayout, generate_positions, layout_positions, parse_layout
+
+from .base import FleetTestCase
+
+
+class ParseLayoutTests(SimpleTestCase):
+
+    def test_axle_list_with_type_letters_and_spares(self):
+        self.assertEqual(parse_layout('2-4-4+1', 'TRUCK'), ([(2, 'STEERING'), (4, 'DRIVE'), (4, 'DRIVE')], 1))
+        self.assertEqual(parse_layout('2s-4d-4l'), ([(2, 'STEERING'), (4, 'DRIVE'), (4, 'LIFTABLE')], 0))
+        self.assertEqual(parse_layout('4-4-4', 'TRAILER')[0], [(4, 'TRAILER')] * 3)
+
+    def test_drive_formula(self):
+        self.assertEqual(parse_layout('6x4', 'TRUCK'), ([(2, 'STEERING'), (4, 'DRIVE'), (4, 'DRIVE')], 0))
+        self.assertEqual(
+            parse_layout('8X4 + 1', 'TRUCK'),
+            ([(2, 'STEERING'), (2, 'STEERING'), (4, 'DRIVE'), (4, 'DRIVE')], 1),
+        )
+        self.assertEqual(parse_layout('6x2', 'TRUCK')[0], [(2, 'STEERING'), (4, 'LIFTABLE'), (4, 'DRIVE')])
+
+    def test_tire_count_and_fallback_counts(self):
+        self.assertEqual(parse_layout('10 wheels', 'TRUCK')[0], [(2, 'STEERING'), (4, 'DRIVE'), (4, 'DRIVE')])
+        self.assertEqual(parse_layout('6', 'TRAILER')[0], [(4, 'TRAILER'), (2, 'TRAILER')])
+        self.assertEqual(
+            parse_layout('12R22.5', 'TRUCK', default_tires=6, default_spares=2),
+            ([(2, 'STEERING'), (4, 'DRIVE')], 2),
+        )
+
+    def test_invalid_layouts(self):
+        for layout in ('12R22.5', '2-3-4', '7x4', '5 tires', '2-4+5', '-'.join(['2'] * 13)):
+            with self.subTest(layout=layout), self.assertRaises(InvalidLayout):
+                parse_layout(layout, 'TRUCK')
+
+    def test_position_names_and_order(self):
+        positions = layout_positions([(2, 'STEERING'), (4, 'DRIVE')], 1)
+        self.assertEqual([position[0] for position in positions], [
+            'Front Left', 'Front Right',
+            'Axle 2 Left Outer', 'Axle 2 Left Inner', 'Axle 2 Right Inner', 'Axle 2 Right Outer',
+            'Spare',
+        ])
+        self.assertEqual(positions[-1], ('Spare', 0, 1, 'STEERING', 7, True))
+        self.assertEqual([position[4] for position in positions], list(range(1, 8)))
+
+
+class GeneratePositionsTests(FleetTestCase):
+    """TRK-1 already holds P1-P4 on (axle, wheel) (1, 1), (1, 2), (2, 3), (2, 4)"""
+
+    def add_vehicle(self, plate, configuration, **fields):
+        return Vehicle.objects.create(
+            license_plate=plate, make='Volvo', year=2020, vehicle_type='TRUCK',
+            tire_configuration=configuration, **fields,
+        )
+
+    def test_only_missing_slots_are_created(self):
+        new = self.add_vehicle('TRK-3', '2-4+1')
+        sized = self.add_vehicle('TRK-4', '12R22.5', number_of_or_tires=6)
+        broken = self.add_vehicle('TRK-5', '12R22.5')
+        Vehicle.objects.filter(id=self.vehicle.id).update(tire_configuration='2-4')
+        vehicles = Vehicle.objects.filter(id__in=[self.vehicle.id, new.id, sized.id, broken.id]).order_by('id')
+
+        result = generate_positions(vehicles)
+
+        self.assertEqual(
+            (result['created'], result['existing'], result['vehicles']), (2 + 7 + 6, 4, 3),
+        )
+        self.assertEqual(list(result['errors']), ['TRK-5'])
+        names = TirePosition.objects.filter(vehicle=self.vehicle).order_by('id').values_list('position_name', flat=True)
+        self.assertEqual(
+            list(names),
+            ['P1', 'P2', 'P3', 'P4', 'Axle 2 Left Outer', 'Axle 2 Left Inner'],
+        )
+        self.assertTrue(TirePosition.objects.get(vehicle=new, position_name='Spare').is_spare)
+
+        with self.assertNumQueries(1):
+            rerun = generate_positions(vehicles)
+        self.assertEqual(rerun['created'], 0)
+
+    def test_dry_run_writes_nothing(self):
+        vehicle = self.add_vehicle('TRK-3', '6x4')
+        self.assertEqual(generate_positions([vehicle], dry_run=True)['created'], 10)
+        self.assertFalse(TirePosition.objects.filter(vehicle=vehicle).exists())
+
+    def test_vehicle_list_button(self):
+        vehicle = self.add_vehicle('TRK-3', '2-4')
+        url = reverse('vehicle_generate_positions', args=[vehicle.id])
+
+        self.assertRedirects(self.client.post(url), reverse('vehicle_list'))
+        self.assertEqual(TirePosition.objects.filter(vehicle=vehicle).count(), 6)
+        self.client.get(url)
+        self.assertEqual(TirePosition.objects.filter(vehicle=vehicle).count(), 6)
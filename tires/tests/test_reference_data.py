@@ -0,0 +1,44 @@
+# tires/tests/test_reference_data.py
+from tires.models import TireStatus
+from tires.services.reference_data import bump_version, reference_table
+
+from .base import FleetTestCase
+
+
+class ReferenceDataTests(FleetTestCase):
+
+    def test_snapshot_is_read_once(self):
+        with self.assertNumQueries(1):
+            reference_table(TireStatus)
+        with self.assertNumQueries(0):
+            statuses = reference_table(TireStatus)
+
+        self.assertEqual([row['status_name'] for row in statuses], ['READY', 'MOUNTED', 'DISCARDED'])
+        self.assertEqual(statuses.lookup('status_name', ' mounted ')['id'], self.mounted.id)
+        self.assertEqual(statuses.lookup_key_or_id('status_name', str(self.ready.id))['id'], self.ready.id)
+        self.assertIsNone(statuses.get('x'))
+
+    def test_save_invalidates_after_commit(self):
+        reference_table(TireStatus)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            TireStatus.objects.create(status_name='Under Repair')
+
+        self.assertIsNone(reference_table(TireStatus).lookup('status_name', 'under repair'))
+        for callback in callbacks:
+            callback()
+        self.assertIsNotNone(reference_table(TireStatus).lookup('status_name', 'under repair'))
+
+    def test_delete_invalidates(self):
+        reference_table(TireStatus)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.discarded.delete()
+
+        self.assertNotIn(self.discarded.id, reference_table(TireStatus).ids())
+
+    def test_bulk_writes_need_a_version_bump(self):
+        reference_table(TireStatus)
+        TireStatus.objects.filter(id=self.ready.id).update(status_name='IN STOCK')
+        self.assertEqual(reference_table(TireStatus).get(self.ready.id)['status_name'], 'READY')
+
+        bump_version(TireStatus)
+        self.assertEqual(reference_table(TireStatus).get(self.ready.id)['status_name'], 'IN STOCK')
@@ -0,0 +1,85 @@
+# tires/tests/test_rotations.py
+from tires.models import Tire, TireAssignment, TirePosition
+from tires.services.rotations import InvalidRotation, apply_rotation
+
+from .base import FleetTestCase
+
+
+class RotationTests(FleetTestCase):
+
+    def rotate(self, **payload):
+        return apply_rotation({'work_order_id': self.work_order.id, **payload})
+
+    def test_swap_exchanges_two_positions(self):
+        p1, p2 = self.positions[0].id, self.positions[1].id
+        created = self.rotate(swaps=[[p1, p2]])
+
+        self.assertEqual(len(created), 2)
+        self.assertEqual(self.occupancy(), {'P1': 'T2', 'P2': 'T1', 'P3': 'T3', 'P4': None})
+        self.assertEqual(self.current_positions()['T1'], 'P2')
+        self.assertEqual(self.current_positions()['T2'], 'P1')
+        self.assertTrue(all(a.start_odometer == 100000 and a.reason_for_removal == 'Rotation' for a in created))
+
+    def test_chain_fills_positions_emptied_by_the_same_rotation(self):
+        p1, p2, p3, p4 = (position.id for position in self.positions)
+        self.rotate(moves=[
+            {'from_position_id': p1, 'to_position_id': p4},
+            {'from_position_id': p2, 'to_position_id': p1},
+            {'from_position_id': p3, 'to_position_id': p2},
+        ])
+
+        self.assertEqual(self.occupancy(), {'P1': 'T2', 'P2': 'T3', 'P3': None, 'P4': 'T1'})
+        self.assertEqual(self.current_positions(), {'T1': 'P4', 'T2': 'P1', 'T3': 'P2', 'SPARE': None})
+
+    def test_discard_empties_the_position_and_marks_the_tire(self):
+        p3 = self.positions[2].id
+        created = self.rotate(moves=[{'from_position_id': p3, 'discard': True, 'reason': 'Sidewall cut'}])
+
+        self.assertIsNone(self.occupancy()['P3'])
+        tire = Tire.objects.get(serial_number='T3')
+        self.assertIsNone(tire.current_position_id)
+        self.assertEqual(tire.status_id, self.discarded.id)
+        self.assertTrue(created[0].is_discard_operation)
+        self.assertIsNone(created[0].tire_position_to_id)
+
+    def test_mounting_a_ready_tire_marks_it_mounted(self):
+        self.rotate(moves=[{'tire_id': self.spare.id, 'to_position_id': self.positions[3].id}])
+
+        self.assertEqual(self.occupancy()['P4'], 'SPARE')
+        self.assertEqual(Tire.objects.get(id=self.spare.id).status_id, self.mounted.id)
+
+    def test_occupied_target_is_rejected_and_nothing_is_written(self):
+        p1, p2 = self.positions[0].id, self.positions[1].id
+        with self.assertRaises(InvalidRotation) as raised:
+            self.rotate(moves=[{'from_position_id': p1, 'to_position_id': p2}])
+
+        self.assertEqual(raised.exception.errors, [
+            f'position {p2} is occupied by tire {self.tires[1].id} and not emptied by this rotation',
+        ])
+        self.assertEqual(self.occupancy(), {'P1': 'T1', 'P2': 'T2', 'P3': 'T3', 'P4': None})
+        self.assertFalse(TireAssignment.objects.exists())
+
+    def test_every_invalid_move_is_reported(self):
+        p1, p4 = self.positions[0].id, self.positions[3].id
+        with self.assertRaises(InvalidRotation) as raised:
+            self.rotate(moves=[
+                {'from_position_id': p1, 'discard': True},
+                {'tire_id': self.tires[1].id, 'to_position_id': p4},
+                {'from_position_id': p4, 'to_position_id': p1},
+            ])
+
+        self.assertEqual(raised.exception.errors, [
+            'moves[0]: a discard needs a reason',
+            f'moves[1]: tire {self.tires[1].id} is mounted elsewhere; move it from its position',
+            f'moves[2]: position {p4} is empty',
+        ])
+        self.assertFalse(TireAssignment.objects.exists())
+
+    def test_position_of_another_vehicle_is_rejected(self):
+        foreign = TirePosition.objects.create(
+            vehicle=self.other_vehicle, position_name='X1', axle_number=1, wheel_number=1,
+        )
+        with self.assertRaises(InvalidRotation) as raised:
+            self.rotate(moves=[{'from_position_id': self.positions[0].id, 'to_position_id': foreign.id}])
+
+        self.assertEqual(raised.exception.errors, [f'moves[0]: position {foreign.id} is not on this vehicle'])
@@ -0,0 +1,58 @@
+# tires/tests/test_summary_counters.py
+from tires.models import Tire, WorkOrder
+from tires.services.summary_counters import invalidate_summary_counts, summary_counts
+
+from .base import FleetTestCase
+
+
+class SummaryCounterTests(FleetTestCase):
+    """Fixture: T1-T3 MOUNTED and SPARE READY are active; WO-1 is an open assignment order"""
+
+    def test_counters_are_computed_once_then_cached(self):
+        expected = {'active_count': 4, 'under_repair_count': 0, 'inactive_count': 0}
+        self.assertEqual(summary_counts('tires'), expected)
+        with self.assertNumQueries(0):
+            self.assertEqual(summary_counts('tires'), expected)
+
+    def test_saves_and_deletes_adjust_the_cached_counts(self):
+        summary_counts('work_orders')
+        with self.captureOnCommitCallbacks(execute=True):
+            order = WorkOrder.objects.create(
+                work_order_number='WO-2', assigned_to=self.inspector, vehicle=self.vehicle,
+                current_odometer=100000, shift_type='INSPECTION', status='OPENED',
+            )
+        self.assertEqual(summary_counts('work_orders'), {'open_count': 2, 'inspection_count': 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order.status = 'CLOSED'
+            order.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.work_order.delete()
+        with self.assertNumQueries(0):
+            self.assertEqual(summary_counts('work_orders'), {'open_count': 0, 'inspection_count': 1})
+
+    def test_save_with_deferred_counted_field_recounts(self):
+        summary_counts('tires')
+        spare = Tire.objects.only('id', 'serial_number').get(id=self.spare.id)
+        Tire.objects.filter(id=spare.id).update(status=self.discarded)
+        with self.captureOnCommitCallbacks(execute=True):
+            spare.save(update_fields=['serial_number', 'status'])
+
+        self.assertEqual(summary_counts('tires')['active_count'], 3)
+
+    def test_status_rename_recounts(self):
+        Tire.objects.filter(id=self.spare.id).update(status=self.discarded)
+        self.assertEqual(summary_counts('tires')['inactive_count'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.discarded.status_name = 'Scrap'
+            self.discarded.save()
+        self.assertEqual(summary_counts('tires')['inactive_count'], 1)
+
+    def test_bulk_writes_need_an_invalidation(self):
+        summary_counts('tires')
+        Tire.objects.filter(id=self.spare.id).update(status=self.discarded)
+        self.assertEqual(summary_counts('tires')['active_count'], 4)
+
+        invalidate_summary_counts(Tire)
+        self.assertEqual(summary_counts('tires')['active_count'], 3)
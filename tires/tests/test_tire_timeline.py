@@ -0,0 +1,85 @@
+# tires/tests/test_tire_timeline.py
+from datetime import date
+from decimal import Decimal
+
+from django.urls import reverse
+
+from tires.models import MaintenanceRecord, ServiceType, Supplier, TireAssignment, TireInspection
+from tires.services.pagination import InvalidListQuery
+from tires.services.tire_timeline import tire_timeline
+
+from .base import FleetTestCase
+
+
+class TireTimelineTests(FleetTestCase):
+    """T1's events newest first; ties on the date go to the higher odometer, then maintenance > inspection"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        service = ServiceType.objects.create(service_name='Repair')
+        supplier = Supplier.objects.create(
+            supplier_name='Shop', contact_person='-', phone='1', position='-', email='shop@example.com', address='-',
+        )
+        (t1, t2), (p1, p2) = cls.tires[:2], cls.positions[:2]
+
+        def inspect(tire, position, odometer, inspected):
+            return TireInspection.objects.create(
+                tire=tire, position=position, inspection_odometer=odometer, inspection_date=inspected,
+                inspector=cls.inspector, tread_depth=Decimal('12'), pressure=Decimal('100'), wear_id=cls.wear,
+            )
+
+        def maintain(tire, mileage, serviced):
+            return MaintenanceRecord.objects.create(
+                tire=tire, service_type=service, service_date=serviced, service_mileage=mileage,
+                cost=Decimal('25.00'), service_provider=supplier,
+            )
+
+        assignment = TireAssignment.objects.create(
+            tire=t1, tire_position_to=p1, assignment_date=date(2026, 1, 1),
+            start_odometer=40000, work_order=cls.work_order,
+        )
+        cls.expected = [
+            ('inspection', inspect(t1, p1, 60000, date(2026, 3, 1)).id),
+            ('maintenance', maintain(t1, 55000, date(2026, 3, 1)).id),
+            ('maintenance', maintain(t1, 50000, date(2026, 2, 1)).id),
+            ('inspection', inspect(t1, p1, 50000, date(2026, 2, 1)).id),
+            ('assignment', assignment.id),
+            ('inspection', inspect(t1, p1, 30000, None).id),  # undated legacy row
+        ]
+        inspect(t2, p2, 70000, date(2026, 3, 1))
+        maintain(t2, 70000, date(2026, 3, 1))
+
+    def events(self, page):
+        return [(row['kind'], row['id']) for row in page['results']]
+
+    def test_three_arms_merge_newest_first(self):
+        page = tire_timeline(self.tires[0].id, page_size=10)
+
+        self.assertEqual(self.events(page), self.expected)
+        self.assertIsNone(page['next_cursor'])
+        self.assertEqual(page['results'][1]['service'], 'Repair')
+        self.assertEqual(page['results'][4]['position'], 'P1')
+        self.assertIsNone(page['results'][-1]['date'])
+
+    def test_keyset_pages_walk_the_same_stream(self):
+        events, cursor = [], None
+        for _ in range(len(self.expected)):
+            with self.assertNumQueries(1):
+                page = tire_timeline(self.tires[0].id, cursor, page_size=2)
+            events += self.events(page)
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(events, self.expected)
+
+    def test_api_errors(self):
+        url = reverse('tire_timeline_api', args=[self.tires[0].id])
+        self.assertEqual(self.client.get(url, {'cursor': 'garbage'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('tire_timeline_api', args=[999999])).status_code, 404)
+        with self.assertRaises(InvalidListQuery):
+            tire_timeline(self.tires[0].id, page_size='abc')
+
+        response = self.client.get(url, {'page_size': 3})
+        self.assertEqual(len(response.json()['results']), 3)
@@ -0,0 +1,74 @@
+# tires/tests/test_wear_forecast.py
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from django.test import TestCase
+
+from tires.models import Tire, TireAssignment, TireInspection, TirePosition, TireWearForecast
+from tires.services.wear_forecast import forecast, forecast_tires
+
+from .base import FleetTestCase
+
+
+class ForecastFitTests(TestCase):
+
+    def test_line_is_fitted_against_tire_km(self):
+        tires = pd.DataFrame({'tire_id': [1], 'DTD': [3.0]})
+        readings = pd.DataFrame({
+            'tire_id': [1, 1, 1],
+            'km': [0.0, 10000.0, 20000.0],
+            'odometer': [90000.0, 100000.0, 20000.0],  # moved to a vehicle with a lower odometer
+            'tread': [15.0, 13.0, 11.0],
+            'day': [0.0, 50.0, 100.0],
+        })
+        row = forecast(tires, readings).iloc[0]
+
+        self.assertEqual(row['status'], TireWearForecast.FORECAST)
+        self.assertAlmostEqual(row['wear_rate'], 2.0)
+        self.assertAlmostEqual(row['fitted_tread_depth'], 11.0)
+        self.assertEqual(row['last_odometer'], 20000.0)        # latest reading, not the highest odometer
+        self.assertEqual(row['removal_odometer'], 60000.0)     # 8 mm left at 2 mm / 10,000 km
+        self.assertAlmostEqual(row['km_per_day'], 200.0)
+        self.assertEqual(row['removal_day'], 300.0)
+
+    def test_tire_worn_past_the_discarding_depth_is_due(self):
+        tires = pd.DataFrame({'tire_id': [1], 'DTD': [3.0]})
+        readings = pd.DataFrame({
+            'tire_id': [1, 1], 'km': [0.0, 60000.0], 'odometer': [0.0, 60000.0],
+            'tread': [15.0, 2.0], 'day': [np.nan, np.nan],
+        })
+        row = forecast(tires, readings).iloc[0]
+        self.assertEqual(row['status'], TireWearForecast.DUE)
+        self.assertTrue(np.isnan(row['removal_day']))
+
+
+class ForecastTiresTests(FleetTestCase):
+
+    def test_tire_moved_between_vehicles_is_fitted_on_its_own_km(self):
+        tire = Tire.objects.get(serial_number='T1')
+        foreign = TirePosition.objects.create(
+            vehicle=self.other_vehicle, position_name='X1', axle_number=1, wheel_number=1,
+        )
+        TireAssignment.objects.create(
+            tire=tire, tire_position_to=self.positions[0], assignment_date=date(2025, 1, 1),
+            start_odometer=90000, work_order=self.work_order,
+        )
+        for odometer, tread, distance, position, day in (
+            (100000, '13', 10000, self.positions[0], date(2025, 2, 20)),
+            (15000, '11', 10000, foreign, date(2025, 4, 11)),   # second vehicle, lower odometer
+        ):
+            TireInspection.objects.create(
+                tire=tire, position=position, inspection_odometer=odometer, inspection_date=day,
+                inspector=self.inspector, tread_depth=Decimal(tread), pressure=Decimal('100'),
+                wear_id=self.wear, distance_travelled=distance,
+            )
+        forecast_tires((tire.id, tire.id))
+
+        result = TireWearForecast.objects.get(tire=tire)
+        self.assertEqual(result.readings, 3)
+        self.assertEqual(result.wear_rate, Decimal('2.000'))
+        self.assertEqual(result.last_odometer, 15000)
+        self.assertEqual(result.removal_odometer, 55000)
+        self.assertEqual(result.last_inspection_date, date(2025, 4, 11))
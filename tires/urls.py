@@ -13,13 +13,18 @@ from .views.tires import *
 from .views.vehicles import *
 from .views.work_order import *
 from .views.tire_wear import *
+from .views.list_api import *
+from .views.request_stats import *
+from .views.reports import *
+from .views.exports import *
 from . import views
 from .views.excel_import import (
     import_excel_upload,
     import_excel_mapping,
     import_excel_preview,
     import_excel_confirm,
-    import_excel_success
+    import_excel_success,
+    import_job_status,
 )
 
 
@@ -34,6 +39,7 @@ urlpatterns = [
     path('vehicles/create/', vehicle_create, name='vehicle_create'),
     path('vehicles/update/<int:id>/', vehicle_update, name='vehicle_update'),
     path('vehicles/delete/<int:id>/', vehicle_delete, name='vehicle_delete'),
+    path('vehicles/<int:id>/generate-positions/', vehicle_generate_positions, name='vehicle_generate_positions'),
     
     # Tire Status URLs
     path('tire-status/',  tire_status_list, name='tire_status_list'),
@@ -84,12 +90,15 @@ urlpatterns = [
     path('tire-inspections/update/<int:id>/', tire_inspections_update, name='tire_inspections_update'),
     path('tire-inspections/delete/<int:id>/', tire_inspections_delete, name='tire_inspections_delete'),
     path("tire-inspections/bulk-update/", bulk_tire_update, name="bulk_tire_update"),
+    path('api/inspections/batch/', inspection_batch_api, name='inspection_batch_api'),
+    path('tire-inspections/vehicle-tires/', vehicle_tire_snapshot, name='vehicle_tire_snapshot'),
 
     # Tires URLS
     path('tires/', tires_list, name='tires_list'),
     path('tires/create/', tires_create, name='tires_create'),
     path('tires/update/<int:id>/', tires_update, name='tires_update'),
     path('tires/delete/<int:id>/', tires_delete, name='tires_delete'),
+    path('api/tires/<int:id>/timeline/', tire_timeline_api, name='tire_timeline_api'),
 
     # Tires Pattern URLS
     path('tire-patterns/', tire_patterns_list, name='tire_patterns_list'),
@@ -102,6 +111,7 @@ urlpatterns = [
     path('tire-assignment/create/', tire_assignment_create, name='tire_assignment_create'),
     path('tire-assignment/update/<int:id>/', tire_assignment_update, name='tire_assignment_update'),
     path('tire-assignment/delete/<int:id>/', tire_assignment_delete, name='tire_assignment_delete'),
+    path('api/assignments/rotation/', tire_rotation_api, name='tire_rotation_api'),
 
     # Tire Wear URLS
     path('tire-wear-type/', tire_wear_type_list, name='tire_wear_type_list'),
@@ -114,5 +124,19 @@ urlpatterns = [
     path('import/preview/', import_excel_preview, name='import_excel_preview'),
     path('import/confirm/', import_excel_confirm, name='import_excel_confirm'),
     path('import/success/', import_excel_success, name='import_excel_success'),
+    path('import/jobs/<int:job_id>/', import_job_status, name='import_job_status'),
+
+    # List API URLs
+    path('api/<str:resource>/', list_api, name='list_api'),
+    path('api/<str:resource>/<int:pk>/', list_detail_api, name='list_detail_api'),
+
+    # Export URLs (CSV streamed, XLSX built in a temporary file, then sent)
+    path('export/<str:resource>/<str:file_format>/', list_export, name='list_export'),
+
+    # Request Stats URLs (staff only)
+    path('request-stats/', request_stats_page, name='request_stats'),
+
+    # Report URLs (read the monthly rollups)
+    path('reports/cost-per-km/', cost_per_km_report, name='cost_per_km_report'),
 
 ]
\ No newline at end of file
@@ -14,6 +14,7 @@ from .tires import *
 from .vehicles import *
 from .work_order import *
 from .tire_wear import *
+from .list_api import *
 
 try:
     from .excel_import_new import (
@@ -0,0 +1,33 @@
+from django.http import FileResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from ..services.exports import EXPORT_FORMATS, export_filename, export_rows, iter_csv, write_xlsx
+from ..services.list_specs import LIST_SPECS
+
+# Export Views --------------------------------------------------------------------------------------------------------
+
+@require_GET
+def list_export(request, resource, file_format):
+    """
+    Every row of a registered list as CSV or XLSX: /export/<resource>/<csv|xlsx>/?<filters>&sort=
+    Takes the same filter and sort params as the list page (cursor/page_size are ignored)
+    Only CSV streams as rows are read. XLSX is written whole to a temporary file first
+    (a zip is only complete once every row is in), so its download starts after the
+    last row has been read
+    """
+    spec = LIST_SPECS.get(resource)
+    if spec is None:
+        return JsonResponse({"error": f"Unknown list: {resource}"}, status=404)
+    if file_format not in EXPORT_FORMATS:
+        return JsonResponse({"error": f"Unknown export format: {file_format}"}, status=404)
+
+    headers, rows = export_rows(spec, request.GET)
+    filename = export_filename(resource, file_format)
+    if file_format == 'csv':
+        response = StreamingHttpResponse(iter_csv(headers, rows), content_type=EXPORT_FORMATS['csv'])
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    return FileResponse(
+        write_xlsx(headers, rows, resource), as_attachment=True, filename=filename,
+        content_type=EXPORT_FORMATS['xlsx'],
+    )
@@ -0,0 +1,42 @@
+from django.http import JsonResponse
+from ..services.list_specs import LIST_SPECS
+from ..services.pagination import InvalidListQuery, paginate
+
+# List API Views ------------------------------------------------------------------------------------------------------
+
+def list_api(request, resource):
+    """
+    JSON window of any registered list: /api/<resource>/?<filters>&sort=&cursor=&page_size=
+    Add count=1 to include the total number of matching rows
+    """
+    spec = LIST_SPECS.get(resource)
+    if spec is None:
+        return JsonResponse({"error": f"Unknown list: {resource}"}, status=404)
+
+    try:
+        page = paginate(spec, request.GET, strict=True, values=True)
+    except InvalidListQuery as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    payload = {
+        "results": page.object_list,
+        "sort": page.sort,
+        "page_size": page.page_size,
+        "next_cursor": page.next_cursor,
+        "previous_cursor": page.previous_cursor,
+    }
+    if request.GET.get('count') == '1':
+        payload["total_count"] = page.total_count
+    return JsonResponse(payload)
+
+
+def list_detail_api(request, resource, pk):
+    """JSON of one record of a registered list: /api/<resource>/<pk>/ (fills the shared edit/details modals)"""
+    spec = LIST_SPECS.get(resource)
+    if spec is None:
+        return JsonResponse({"error": f"Unknown list: {resource}"}, status=404)
+
+    record = spec.get_detail(pk)
+    if record is None:
+        return JsonResponse({"error": f"{resource} {pk} not found"}, status=404)
+    return JsonResponse(record)
@@ -1,38 +1,31 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from ..models import MaintenanceRecord, Tire, ServiceType, Supplier
+from ..services.form_options import form_options, selected_option
+from ..services.list_specs import LIST_SPECS
+from ..services.pagination import paginate
 # Maintenance Records Views ------------------------------------------------------------------------------------------------------
 
 def maintenance_records_list(request):
-    # Start with all records
-    maintenance_records = MaintenanceRecord.objects.all()
-    tires = Tire.objects.all()
-    service_types = ServiceType.objects.all()
-    suppliers = Supplier.objects.all()
+    # Filters, sort and cursor from the query string; only the visible window is loaded
+    page = paginate(LIST_SPECS['maintenance_records'], request.GET)
+    maintenance_records = page.object_list
     
     # Get filter parameters from request
     tire_filter = request.GET.get('tire_filter', '')
     service_type_filter = request.GET.get('service_type_filter', '')
     service_provider_filter = request.GET.get('service_provider_filter', '')  # Fixed parameter name
-    
-    # Apply filters only if they exist
-    if tire_filter:
-        maintenance_records = maintenance_records.filter(tire_id=tire_filter)
 
-    if service_type_filter:
-        maintenance_records = maintenance_records.filter(service_type_id=service_type_filter)
-    
-    if service_provider_filter:
-        maintenance_records = maintenance_records.filter(service_provider_id=service_provider_filter)
-    
     context = {
         'maintenance_records': maintenance_records,
-        'tires': tires,
-        'service_types': service_types,
-        'suppliers': suppliers,
+        'page': page,
         'tire_filter': tire_filter,
         'service_type_filter': service_type_filter,
         'service_provider_filter': service_provider_filter,
+        'selected_tire': selected_option('tires', tire_filter),
+        'selected_service_type': selected_option('service_types', service_type_filter),
+        'selected_provider': selected_option('suppliers', service_provider_filter),
+        'form_options': form_options('service_types', 'suppliers'),
     }
     return render(request, 'maintenance_records/maintenance_records_list.html', context)
 
@@ -1,13 +1,9 @@
 from django.shortcuts import render
-from ..models import Vehicle,Employee
+from ..services.dashboard import dashboard_data
 
 
 # Menu Views
 def menu_page(request):
-    vehicles = Vehicle.objects.all()
-    employees = Employee.objects.all()
-    context = {
-        'vehicles':vehicles,
-        'employees':employees,
-    }
-    return render(request, 'menu/menu_page.html',context)
+    # Served from the precomputed DashboardSnapshot table (refresh_dashboard command + writes)
+    context = dashboard_data()
+    return render(request, 'menu/menu_page.html', context)
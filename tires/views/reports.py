@@ -0,0 +1,48 @@
+import datetime
+
+from django.db.models import Max
+from django.shortcuts import render
+from django.utils import timezone
+
+from ..models import CostRollup
+from ..services.cost_rollups import cost_report, month_start
+
+DEFAULT_MONTHS = 12
+
+
+def parse_month(value, default):
+    try:
+        return datetime.datetime.strptime(value, '%Y-%m').date()
+    except (TypeError, ValueError):
+        return default
+
+
+# Report Views ---------------------------------------------------------------------------------------------------------
+
+def cost_per_km_report(request):
+    # Reads the monthly rollups only (refresh_cost_rollups), never the inspections
+    dimension = request.GET.get('dimension', 'pattern')
+    dimensions = dict(CostRollup.DIMENSION_CHOICES)
+    if dimension not in dimensions:
+        dimension = 'pattern'
+
+    this_month = month_start(timezone.localdate())
+    months_back = this_month.year * 12 + this_month.month - DEFAULT_MONTHS
+    default_first = datetime.date(months_back // 12, months_back % 12 + 1, 1)
+    first_month = parse_month(request.GET.get('from'), default_first)
+    last_month = parse_month(request.GET.get('to'), this_month)
+    if first_month > last_month:
+        first_month, last_month = last_month, first_month
+
+    rows, monthly = cost_report(dimension, first_month, last_month)
+    context = {
+        'rows': rows,
+        'monthly': monthly,
+        'dimension': dimension,
+        'dimensions': CostRollup.DIMENSION_CHOICES,
+        'dimension_label': dimensions[dimension],
+        'first_month': first_month,
+        'last_month': last_month,
+        'refreshed_at': CostRollup.objects.aggregate(latest=Max('refreshed_at'))['latest'],
+    }
+    return render(request, 'reports/cost_per_km.html', context)
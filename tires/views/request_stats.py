@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.shortcuts import redirect, render
+
+from ..services.request_stats import request_stats
+
+SORT_KEYS = ('avg_ms', 'max_ms', 'avg_queries', 'max_queries', 'avg_sql_ms', 'duplicate_queries', 'requests')
+
+
+# Request Stats Views ------------------------------------------------------------------------------------------------
+
+@staff_member_required
+def request_stats_page(request):
+    # Aggregates are per worker process: each worker shows what it has served
+    if request.method == 'POST':
+        request_stats.reset()
+        return redirect('request_stats')
+
+    sort = request.GET.get('sort', 'avg_ms')
+    if sort not in SORT_KEYS:
+        sort = 'avg_ms'
+    views = sorted(request_stats.snapshot(), key=lambda row: row[sort], reverse=True)
+    context = {
+        'views': views,
+        'sort': sort,
+        'since': datetime.fromtimestamp(request_stats.since),
+    }
+    return render(request, 'request_stats/request_stats.html', context)
@@ -1,52 +1,33 @@
 # views.py (tire_assignment views)
+import json
+import logging
+
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.db import transaction
+from django.http import JsonResponse
 from django.utils import timezone
-from ..models import TireAssignment, Tire, Vehicle, TirePosition, TireInspection, WorkOrder, TireStatus
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from ..models import TireAssignment, Tire, TirePosition, TireInspection, WorkOrder, TireStatus
+from ..services.cost_rollups import inspections_moving
+from ..services.list_specs import LIST_SPECS
+from ..services.pagination import paginate
+from ..services.rotations import InvalidRotation, apply_rotation
+
+logger = logging.getLogger(__name__)
 
 # Tire Assignment Views ------------------------------------------------------------------------------------------------------
 def tire_assignment_list(request):
-    # Get all necessary data
-    vehicles = Vehicle.objects.all()
-    
-    # Positions WITH tires (for "From Position")
-    positions_with_tires = TirePosition.objects.filter(
-        mounted_tire__isnull=False
-    ).select_related('vehicle', 'mounted_tire')
-    
-    # EMPTY positions (for "To Position")
-    empty_positions = TirePosition.objects.filter(
-        mounted_tire__isnull=True
-    ).select_related('vehicle')
-    
-    # UNMOUNTED tires (for new mount option)
-    unmounted_tires = Tire.objects.filter(
-        current_position__isnull=True,  # Not mounted anywhere
-        # is_scrapped=False  # Not scrapped
-    ).select_related('status').order_by('serial_number')
-    
-    # Open work orders
-    open_work_orders = WorkOrder.objects.filter(
-        status='OPENED'
-    ).select_related('vehicle')
-    
-    # Tire inspections (for optional field)
-    tire_inspections = TireInspection.objects.all().select_related('tire')
-    
-    # Existing assignments for table
-    tire_assignments = TireAssignment.objects.all()
-    
+    # Existing assignments for table (visible window only); the create and edit
+    # forms load vehicles, positions, tires and work orders from the list API
+    page = paginate(LIST_SPECS['tire_assignments'], request.GET)
+
     context = {
-        'vehicles': vehicles,
-        'positions_with_tires': positions_with_tires,
-        'empty_positions': empty_positions,
-        'unmounted_tires': unmounted_tires,  # NEW
-        'open_work_orders': open_work_orders,
-        'tire_inspections': tire_inspections,
-        'tire_assignments': tire_assignments,
+        'tire_assignments': page.object_list,
+        'page': page,
     }
-    
+
     return render(request, 'tire_assignments/tire_assignment_list.html', context)
 
 def tire_assignment_delete(request, id):
@@ -75,11 +56,8 @@ def tire_assignment_create(request):
             reason_for_removal = request.POST.get('reason_for_removal')
             notes = request.POST.get('notes')
             
-            # Debug print
-            print("=== FORM DATA ===")
-            print(f"to_position_value: {to_position_value}")
-            print(f"discard_flag: {request.POST.get('discard_flag')}")
-            print("=================")
+            logger.debug('Assignment form: to_position=%s discard_flag=%s',
+                         to_position_value, request.POST.get('discard_flag'))
             
             # Check if this is a DISCARD operation
             # Method 1: Check the hidden discard_flag
@@ -89,7 +67,7 @@ def tire_assignment_create(request):
             # Method 3: Final decision
             is_discard = (discard_flag == 'true' or is_discard_from_value)
             
-            print(f"DEBUG: is_discard = {is_discard}")
+            logger.debug('Assignment is_discard=%s', is_discard)
             
             # Get or set default assignment date
             if not assignment_date:
@@ -113,7 +91,7 @@ def tire_assignment_create(request):
             
             # Handle discard operation FIRST
             if is_discard:
-                print("DEBUG: Processing DISCARD operation")
+                logger.debug('Processing DISCARD operation')
                 
                 # For discard, we need tire and from_position
                 tire = Tire.objects.get(id=tire_id)
@@ -137,7 +115,7 @@ def tire_assignment_create(request):
                 to_position = None
                 
             else:
-                print("DEBUG: Processing NORMAL operation (move or mount)")
+                logger.debug('Processing NORMAL operation (move or mount)')
                 
                 # Handle tire selection
                 if is_new_mount:
@@ -184,7 +162,7 @@ def tire_assignment_create(request):
                 is_discard_operation=is_discard,
             )
             
-            print(f"DEBUG: Assignment created with is_discard_operation = {is_discard}")
+            logger.debug('Assignment created with is_discard_operation=%s', is_discard)
             
             # ====== PROCESS BASED ON OPERATION TYPE ======
             if is_discard:
@@ -239,10 +217,9 @@ def tire_assignment_create(request):
                     inspection.save()
                 
                 if from_position:
-                    TireInspection.objects.filter(
-                        tire=tire,
-                        position=from_position
-                    ).update(position=to_position)
+                    moving = TireInspection.objects.filter(tire=tire, position=from_position)
+                    inspections_moving(moving)
+                    moving.update(position=to_position)
                 
                 if is_new_mount:
                     messages.success(request, f'Tire {tire.serial_number} mounted successfully!')
@@ -259,12 +236,35 @@ def tire_assignment_create(request):
             messages.error(request, 'Selected inspection does not exist!')
         except Exception as e:
             messages.error(request, f'Error: {str(e)}')
-            print(f"DEBUG: Exception: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception('Tire assignment failed')
     
     return redirect('tire_assignment_list')
 
+@csrf_exempt
+@require_POST
+def tire_rotation_api(request):
+    """
+    Several moves, mounts, discards and swaps on one work order's vehicle (JSON body,
+    see services/rotations.py); validated together, everything is written or nothing is
+    """
+    try:
+        payload = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({"error": "Request body must be JSON"}, status=400)
+    if not isinstance(payload, dict):
+        return JsonResponse({"error": "Request body must be a JSON object"}, status=400)
+
+    try:
+        created = apply_rotation(payload)
+    except InvalidRotation as e:
+        return JsonResponse({"error": "Invalid rotation", "errors": e.errors}, status=400)
+
+    return JsonResponse({
+        "status": "success",
+        "created": len(created),
+        "assignment_ids": [assignment.pk for assignment in created],
+    }, status=201)
+
 def tire_assignment_update(request, id):
     tire_assignment = get_object_or_404(TireAssignment, id=id)
     
@@ -367,10 +367,9 @@ def tire_assignment_update(request, id):
             
             # Update any other inspections for this tire at old position
             if old_to_position and old_to_position != tire_position_to:
-                TireInspection.objects.filter(
-                    tire=tire,
-                    position=old_to_position
-                ).update(position=tire_position_to)
+                moving = TireInspection.objects.filter(tire=tire, position=old_to_position)
+                inspections_moving(moving)
+                moving.update(position=tire_position_to)
             
             messages.success(request, 'Tire assignment updated successfully!')
             
@@ -1,30 +1,21 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from ..models import TirePosition, Vehicle, Tire
+from ..services.form_options import form_options, selected_option
+from ..services.list_specs import LIST_SPECS
+from ..services.pagination import paginate
 
 def tire_position_list(request):
-    tire_positions = TirePosition.objects.all()
-    vehicles = Vehicle.objects.all()
-    tires = Tire.objects.all()
-    
-    vehicle_filter = request.GET.get('vehicle_filter', '')
-    
-    if vehicle_filter:
-        tire_positions = tire_positions.filter(vehicle_id=vehicle_filter)
-    
+    page = paginate(LIST_SPECS['tire_positions'], request.GET)
+    tire_positions = page.object_list
     vehicle_filter = request.GET.get('vehicle_filter', '')
-    if vehicle_filter:
-        vehicle_positions = TirePosition.objects.filter(vehicle_id=vehicle_filter)
-        mounted_tire_ids = vehicle_positions.exclude(
-            mounted_tire__isnull=True
-        ).values_list('mounted_tire_id', flat=True)
-        tires = Tire.objects.filter(id__in=mounted_tire_ids)
     
     context = {
         'tire_positions': tire_positions,
-        'vehicles': vehicles,
+        'page': page,
         'vehicle_filter': vehicle_filter,
-        'tires': tires,
+        'selected_vehicle': selected_option('vehicles', vehicle_filter),
+        'form_options': form_options('vehicles'),
     }
     return render(request, 'tire_positions/tire_position_list.html', context)
 
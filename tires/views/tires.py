@@ -1,36 +1,31 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
-from django.db.models import Q
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
 from ..models import Tire, TirePattern, TireStatus, Supplier, TirePosition
 from decimal import Decimal, InvalidOperation
+from ..services.form_options import form_options
+from ..services.list_specs import LIST_SPECS
+from ..services.pagination import InvalidListQuery, paginate
+from ..services.summary_counters import summary_counts
+from ..services.tire_timeline import tire_timeline
 
 # Tires Views ------------------------------------------------------------------------------------------------
 
 def tires_list(request):
-    # Start with all records
-    tires = Tire.objects.all()
-    tire_patterns = TirePattern.objects.all()
-    tire_statuses = TireStatus.objects.all()
-    tire_positions = TirePosition.objects.all()
-    suppliers = Supplier.objects.all()
-
-    active_count = Tire.objects.filter(
-        Q(status=1) | Q(status=6) | Q(status=7)
-    ).count()
-    under_repair_count = Tire.objects.filter(status=3).count()
-    inactive_count = Tire.objects.filter(
-        Q(status=2) | Q(status=4)
-    ).count()
+    # Only the visible window of tires is loaded
+    page = paginate(LIST_SPECS['tires'], request.GET)
+    tires = page.object_list
+    # Shared by the create modal and the single edit modal; cached reference tables only
+    options = form_options('tire_patterns', 'tire_statuses', 'suppliers')
+
+    counts = summary_counts('tires')
 
     context = {
         'tires': tires,
-        'tire_patterns': tire_patterns,
-        'tire_statuses': tire_statuses,
-        'tire_positions': tire_positions,
-        'suppliers': suppliers,
-        'active_count': active_count,
-        'under_repair_count': under_repair_count,
-        'inactive_count': inactive_count,
+        'page': page,
+        'form_options': options,
+        **counts,  # active_count, under_repair_count, inactive_count
     }
     return render(request, 'tires/tires_list.html', context)
 
@@ -164,3 +159,17 @@ def tires_update(request, id):
     
     return redirect('tires_list')
 
+
+@require_GET
+def tire_timeline_api(request, id):
+    """
+    JSON history of one tire (assignments, inspections, maintenance), newest first:
+    /api/tires/<id>/timeline/?cursor=&page_size=
+    """
+    if not Tire.objects.filter(id=id).exists():
+        return JsonResponse({"error": f"Tire {id} not found"}, status=404)
+    try:
+        page = tire_timeline(id, request.GET.get('cursor'), request.GET.get('page_size'))
+    except InvalidListQuery as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    return JsonResponse(page)
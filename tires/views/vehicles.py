@@ -2,27 +2,25 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.db.models import Q
 from ..models import Vehicle
+from ..services.list_specs import LIST_SPECS
+from ..services.pagination import paginate
+from ..services.position_layouts import generate_positions
 
 
 # Vehicle Views --------------------------------------------------------------------------------------------------
 def vehicle_list(request):
-    vehicles = Vehicle.objects.all()
+    # Filters, sort and cursor from the query string; only the visible window is loaded
+    page = paginate(LIST_SPECS['vehicles'], request.GET)
+    vehicles = page.object_list
     
     # Get filter parameters from request
     status_filter = request.GET.get('status_filter', '')
     type_filter = request.GET.get('type_filter', '')
     year_filter = request.GET.get('year_filter', '')
     
-    # Apply filters
-    if status_filter:
-        vehicles = vehicles.filter(status=status_filter)
-    if type_filter:
-        vehicles = vehicles.filter(vehicle_type=type_filter)
-    if year_filter:
-        vehicles = vehicles.filter(year=year_filter)
-    
     context = {
         'vehicles': vehicles,
+        'page': page,
         'status_filter': status_filter,
         'type_filter': type_filter,
         'year_filter': year_filter,
@@ -36,6 +34,18 @@ def vehicle_delete(request, id):
         messages.success(request, 'Vehicle deleted successfully!')
     return redirect('vehicle_list')
 
+def vehicle_generate_positions(request, id):
+    if request.method == 'POST':
+        vehicle = get_object_or_404(Vehicle, id=id)
+        result = generate_positions([vehicle])
+        if result['errors']:
+            messages.error(request, f"Cannot lay out {vehicle.license_plate}: {result['errors'][vehicle.license_plate]}")
+        elif result['created']:
+            messages.success(request, f"{result['created']} tire positions created for {vehicle.license_plate}!")
+        else:
+            messages.info(request, f'{vehicle.license_plate} already has every position of its layout.')
+    return redirect('vehicle_list')
+
 def vehicle_create(request):
     if request.method == 'POST':
 
@@ -1,28 +1,23 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from ..models import WorkOrder, Employee, Vehicle
-from django.db.models import Q
+from ..services.form_options import form_options
+from ..services.list_specs import LIST_SPECS
+from ..services.pagination import paginate
+from ..services.summary_counters import summary_counts
 
 # Work Orders Views ------------------------------------------------------------------------------------------------------
 
 def work_order_list(request):
-    work_orders = WorkOrder.objects.all()
-    employees = Employee.objects.all()
-    vehicles = Vehicle.objects.all()
-    open_count = WorkOrder.objects.filter(
-        Q(status='OPENED') | Q(status='PENDING')
-    ).count()
-    # completed_count = WorkOrder.objects.filter(status='COMPLETED').count()
-
-    inspection_count = WorkOrder.objects.filter(shift_type='INSPECTION').count()
+    page = paginate(LIST_SPECS['work_orders'], request.GET)
+    work_orders = page.object_list
+    counts = summary_counts('work_orders')
 
     context = {
         'work_orders': work_orders,
-        'employees': employees,
-        'vehicles': vehicles,
-        'open_count': open_count,
-        # 'completed_count': completed_count,
-        'inspection_count': inspection_count,
+        'page': page,
+        'form_options': form_options('employees', 'vehicles'),
+        **counts,  # open_count, inspection_count
     }
     
     return render(request, 'work_orders/work_order_list.html', context)